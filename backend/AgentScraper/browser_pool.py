@@ -0,0 +1,170 @@
+"""
+Pool browser headless untuk SIFT agent.
+
+Setiap agent run meminjam (lease) satu browser dari pool dan mengembalikannya
+setelah selesai. Browser tetap hidup antar run (keep_alive): saat dikembalikan,
+cookies, storage origin yang dikunjungi dan semua tab dibersihkan lewat CDP,
+jadi login / consent / tab dari company sebelumnya tidak ikut terbawa tanpa
+harus cold-start Chrome. Browser baru diluncurkan ulang setelah
+BROWSER_MAX_USES run, jika run-nya error, atau jika pembersihan gagal.
+"""
+import asyncio
+import os
+import shlex
+from contextlib import asynccontextmanager
+from typing import List, Optional
+from urllib.parse import urlsplit
+from browser_use import Browser
+from dotenv import load_dotenv
+from fastapi import HTTPException
+
+load_dotenv()
+
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+BROWSER_LEASE_TIMEOUT = float(os.getenv("BROWSER_LEASE_TIMEOUT", "300"))
+# Jumlah run sebelum browser diluncurkan ulang (membatasi memory leak Chrome)
+BROWSER_MAX_USES = int(os.getenv("BROWSER_MAX_USES", "20"))
+BROWSER_HEADLESS = os.getenv("BROWSER_HEADLESS", "true").lower() in ("1", "true", "yes")
+# Kosong = pakai Chromium bawaan playwright / browser-use
+BROWSER_EXECUTABLE_PATH = os.getenv("BROWSER_EXECUTABLE_PATH") or None
+# Contoh: BROWSER_ARGS="--disable-gpu --no-sandbox"
+BROWSER_ARGS = shlex.split(os.getenv("BROWSER_ARGS", ""))
+
+
+def _new_browser() -> Browser:
+    """Membuat browser session baru dengan profile terisolasi"""
+    return Browser(
+        executable_path=BROWSER_EXECUTABLE_PATH,
+        headless=BROWSER_HEADLESS,
+        args=BROWSER_ARGS,
+        user_data_dir=None,
+        keep_alive=True,
+    )
+
+
+async def _kill(browser: Browser):
+    try:
+        await browser.kill()
+    except Exception as e:
+        print(f"Warning: failed to close browser session: {e}")
+
+
+async def _clear_state(browser: Browser):
+    """Hapus cookies, storage origin yang terbuka dan semua tab, sisakan satu tab kosong"""
+    targets = browser.get_page_targets()
+    if not targets:
+        # Browser belum pernah dipakai (lazy start)
+        return
+    cdp = browser.cdp_client
+    await browser.clear_cookies()
+    origins = {
+        f"{parts.scheme}://{parts.netloc}"
+        for parts in (urlsplit(target.url) for target in targets)
+        if parts.scheme in ("http", "https")
+    }
+    for origin in origins:
+        await cdp.send.Storage.clearDataForOrigin(params={"origin": origin, "storageTypes": "all"})
+    await cdp.send.Target.createTarget(params={"url": "about:blank"})
+    for target in targets:
+        await browser.close_page(target.target_id)
+
+
+class _Slot:
+    """Satu browser di pool beserta jumlah pemakaiannya"""
+
+    def __init__(self):
+        self.browser = _new_browser()
+        self.uses = 0
+        self.cleanup: Optional[asyncio.Task] = None
+
+    async def recycle(self, failed: bool, previous: Optional[asyncio.Task] = None):
+        """Bersihkan state untuk lease berikutnya, atau luncurkan browser baru"""
+        if previous is not None:
+            # Lease sebelumnya di-cancel saat menunggu pembersihan; jangan jalan bersamaan
+            await asyncio.gather(previous, return_exceptions=True)
+        self.uses += 1
+        if not failed and self.uses < BROWSER_MAX_USES:
+            try:
+                await _clear_state(self.browser)
+                return
+            except Exception as e:
+                print(f"Warning: failed to reset browser state, relaunching: {e}")
+        await _kill(self.browser)
+        self.browser = _new_browser()
+        self.uses = 0
+
+
+class BrowserPool:
+    def __init__(self, size: int = BROWSER_POOL_SIZE):
+        self.size = size
+        self._slots: List[_Slot] = []
+        self._available: Optional[asyncio.Queue] = None
+
+    def _ensure_queue(self):
+        # Queue dibuat lazy supaya terikat ke event loop yang sedang berjalan
+        if self._available is None:
+            self._available = asyncio.Queue()
+            self._add_slots(self.size)
+
+    def _add_slots(self, count: int):
+        for _ in range(count):
+            slot = _Slot()
+            self._slots.append(slot)
+            self._available.put_nowait(slot)
+
+    def ensure_capacity(self, size: int):
+        """Perbesar pool sampai minimal `size` browser (mis. jumlah section mode parallel)"""
+        self._ensure_queue()
+        if size > self.size:
+            self._add_slots(size - self.size)
+            self.size = size
+
+    @property
+    def available(self) -> int:
+        """Jumlah browser yang sedang idle"""
+        self._ensure_queue()
+        return self._available.qsize()
+
+    @asynccontextmanager
+    async def lease(self, timeout: float = BROWSER_LEASE_TIMEOUT):
+        """
+        Meminjam satu browser dari pool.
+        Raise HTTPException 503 jika tidak ada browser yang kosong dalam `timeout` detik.
+        """
+        self._ensure_queue()
+        try:
+            slot = await asyncio.wait_for(self._available.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=503,
+                detail=f"All {self.size} browsers are busy, try again later."
+            )
+
+        failed = False
+        try:
+            if slot.cleanup is not None:
+                # Pembersihan dari lease sebelumnya belum tentu selesai
+                await asyncio.shield(slot.cleanup)
+            yield slot.browser
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            # Slot dikembalikan dulu (tidak hilang walau lease di-cancel), pembersihan
+            # berjalan di task sendiri dan ditunggu oleh lease berikutnya
+            previous = slot.cleanup if slot.cleanup is not None and not slot.cleanup.done() else None
+            slot.cleanup = asyncio.create_task(slot.recycle(failed, previous))
+            self._available.put_nowait(slot)
+
+    async def close(self):
+        """Menutup semua browser"""
+        if self._available is None:
+            return
+        for slot in self._slots:
+            if slot.cleanup is not None:
+                await asyncio.gather(slot.cleanup, return_exceptions=True)
+            await _kill(slot.browser)
+
+
+# Instance global browser pool
+browser_pool = BrowserPool()
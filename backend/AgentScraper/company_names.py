@@ -0,0 +1,23 @@
+"""
+Normalisasi nama company, dipakai untuk key cache profile, dedupe batch, tebakan
+domain homepage dan pencocokan nama di halaman / feed berita.
+"""
+import re
+from typing import List
+
+# Token badan hukum yang diabaikan saat normalisasi nama company
+LEGAL_TOKENS = {
+    "pt", "tbk", "persero", "cv", "inc", "incorporated", "ltd", "limited", "llc",
+    "corp", "corporation", "co", "company", "plc", "gmbh", "ag", "sa", "bv",
+}
+
+
+def company_tokens(company_name: str) -> List[str]:
+    """Token lowercase tanpa tanda baca dan tanpa badan hukum ("PT Gojek Tbk" -> ["gojek"])"""
+    tokens = re.findall(r"[a-z0-9]+", company_name.casefold())
+    return [t for t in tokens if t not in LEGAL_TOKENS] or tokens
+
+
+def normalize_company_name(company_name: str) -> str:
+    """Normalisasi nama company: lowercase, tanpa tanda baca dan tanpa badan hukum"""
+    return " ".join(company_tokens(company_name))
@@ -0,0 +1,160 @@
+"""
+Pengukur kelengkapan hasil agent terhadap target CompanyProfile.
+
+Agent melaporkan temuan sementara lewat action `record_findings`. Temuan digabung
+ke satu CompanyProfile, dinilai terhadap target (field overview, jumlah minimal
+tech stack, news signal dan contact yang punya jabatan), dan begitu target
+tercapai run agent diakhiri lebih awal dengan temuan tersebut sebagai hasil.
+"""
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+from dotenv import load_dotenv
+from pydantic import BaseModel
+from .schemas import CompanyOverview, CompanyProfile
+
+load_dotenv()
+
+
+def _env_list(name: str, default: str) -> Tuple[str, ...]:
+    return tuple(item.strip() for item in os.getenv(name, default).split(",") if item.strip())
+
+
+@dataclass(frozen=True)
+class CompletenessTarget:
+    overview_fields: Tuple[str, ...] = ("industry", "location", "employee_count", "website", "founded_year")
+    min_tech_items: int = 5
+    min_news_signals: int = 2
+    min_contacts_with_title: int = 2
+    # Skor minimal (0-1) sebelum run boleh dihentikan
+    min_score: float = 1.0
+
+    @classmethod
+    def from_env(cls) -> "CompletenessTarget":
+        return cls(
+            overview_fields=_env_list("COMPLETENESS_OVERVIEW_FIELDS", ",".join(cls.overview_fields)),
+            min_tech_items=int(os.getenv("COMPLETENESS_MIN_TECH_ITEMS", str(cls.min_tech_items))),
+            min_news_signals=int(os.getenv("COMPLETENESS_MIN_NEWS_SIGNALS", str(cls.min_news_signals))),
+            min_contacts_with_title=int(os.getenv("COMPLETENESS_MIN_CONTACTS", str(cls.min_contacts_with_title))),
+            min_score=float(os.getenv("COMPLETENESS_TARGET_SCORE", str(cls.min_score))),
+        )
+
+
+COMPLETENESS_EARLY_STOP = os.getenv("COMPLETENESS_EARLY_STOP", "true").lower() in ("1", "true", "yes")
+COMPLETENESS_TARGET = CompletenessTarget.from_env()
+
+
+def _ratio(found: int, required: int) -> float:
+    return 1.0 if required <= 0 else min(1.0, found / required)
+
+
+def _merge_unique(current: list, new: list, key) -> list:
+    """Tambahkan item baru yang key-nya belum ada (urutan lama dipertahankan)"""
+    seen = {key(item) for item in current}
+    merged = list(current)
+    for item in new:
+        item_key = key(item)
+        if item_key and item_key not in seen:
+            seen.add(item_key)
+            merged.append(item)
+    return merged
+
+
+class CompletenessTracker:
+    """Menggabungkan temuan satu agent run dan menilai kelengkapannya untuk `sections`"""
+
+    def __init__(
+        self,
+        company_name: str,
+        sections: Iterable[str],
+        target: CompletenessTarget = COMPLETENESS_TARGET
+    ):
+        self.profile = CompanyProfile(company_name=company_name)
+        self.sections = tuple(sections)
+        self.target = target
+        self.recorded = 0
+        self.stopped_early = False
+
+    def merge(self, findings: BaseModel):
+        """Gabungkan temuan dalam bentuk output schema agent (CompanyProfile atau schema section)"""
+        data = findings.model_dump(exclude_none=True)
+        if isinstance(findings, CompanyOverview):
+            data = {"overview": data}
+
+        for name, value in (data.get("overview") or {}).items():
+            if value and not getattr(self.profile.overview, name, None):
+                setattr(self.profile.overview, name, value)
+
+        profile = CompanyProfile.model_validate({"company_name": self.profile.company_name, **data})
+        self.profile.tech_stack = _merge_unique(
+            self.profile.tech_stack, profile.tech_stack, key=lambda tech: tech.strip().casefold()
+        )
+        self.profile.recent_news_signals = _merge_unique(
+            self.profile.recent_news_signals, profile.recent_news_signals, key=lambda signal: signal.url
+        )
+        # Contact yang sama bisa dilaporkan ulang dengan jabatan yang baru ditemukan
+        contacts = {contact.name.casefold(): contact for contact in self.profile.key_contacts}
+        for contact in profile.key_contacts:
+            existing = contacts.get(contact.name.casefold())
+            if existing is None:
+                contacts[contact.name.casefold()] = contact
+                continue
+            for name, value in contact.model_dump(exclude_none=True).items():
+                if not getattr(existing, name):
+                    setattr(existing, name, value)
+        self.profile.key_contacts = list(contacts.values())
+        self.recorded += 1
+
+    def section_scores(self) -> Dict[str, float]:
+        target = self.target
+        profile = self.profile
+        scores = {
+            "overview": _ratio(
+                sum(1 for name in target.overview_fields if getattr(profile.overview, name, None)),
+                len(target.overview_fields)
+            ),
+            "tech_stack": _ratio(len(profile.tech_stack), target.min_tech_items),
+            "recent_news_signals": _ratio(len(profile.recent_news_signals), target.min_news_signals),
+            "key_contacts": _ratio(
+                sum(1 for contact in profile.key_contacts if contact.title),
+                target.min_contacts_with_title
+            ),
+        }
+        return {section: scores[section] for section in self.sections}
+
+    def score(self) -> float:
+        scores = self.section_scores()
+        return round(sum(scores.values()) / len(scores), 3) if scores else 1.0
+
+    def is_complete(self) -> bool:
+        return self.score() >= self.target.min_score
+
+    def missing(self) -> List[str]:
+        """Deskripsi singkat bagian yang belum memenuhi target, untuk diteruskan ke agent"""
+        target = self.target
+        profile = self.profile
+        missing = []
+        for section, score in self.section_scores().items():
+            if score >= 1.0:
+                continue
+            if section == "overview":
+                fields = [name for name in target.overview_fields if not getattr(profile.overview, name, None)]
+                missing.append(f"overview fields: {', '.join(fields)}")
+            elif section == "tech_stack":
+                missing.append(f"tech_stack: {len(profile.tech_stack)}/{target.min_tech_items} technologies")
+            elif section == "recent_news_signals":
+                missing.append(f"recent_news_signals: {len(profile.recent_news_signals)}/{target.min_news_signals} signals")
+            else:
+                with_title = sum(1 for contact in profile.key_contacts if contact.title)
+                missing.append(f"key_contacts: {with_title}/{target.min_contacts_with_title} contacts with a title")
+        return missing
+
+    def result_json(self, output_model) -> str:
+        """Temuan gabungan sebagai JSON dalam bentuk output_model agent"""
+        if output_model is CompanyProfile:
+            return self.profile.model_dump_json()
+        if output_model is CompanyOverview:
+            return self.profile.overview.model_dump_json()
+        return output_model(
+            **{name: getattr(self.profile, name) for name in output_model.model_fields}
+        ).model_dump_json()
@@ -0,0 +1,97 @@
+"""
+HTTP client async bersama (connection pool) untuk fetch halaman tanpa browser.
+
+Client dibuat lazy supaya terikat ke event loop yang sedang berjalan, dan ditutup
+lewat close_http_client() saat aplikasi / worker shutdown. Client tidak menyimpan
+cookie, jadi session / consent state website satu company tidak terbawa ke fetch
+berikutnya (sama seperti browser yang di-reset per run).
+"""
+import os
+from dataclasses import dataclass
+from http.cookiejar import CookieJar
+from typing import Dict, Optional
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "50"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "10"))
+HTTP_USER_AGENT = os.getenv(
+    "HTTP_USER_AGENT",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/126.0 Safari/537.36"
+)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+class _NoCookieJar(CookieJar):
+    """Cookie jar yang membuang semua cookie; response.cookies per response tetap terisi"""
+
+    def set_cookie(self, cookie):
+        pass
+
+    def extract_cookies(self, response, request):
+        pass
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """AsyncClient global dengan connection pooling dan redirect otomatis"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=HTTP_TIMEOUT_SECONDS,
+            cookies=_NoCookieJar(),
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            ),
+            headers={
+                "User-Agent": HTTP_USER_AGENT,
+                "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "en-US,en;q=0.9,id;q=0.8",
+            },
+        )
+    return _client
+
+
+async def close_http_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+@dataclass
+class FetchedPage:
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    cookies: Dict[str, str]
+    html: str
+
+
+async def fetch_html(url: str, max_bytes: int = 1024 * 1024, timeout: Optional[float] = None) -> Optional[FetchedPage]:
+    """
+    GET halaman HTML dengan client bersama, body dipotong di max_bytes.
+    Return None jika status >= 400 atau response bukan HTML; error jaringan di-raise.
+    """
+    client = get_http_client()
+    async with client.stream("GET", url, timeout=timeout or HTTP_TIMEOUT_SECONDS) as response:
+        if response.status_code >= 400 or "html" not in response.headers.get("content-type", ""):
+            return None
+        body = b""
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if len(body) > max_bytes:
+                break
+        return FetchedPage(
+            url=str(response.url),
+            status_code=response.status_code,
+            headers={name.lower(): value for name, value in response.headers.items()},
+            cookies={cookie.name: cookie.value or "" for cookie in response.cookies.jar},
+            html=body.decode(response.encoding or "utf-8", errors="replace"),
+        )
@@ -0,0 +1,251 @@
+"""
+Fast path STEP 3: news signal dari feed RSS/Atom, tanpa browser dan tanpa LLM.
+
+Sumber feed:
+- Feed milik company (blog / newsroom): dari <link rel="alternate"> di homepage
+  atau path umum (NEWS_FEED_PATHS) di website company.
+- Feed publisher di NEWS_FEED_URLS; `{company}` diganti nama company (URL-encoded),
+  mis. https://news.google.com/rss/search?q={company}. Item harus menyebut nama company.
+
+Semua feed di-fetch bersamaan, item difilter berdasarkan umur (NEWS_FEED_MAX_AGE_DAYS;
+item publisher tanpa tanggal dibuang), lalu signal_type diklasifikasi dengan aturan keyword lokal. Item yang tidak cocok
+dengan satu pun aturan dibuang. Agent hanya meriset news jika hasilnya kosong.
+"""
+import asyncio
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from html import unescape
+from typing import List, Optional, Union
+from urllib.parse import quote_plus, urljoin
+from dotenv import load_dotenv
+from .http_client import FetchedPage, HTTP_TIMEOUT_SECONDS, get_http_client
+from .company_names import company_tokens
+from .schemas import NewsSignal
+
+load_dotenv()
+
+NEWS_FEEDS_ENABLED = os.getenv("NEWS_FEEDS_ENABLED", "true").lower() in ("1", "true", "yes")
+NEWS_FEED_URLS = [url.strip() for url in os.getenv("NEWS_FEED_URLS", "").split(",") if url.strip()]
+NEWS_FEED_PATHS = [
+    path.strip()
+    for path in os.getenv("NEWS_FEED_PATHS", "/feed,/rss.xml,/blog/feed,/blog/rss.xml,/newsroom/rss.xml,/atom.xml").split(",")
+    if path.strip()
+]
+NEWS_FEED_MAX_AGE_DAYS = float(os.getenv("NEWS_FEED_MAX_AGE_DAYS", "180"))
+NEWS_FEED_MAX_SIGNALS = int(os.getenv("NEWS_FEED_MAX_SIGNALS", "5"))
+NEWS_FEED_TIMEOUT = float(os.getenv("NEWS_FEED_TIMEOUT", str(HTTP_TIMEOUT_SECONDS)))
+FEED_MAX_BYTES = 2 * 1024 * 1024
+
+_FEED_LINK = re.compile(
+    r"<link[^>]+type\s*=\s*[\"']application/(?:rss|atom)\+xml[\"'][^>]*>", re.IGNORECASE
+)
+_HREF = re.compile(r"href\s*=\s*[\"']([^\"']+)[\"']", re.IGNORECASE)
+_TAGS = re.compile(r"<[^>]+>")
+
+# Urutan = prioritas ("X raises $20M to expand" adalah Funding Round)
+SIGNAL_RULES = [
+    ("Funding Round", re.compile(
+        r"\b(raises?|raised|funding|series [a-f]|seed round|pre-seed|investment from|invests? in|"
+        r"valuation|ipo|pendanaan|suntikan dana|backed by)\b", re.IGNORECASE)),
+    ("Partnership", re.compile(
+        r"\b(partners? with|partnership|partnering|collaborat\w+|teams? up|alliance|joins forces|"
+        r"kerja ?sama|kemitraan|bermitra)\b", re.IGNORECASE)),
+    ("Product Launch", re.compile(
+        r"\b(launch(es|ed|ing)?|introduc(es|ed|ing)|unveil(s|ed|ing)?|rolls? out|rolled out|"
+        r"now available|new feature|meluncurkan|peluncuran|rilis)\b", re.IGNORECASE)),
+    ("Strategic Hiring", re.compile(
+        r"\b(hires?|hired|hiring|appoint(s|ed|ment)?|joins as|new (ceo|cto|cfo|coo|chief \w+)|"
+        r"names? (new )?(ceo|cto|cfo|coo|chief|head|vp)|recruit(s|ing|ment)?|mengangkat|menunjuk)\b", re.IGNORECASE)),
+    ("Market Expansion", re.compile(
+        r"\b(expan(ds?|sion|ding)|enters? (the )?\w+ market|new market|opens? (a |its )?(new |first )?"
+        r"(office|hub|branch|headquarters)|goes global|ekspansi|memperluas)\b", re.IGNORECASE)),
+    ("Award/Recognition", re.compile(
+        r"\b(awards?|awarded|wins?|won|recogni[sz]ed|named (to|as|among|one of)|ranked|top \d+|penghargaan)\b",
+        re.IGNORECASE)),
+]
+
+
+def classify_signal(text: str) -> Optional[str]:
+    """signal_type pertama yang aturannya cocok, atau None"""
+    for signal_type, pattern in SIGNAL_RULES:
+        if pattern.search(text):
+            return signal_type
+    return None
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1].lower()
+
+
+def _child_text(element, *names: str) -> str:
+    for child in element:
+        if _local(child.tag) in names and (child.text or "").strip():
+            return child.text.strip()
+    return ""
+
+
+def _item_link(element) -> str:
+    for child in element:
+        if _local(child.tag) != "link":
+            continue
+        # Atom: <link rel="alternate" href="..."/>, RSS: <link>url</link>
+        if child.get("href") and child.get("rel", "alternate") == "alternate":
+            return child.get("href").strip()
+        if (child.text or "").strip():
+            return child.text.strip()
+    guid = _child_text(element, "guid", "id")
+    return guid if guid.startswith("http") else ""
+
+
+def _parse_date(value: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def parse_feed(xml: Union[str, bytes], base_url: str = "") -> List[dict]:
+    """Item RSS 2.0 / RSS 1.0 / Atom sebagai dict {title, url, summary, published}"""
+    # Bytes supaya encoding dari deklarasi XML dipakai parser
+    data = xml.encode("utf-8") if isinstance(xml, str) else xml
+    # Tolak DTD / entity (billion laughs), feed normal tidak membutuhkannya
+    if b"<!ENTITY" in data or b"<!DOCTYPE" in data:
+        raise ValueError("Feed with DTD is not supported")
+    root = ET.fromstring(data)
+    items = []
+    for element in root.iter():
+        if _local(element.tag) not in ("item", "entry"):
+            continue
+        title = unescape(_TAGS.sub("", _child_text(element, "title")))
+        url = _item_link(element)
+        if not title or not url:
+            continue
+        summary = unescape(_TAGS.sub(" ", _child_text(element, "description", "summary", "content")))
+        items.append({
+            "title": re.sub(r"\s+", " ", title).strip(),
+            "url": urljoin(base_url, url),
+            "summary": re.sub(r"\s+", " ", summary).strip()[:1000],
+            "published": _parse_date(_child_text(element, "pubdate", "published", "updated", "date")),
+        })
+    return items
+
+
+def discover_feed_urls(website: str, homepage: Optional[FetchedPage] = None) -> List[str]:
+    """Feed dari <link rel="alternate"> homepage, atau path umum jika homepage tidak mencantumkan feed"""
+    base = website if "://" in website else f"https://{website}"
+    if homepage is not None:
+        links = [_HREF.search(tag) for tag in _FEED_LINK.findall(homepage.html)]
+        found = [urljoin(homepage.url, match.group(1)) for match in links if match]
+        if found:
+            return list(dict.fromkeys(found))
+    return [urljoin(base, path) for path in NEWS_FEED_PATHS]
+
+
+def publisher_feed_urls(company_name: str, feed_urls: Optional[List[str]] = None) -> List[str]:
+    return [url.replace("{company}", quote_plus(company_name)) for url in (feed_urls if feed_urls is not None else NEWS_FEED_URLS)]
+
+
+def _mentions_company(text: str, company_name: str) -> bool:
+    tokens = company_tokens(company_name)
+    # Nama tanpa huruf / angka latin tidak punya token; jangan anggap semua item cocok
+    if not tokens:
+        return False
+    text = text.casefold()
+    return all(re.search(rf"\b{re.escape(token)}\b", text) for token in tokens)
+
+
+async def _fetch_feed(url: str) -> Optional[tuple]:
+    client = get_http_client()
+    async with client.stream("GET", url, timeout=NEWS_FEED_TIMEOUT, headers={
+        "Accept": "application/rss+xml, application/atom+xml, application/xml;q=0.9, text/xml;q=0.8",
+    }) as response:
+        if response.status_code >= 400 or "html" in response.headers.get("content-type", ""):
+            return None
+        body = b""
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if len(body) > FEED_MAX_BYTES:
+                return None
+        return str(response.url), body
+
+
+async def _read_feed(url: str) -> List[dict]:
+    fetched = await _fetch_feed(url)
+    if fetched is None:
+        return []
+    final_url, xml = fetched
+    try:
+        return await asyncio.to_thread(parse_feed, xml, final_url)
+    except (ET.ParseError, ValueError):
+        return []
+
+
+async def collect_news_signals(
+    company_name: str,
+    website: Optional[str] = None,
+    homepage: Optional[FetchedPage] = None,
+    feed_urls: Optional[List[str]] = None
+) -> dict:
+    """
+    Ambil feed company (jika website diketahui) dan feed publisher secara paralel.
+    Return {"signals": [NewsSignal], "feeds": feed yang terbaca, "items": item yang diperiksa,
+    "started_at", "finished_at"}.
+    """
+    started_at = time.time()
+    own_feeds = discover_feed_urls(website, homepage) if website else []
+    publisher_feeds = publisher_feed_urls(company_name, feed_urls)
+    urls = own_feeds + publisher_feeds
+    results = await asyncio.gather(*(_read_feed(url) for url in urls), return_exceptions=True)
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=NEWS_FEED_MAX_AGE_DAYS)
+    candidates, seen = [], set()
+    feeds = items = 0
+    for index, result in enumerate(results):
+        if isinstance(result, BaseException) or not result:
+            continue
+        feeds += 1
+        own = index < len(own_feeds)
+        for item in result:
+            items += 1
+            # Berita yang sama sering muncul di blog company dan di publisher
+            title_key = item["title"].casefold()
+            if item["url"] in seen or title_key in seen:
+                continue
+            # Item tanpa tanggal hanya diterima dari feed company sendiri; umur item
+            # publisher tanpa tanggal tidak bisa dicek
+            if item["published"] is None and not own:
+                continue
+            if item["published"] is not None and item["published"] < cutoff:
+                continue
+            text = f"{item['title']} {item['summary']}"
+            # Feed publisher berisi berita company lain juga
+            if not own and not _mentions_company(text, company_name):
+                continue
+            signal_type = classify_signal(item["title"]) or classify_signal(item["summary"])
+            if signal_type is None:
+                continue
+            seen.update((item["url"], title_key))
+            candidates.append((item["published"] or datetime.min.replace(tzinfo=timezone.utc), item, signal_type))
+
+    candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+    signals = [
+        NewsSignal(title=item["title"], url=item["url"], signal_type=signal_type)
+        for _, item, signal_type in candidates[:NEWS_FEED_MAX_SIGNALS]
+    ]
+    return {
+        "signals": signals,
+        "feeds": feeds,
+        "items": items,
+        "started_at": started_at,
+        "finished_at": time.time(),
+    }
@@ -0,0 +1,227 @@
+"""
+Fast path untuk CompanyOverview sebelum agent dijalankan.
+
+Banyak website company memuat JSON-LD schema.org `Organization`, tag OpenGraph
+dan meta description yang sudah berisi website, tahun berdiri, alamat dan jumlah
+karyawan. Homepage kandidat (website yang sudah diketahui, atau tebakan domain
+dari nama company) di-fetch dengan HTTP client bersama lalu tag tersebut di-parse.
+Agent kemudian hanya diminta mencari field overview yang masih kosong.
+"""
+import asyncio
+import json
+import os
+import re
+import time
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+from urllib.parse import urlsplit
+from dotenv import load_dotenv
+from .company_names import company_tokens, normalize_company_name
+from .http_client import fetch_html
+from .schemas import CompanyOverview
+
+load_dotenv()
+
+OVERVIEW_FAST_PATH_ENABLED = os.getenv("OVERVIEW_FAST_PATH_ENABLED", "true").lower() in ("1", "true", "yes")
+# TLD yang dicoba untuk menebak homepage dari nama company, urut prioritas
+OVERVIEW_FAST_PATH_TLDS = [
+    tld.strip() for tld in os.getenv("OVERVIEW_FAST_PATH_TLDS", ".com,.co.id,.id,.io").split(",") if tld.strip()
+]
+OVERVIEW_FAST_PATH_TIMEOUT = float(os.getenv("OVERVIEW_FAST_PATH_TIMEOUT", "6"))
+HOMEPAGE_MAX_BYTES = 1024 * 1024
+
+_ORGANIZATION_TYPES = {
+    "organization", "corporation", "localbusiness", "onlinebusiness", "onlinestore",
+    "ngo", "educationalorganization", "newsmediaorganization", "airline",
+}
+
+
+class _StructuredDataParser(HTMLParser):
+    """Kumpulkan blok JSON-LD, meta tag (name/property) dan <title>"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.json_ld: List[str] = []
+        self.meta: dict = {}
+        self.title = ""
+        self.canonical: Optional[str] = None
+        self._in_json_ld = False
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "script" and (attrs.get("type") or "").lower() == "application/ld+json":
+            self._in_json_ld = True
+            self.json_ld.append("")
+        elif tag == "meta":
+            key = (attrs.get("property") or attrs.get("name") or "").lower()
+            if key and attrs.get("content") and key not in self.meta:
+                self.meta[key] = attrs["content"].strip()
+        elif tag == "link" and "canonical" in (attrs.get("rel") or "").lower() and attrs.get("href"):
+            self.canonical = attrs["href"]
+        elif tag == "title":
+            self._in_title = True
+
+    def handle_endtag(self, tag):
+        if tag == "script":
+            self._in_json_ld = False
+        elif tag == "title":
+            self._in_title = False
+
+    def handle_data(self, data):
+        if self._in_json_ld:
+            self.json_ld[-1] += data
+        elif self._in_title:
+            self.title += data
+
+
+def candidate_homepages(company_name: str, website: Optional[str] = None) -> List[str]:
+    """Website yang sudah diketahui dulu, lalu tebakan <nama-company><tld>"""
+    candidates = []
+    if website:
+        candidates.append(website if "://" in website else f"https://{website}")
+    slug = "".join(company_tokens(company_name))
+    if slug:
+        candidates += [f"https://{slug}{tld}" for tld in OVERVIEW_FAST_PATH_TLDS]
+    return list(dict.fromkeys(candidates))
+
+
+def _iter_json_ld_nodes(value):
+    if isinstance(value, list):
+        for item in value:
+            yield from _iter_json_ld_nodes(item)
+    elif isinstance(value, dict):
+        yield value
+        for key in ("@graph", "publisher", "provider", "author", "parentOrganization"):
+            if key in value:
+                yield from _iter_json_ld_nodes(value[key])
+
+
+def _is_organization(node: dict) -> bool:
+    types = node.get("@type") or []
+    types = [types] if isinstance(types, str) else types
+    return any(str(t).lower() in _ORGANIZATION_TYPES for t in types)
+
+
+def _text(value) -> Optional[str]:
+    if isinstance(value, dict):
+        value = value.get("name") or value.get("@id")
+    if isinstance(value, list):
+        value = value[0] if value else None
+    return str(value).strip() if value not in (None, "") else None
+
+
+def _location(address) -> Optional[str]:
+    if isinstance(address, list):
+        address = address[0] if address else None
+    if isinstance(address, str):
+        return address.strip() or None
+    if not isinstance(address, dict):
+        return None
+    parts = [_text(address.get(key)) for key in ("addressLocality", "addressRegion", "addressCountry")]
+    parts = list(dict.fromkeys(part for part in parts if part))
+    return ", ".join(parts) or None
+
+
+def _employee_count(value) -> Optional[str]:
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        if value.get("value") is not None:
+            return str(value["value"])
+        low, high = value.get("minValue"), value.get("maxValue")
+        if low is not None and high is not None:
+            return f"{low}-{high}"
+        return str(low or high) if (low or high) is not None else None
+    return str(value) if value not in (None, "") else None
+
+
+def parse_overview(html: str, page_url: str) -> CompanyOverview:
+    """Ambil field CompanyOverview dari JSON-LD Organization, OpenGraph dan meta tag"""
+    return _parse_structured_data(html, page_url)[0]
+
+
+def _parse_structured_data(html: str, page_url: str) -> Tuple[CompanyOverview, List[str]]:
+    """CompanyOverview plus nama organisasi yang diklaim halaman (JSON-LD name, og:site_name)"""
+    parser = _StructuredDataParser()
+    parser.feed(html)
+    parser.close()
+
+    overview = CompanyOverview()
+    names = [parser.meta["og:site_name"]] if parser.meta.get("og:site_name") else []
+    for raw in parser.json_ld:
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            continue
+        for node in _iter_json_ld_nodes(data):
+            if not _is_organization(node):
+                continue
+            if _text(node.get("name")):
+                names.append(_text(node.get("name")))
+            overview.website = overview.website or _text(node.get("url"))
+            founded = _text(node.get("foundingDate"))
+            match = re.search(r"\d{4}", founded or "")
+            overview.founded_year = overview.founded_year or (match.group(0) if match else None)
+            overview.location = overview.location or _location(node.get("address") or node.get("location"))
+            overview.employee_count = overview.employee_count or _employee_count(node.get("numberOfEmployees"))
+            overview.industry = overview.industry or _text(node.get("industry"))
+
+    if not overview.website:
+        url = parser.meta.get("og:url") or parser.canonical or page_url
+        parts = urlsplit(url)
+        overview.website = f"{parts.scheme}://{parts.netloc}" if parts.netloc else None
+    if not overview.location:
+        locality = parser.meta.get("og:locality") or parser.meta.get("business:contact_data:locality")
+        country = parser.meta.get("og:country-name") or parser.meta.get("business:contact_data:country_name")
+        overview.location = ", ".join(part for part in (locality, country) if part) or None
+    return overview, names
+
+
+def _mentions_company(html_head: str, company_name: str) -> bool:
+    """Pastikan halaman memang milik company ini (nama ada di title / og:site_name / JSON-LD)"""
+    text = html_head.casefold()
+    return all(token in text for token in company_tokens(company_name))
+
+
+async def extract_overview(company_name: str, website: Optional[str] = None) -> dict:
+    """
+    Fetch homepage kandidat secara paralel dan parse overview dari kandidat pertama
+    (urut prioritas) yang terverifikasi milik company: website yang sudah diketahui,
+    atau domain tebakan yang JSON-LD name / og:site_name-nya sama dengan nama company
+    (setelah normalisasi). Domain tebakan yang hanya menyebut nama company ditolak.
+    Return {"overview": CompanyOverview, "url", "page", "fields", "started_at", "finished_at"}
+    dengan page = FetchedPage homepage (dipakai ulang untuk deteksi tech stack);
+    overview kosong dan page None jika tidak ada kandidat yang cocok.
+    """
+    started_at = time.time()
+    candidates = candidate_homepages(company_name, website)
+    pages = await asyncio.gather(
+        *(fetch_html(url, HOMEPAGE_MAX_BYTES, OVERVIEW_FAST_PATH_TIMEOUT) for url in candidates),
+        return_exceptions=True
+    )
+
+    overview, homepage = CompanyOverview(), None
+    expected_name = normalize_company_name(company_name)
+    for index, page in enumerate(pages):
+        if not page or isinstance(page, BaseException):
+            continue
+        end = page.html.casefold().find("</head>")
+        head = page.html[:end] if end >= 0 else page.html[:20000]
+        if not _mentions_company(head, company_name):
+            continue
+        parsed, names = await asyncio.to_thread(_parse_structured_data, page.html, page.url)
+        known_website = website is not None and index == 0
+        if not known_website and expected_name not in {normalize_company_name(name) for name in names}:
+            continue
+        overview, homepage = parsed, page
+        break
+
+    return {
+        "overview": overview,
+        "url": homepage.url if homepage else None,
+        "page": homepage,
+        "fields": [name for name, value in overview.model_dump().items() if value],
+        "started_at": started_at,
+        "finished_at": time.time(),
+    }
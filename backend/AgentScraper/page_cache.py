@@ -0,0 +1,287 @@
+"""
+Cache isi halaman (teks hasil ekstraksi HTML) yang dibagi semua agent run.
+
+Halaman seperti About page, LinkedIn company page dan artikel berita sering
+dibaca ulang oleh agent untuk company lain atau run ulang company yang sama.
+Agent membaca halaman statis lewat action `read_page`: cache hit langsung
+mengembalikan teks tanpa navigasi dan render browser, cache miss di-fetch dengan
+HTTP client bersama lalu disimpan.
+
+URL yang host-nya resolve ke alamat non-publik (loopback, private, link-local,
+metadata cloud, dll) ditolak, termasuk setiap hop redirect, supaya agent tidak bisa
+dipakai untuk membaca layanan internal (SSRF).
+
+Entry disimpan sebagai file JSON di PAGE_CACHE_DIR (bisa dipakai bersama oleh
+API dan worker di mesin yang sama) dengan key sha256 URL ternormalisasi.
+Entry expired setelah PAGE_CACHE_TTL_HOURS; jika total ukuran melewati
+PAGE_CACHE_MAX_MB, file yang paling lama tidak diakses (mtime) dihapus dulu.
+"""
+import asyncio
+import hashlib
+import ipaddress
+import json
+import os
+import re
+import socket
+import time
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import urljoin, urlsplit, urlunsplit
+from dotenv import load_dotenv
+from .http_client import get_http_client
+
+load_dotenv()
+
+PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+PAGE_CACHE_DIR = Path(os.getenv("PAGE_CACHE_DIR", str(Path(__file__).resolve().parent.parent / ".cache" / "pages")))
+PAGE_CACHE_TTL_HOURS = float(os.getenv("PAGE_CACHE_TTL_HOURS", "24"))
+PAGE_CACHE_MAX_MB = float(os.getenv("PAGE_CACHE_MAX_MB", "200"))
+# Batas ukuran response yang di-fetch dan panjang teks yang disimpan per halaman
+PAGE_FETCH_MAX_BYTES = int(os.getenv("PAGE_FETCH_MAX_BYTES", str(3 * 1024 * 1024)))
+PAGE_TEXT_MAX_CHARS = int(os.getenv("PAGE_TEXT_MAX_CHARS", "30000"))
+PAGE_FETCH_MAX_REDIRECTS = int(os.getenv("PAGE_FETCH_MAX_REDIRECTS", "5"))
+# Teks lebih pendek dari ini dianggap halaman yang butuh JavaScript (tidak di-cache)
+PAGE_TEXT_MIN_CHARS = int(os.getenv("PAGE_TEXT_MIN_CHARS", "200"))
+
+_SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "iframe", "head"}
+_BLOCK_TAGS = {
+    "p", "div", "section", "article", "header", "footer", "main", "aside", "nav",
+    "li", "ul", "ol", "table", "tr", "td", "th", "br", "hr", "h1", "h2", "h3",
+    "h4", "h5", "h6", "blockquote", "pre", "dd", "dt", "figcaption",
+}
+
+_stats = {"hits": 0, "misses": 0, "fetch_errors": 0, "uncacheable": 0, "evictions": 0}
+
+
+class _TextExtractor(HTMLParser):
+    """Ambil judul dan teks yang terlihat dari HTML (tanpa script/style)"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self._in_title = False
+        self._skip_depth = 0
+        self._parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "title":
+            self._in_title = True
+        elif tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in _BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+        elif tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in _BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif not self._skip_depth:
+            self._parts.append(data)
+
+    def text(self) -> str:
+        lines = (re.sub(r"\s+", " ", line).strip() for line in "".join(self._parts).split("\n"))
+        return "\n".join(line for line in lines if line)
+
+
+def extract_page_text(html: str) -> Tuple[str, str]:
+    """Return (title, teks) dari dokumen HTML"""
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return parser.title.strip(), parser.text()[:PAGE_TEXT_MAX_CHARS]
+
+
+def normalize_url(url: str) -> str:
+    """Scheme/host lowercase, tanpa fragment dan tanpa trailing slash di path"""
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+
+
+async def _resolve_host(host: str, port: int) -> list:
+    """Semua alamat IP untuk host (tanpa resolve jika host sudah berupa IP)"""
+    loop = asyncio.get_running_loop()
+    infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    return [info[4][0] for info in infos]
+
+
+async def check_public_url(url: str):
+    """Raise ValueError jika URL bukan http(s) atau host-nya resolve ke alamat non-publik"""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"Unsupported URL: {url}")
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    try:
+        addresses = await _resolve_host(parts.hostname, port)
+    except OSError as e:
+        raise ValueError(f"Cannot resolve {parts.hostname}: {e}")
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split("%", 1)[0])
+        if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped:
+            ip = ip.ipv4_mapped
+        if not ip.is_global:
+            raise ValueError(f"Blocked non-public address for {parts.hostname}: {ip}")
+
+
+@dataclass
+class PageCacheUsage:
+    """Counter per agent run: hits = page load yang dihemat"""
+    hits: int = 0
+    fetches: int = 0
+
+
+class PageCache:
+    def __init__(self, directory: Path = PAGE_CACHE_DIR, ttl_hours: float = PAGE_CACHE_TTL_HOURS, max_mb: float = PAGE_CACHE_MAX_MB):
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        # Perkiraan total ukuran; dihitung ulang dari disk saat eviction
+        self._size: Optional[int] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _read(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+        if time.time() - entry.get("fetched_at", 0) > self.ttl_seconds:
+            path.unlink(missing_ok=True)
+            return None
+        # mtime = waktu akses terakhir untuk LRU
+        os.utime(path)
+        return entry
+
+    def _scan(self):
+        files = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _write(self, key: str, entry: dict):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._scan())
+        else:
+            self._size += len(data)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        """Hapus file dengan mtime paling lama sampai total <= 90% budget"""
+        files = sorted(self._scan())
+        total = sum(size for _, size, _ in files)
+        limit = int(self.max_bytes * 0.9)
+        for _, size, path in files:
+            if total <= limit:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            _stats["evictions"] += 1
+        self._size = total
+
+    def _finish_fetch(self, key: str, future: asyncio.Future):
+        self._inflight.pop(key, None)
+        # Ambil exception supaya tidak muncul warning jika semua peminta sudah batal
+        if not future.cancelled():
+            future.exception()
+
+    async def _fetch(self, url: str, key: str) -> dict:
+        client = get_http_client()
+        # Redirect diikuti manual supaya setiap hop dicek ke alamat publik
+        for _ in range(PAGE_FETCH_MAX_REDIRECTS + 1):
+            await check_public_url(url)
+            async with client.stream("GET", url, follow_redirects=False) as response:
+                if not response.is_redirect:
+                    entry = await self._read_response(response)
+                    break
+                url = urljoin(str(response.url), response.headers["location"])
+        else:
+            raise ValueError(f"Too many redirects ({PAGE_FETCH_MAX_REDIRECTS})")
+
+        if len(entry["text"]) < PAGE_TEXT_MIN_CHARS:
+            _stats["uncacheable"] += 1
+            raise ValueError("Page has almost no static text (probably rendered with JavaScript)")
+        await asyncio.to_thread(self._write, key, entry)
+        return entry
+
+    async def _read_response(self, response) -> dict:
+        """Entry {"url", "title", "text", "fetched_at"} dari response HTML / teks"""
+        response.raise_for_status()
+        content_type = response.headers.get("content-type", "")
+        if "html" not in content_type and "text/plain" not in content_type:
+            raise ValueError(f"Unsupported content type: {content_type or 'unknown'}")
+        body = b""
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if len(body) > PAGE_FETCH_MAX_BYTES:
+                break
+        html = body.decode(response.encoding or "utf-8", errors="replace")
+
+        if "html" in content_type:
+            title, text = await asyncio.to_thread(extract_page_text, html)
+        else:
+            title, text = "", html[:PAGE_TEXT_MAX_CHARS]
+        return {"url": str(response.url), "title": title, "text": text, "fetched_at": time.time()}
+
+    async def read(self, url: str, usage: Optional[PageCacheUsage] = None) -> dict:
+        """
+        Return entry {"url", "title", "text", "fetched_at"} dari cache, atau fetch lalu simpan.
+        Fetch bersamaan untuk URL yang sama digabung. Raise exception jika fetch gagal.
+        """
+        key = hashlib.sha256(normalize_url(url).encode()).hexdigest()
+        entry = await asyncio.to_thread(self._read, key)
+        if entry is not None:
+            _stats["hits"] += 1
+            if usage is not None:
+                usage.hits += 1
+            return entry
+
+        _stats["misses"] += 1
+        if usage is not None:
+            usage.fetches += 1
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(url, key))
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._finish_fetch(key, done))
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            _stats["fetch_errors"] += 1
+            raise
+
+
+def get_page_cache_stats() -> dict:
+    """Counter hit/miss cache halaman di proses ini"""
+    return dict(_stats)
+
+
+# Instance global page cache
+page_cache = PageCache()
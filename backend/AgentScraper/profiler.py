@@ -1,27 +1,99 @@
 import asyncio
-import sys
-from io import StringIO
-from browser_use import Agent, ChatGoogle, Browser
+import os
+import time
+from typing import Awaitable, Callable, List, Optional
+from browser_use import ActionResult, Agent, ChatGoogle, Controller
+from dotenv import load_dotenv
 from fastapi import HTTPException
-from .schemas import CompanyProfile 
+from prometheus_client import Counter, Histogram
+from pydantic import BaseModel
+from .schemas import CompanyProfile, CompanyOverview, NewsSignal, TechStackSection, NewsSection, ContactsSection
+from .browser_pool import browser_pool
+from .completeness import COMPLETENESS_EARLY_STOP, CompletenessTracker
+from .page_cache import PAGE_CACHE_ENABLED, PageCacheUsage, page_cache
+from .overview_fastpath import OVERVIEW_FAST_PATH_ENABLED, extract_overview
+from .techdetect import TECH_DETECT_ENABLED, detect_tech_stack
+from .news_feeds import NEWS_FEEDS_ENABLED, collect_news_signals
+
+load_dotenv()
 
 # Inisialisasi LLM
 llm = ChatGoogle(model="gemini-flash-latest")
 
-browser = Browser(
-    executable_path='C:\\Users\\esun\\AppData\\Local\\Google\\Chrome\\Application\\chrome.exe',
-    # user_data_dir='C:\\Users\\esun\\AppData\\Local\\Google\\Chrome\\User Data',
+MAX_STEPS = 50
+
+# "single" = satu agent untuk semua section, "parallel" = satu sub-agent per section
+SIFT_AGENT_MODE = os.getenv("SIFT_AGENT_MODE", "single").lower()
+
+AGENT_RUN_DURATION = Histogram(
+    "sift_agent_run_duration_seconds",
+    "Durasi run_sift_agent per profile",
+    ["mode", "outcome"],
+    buckets=(10, 30, 60, 120, 180, 300, 450, 600, 900, 1800),
+)
+AGENT_STEPS = Histogram(
+    "sift_agent_steps",
+    "Jumlah step yang dipakai per agent (section 'all' = mode single)",
+    ["section"],
+    buckets=(1, 2, 5, 10, 15, 20, 30, 40, 50),
+)
+AGENT_STEPS_SAVED = Histogram(
+    "sift_agent_steps_saved",
+    "Step budget yang tidak terpakai karena target completeness tercapai",
+    ["section"],
+    buckets=(0, 1, 2, 5, 10, 15, 20, 30, 40, 50),
+)
+AGENT_COMPLETENESS = Histogram(
+    "sift_agent_completeness_score",
+    "Skor completeness (0-1) hasil akhir agent",
+    ["section"],
+    buckets=(0.1, 0.25, 0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 1.0),
+)
+PAGE_LOADS_SAVED = Counter(
+    "sift_agent_page_loads_saved_total",
+    "Halaman yang dibaca agent dari page cache tanpa fetch / render ulang",
+    ["section"],
+)
+OVERVIEW_FAST_PATH = Counter(
+    "sift_overview_fast_path_total",
+    "Hasil fast path overview (complete = agent tidak perlu riset overview)",
+    ["outcome"],
+)
+TECH_DETECTED = Histogram(
+    "sift_tech_detected",
+    "Jumlah teknologi yang terdeteksi dari fingerprint website per profile",
+    buckets=(0, 1, 2, 5, 10, 15, 20, 30),
+)
+NEWS_FEED_FAST_PATH = Counter(
+    "sift_news_feed_fast_path_total",
+    "Hasil fast path news dari feed RSS/Atom (hit = agent tidak perlu riset news)",
+    ["outcome"],
 )
 
+# Callback yang menerima event dict setiap kali agent selesai satu step
+StepCallback = Callable[[dict], Awaitable[None]]
 
-async def run_sift_agent_with_streaming(company_name: str):
-    """
-    Generator function yang yield log messages dari agent execution.
-    Digunakan untuk SSE streaming ke frontend.
-    """
-    task_prompt = f"""
-        You are a B2B sales intelligence agent. Your goal is to build a comprehensive company profile for '{company_name}' to help sales teams identify opportunities.
+# Bagian profile yang bisa diriset terpisah, nama = field di CompanyProfile
+SECTIONS = ("overview", "tech_stack", "recent_news_signals", "key_contacts")
 
+# Output schema per section untuk mode parallel
+SECTION_SCHEMAS = {
+    "overview": CompanyOverview,
+    "tech_stack": TechStackSection,
+    "recent_news_signals": NewsSection,
+    "key_contacts": ContactsSection,
+}
+
+# Step budget per sub-agent di mode parallel
+SECTION_MAX_STEPS = {
+    "overview": int(os.getenv("SECTION_MAX_STEPS_OVERVIEW", "12")),
+    "tech_stack": int(os.getenv("SECTION_MAX_STEPS_TECH_STACK", "15")),
+    "recent_news_signals": int(os.getenv("SECTION_MAX_STEPS_NEWS", "12")),
+    "key_contacts": int(os.getenv("SECTION_MAX_STEPS_CONTACTS", "15")),
+}
+
+SECTION_INSTRUCTIONS = {
+    "overview": """
         STEP 1 - COMPANY OVERVIEW:
         - Go to the company's official website or LinkedIn company page
         - Extract:
@@ -31,7 +103,8 @@ async def run_sift_agent_with_streaming(company_name: str):
         * Employee count (exact number or range like "10,000-15,000")
         * Founded year (e.g., "2010", "2015")
         * Company description/mission
-
+""",
+    "tech_stack": """
         STEP 2 - TECH STACK:
         - Search for: "{company_name} technology stack" OR "{company_name} engineering blog"
         - Look for job postings (Software Engineer, DevOps, etc.) to identify technologies
@@ -39,7 +112,8 @@ async def run_sift_agent_with_streaming(company_name: str):
         - Extract specific technologies: programming languages, frameworks, databases, cloud providers
         - Return as a list of strings, e.g., ["Python", "Go", "React", "PostgreSQL", "AWS"]
         - If not found, return empty list []
-
+""",
+    "recent_news_signals": """
         STEP 3 - RECENT NEWS SIGNALS (Last 6 months):
         - Search Google News for: "{company_name} funding" OR "{company_name} hiring" OR "{company_name} expansion"
         - For EACH relevant article, extract:
@@ -49,7 +123,8 @@ async def run_sift_agent_with_streaming(company_name: str):
         - Only include articles from credible sources (TechCrunch, Reuters, company blog, etc.)
         - Skip academic papers, job boards, or irrelevant links
         - Limit to top 5 most relevant signals
-
+""",
+    "key_contacts": """
         STEP 4 - KEY CONTACTS (CRITICAL - Follow carefully):
         - Search for "{company_name} leadership team" OR go to company About/Team/Leadership page
         - Also try: "{company_name} executives" OR "{company_name} management team"
@@ -73,7 +148,10 @@ async def run_sift_agent_with_streaming(company_name: str):
         - Prioritize C-level (CEO, CTO, CFO, CMO) and VP-level executives
         - Focus on technical/business decision-makers
         - Limit to top 5 most senior contacts
+""",
+}
 
+RULES = """
         IMPORTANT RULES:
         1. Only return data you can VERIFY from reliable sources
         2. If a field is not found, use null (not guesses!)
@@ -81,146 +159,307 @@ async def run_sift_agent_with_streaming(company_name: str):
         4. Be specific in signal_type - avoid generic terms
         5. Focus on RECENT and RELEVANT information
         6. Make sure to extract the official website URL and founded year in the overview section
+"""
+
+RECORD_FINDINGS_INSTRUCTION = """
+        PROGRESS TRACKING:
+        - Every time you have verified new information, call the `record_findings` action with
+          everything you have found so far, in the same schema as the final result.
+        - record_findings replies with what is still missing. Focus on those parts only.
+        - Once the profile is complete enough, record_findings finishes the task for you.
+"""
+
+READ_PAGE_INSTRUCTION = """
+        READING PAGES:
+        - To read a static page whose URL you already know (About/Team page, news article,
+          LinkedIn company page), use the `read_page` action instead of navigating to it.
+        - Only navigate with the browser for search, pages that need interaction, or when read_page fails.
+"""
+
 
+def _overview_instruction(company_name: str, known: Optional[CompanyOverview] = None) -> str:
+    """Instruksi STEP 1 yang hanya meminta field overview yang belum diketahui dari fast path"""
+    default = SECTION_INSTRUCTIONS["overview"].format(company_name=company_name)
+    if known is None:
+        return default
+    found = {name: value for name, value in known.model_dump().items() if value}
+    missing = [name for name in CompanyOverview.model_fields if name not in found]
+    if not found:
+        return default
+    if not missing:
+        return f"""
+        STEP 1 - COMPANY OVERVIEW:
+        - Already extracted from the company website, do NOT research it: {known.model_dump_json()}
+"""
+    known_text = ", ".join(f"{name}={value}" for name, value in found.items())
+    return f"""
+        STEP 1 - COMPANY OVERVIEW:
+        - Already extracted from the company website (do NOT research these again): {known_text}
+        - Only find the missing fields: {', '.join(missing)}
+        - Go to the company's official website or LinkedIn company page
+"""
+
+
+def _tech_stack_instruction(company_name: str, detected: List[str]) -> str:
+    """Instruksi STEP 2; teknologi yang sudah terdeteksi dari website tidak perlu dicari lagi"""
+    instruction = SECTION_INSTRUCTIONS["tech_stack"].format(company_name=company_name)
+    if not detected:
+        return instruction
+    return instruction + f"""        - Already detected from the company website (do NOT research these again): {', '.join(detected)}
+        - Focus on what a website does not reveal: backend languages, databases, cloud and infrastructure
+"""
+
+
+def _news_instruction(company_name: str, signals: List[NewsSignal]) -> str:
+    """Instruksi STEP 3; jika feed sudah menghasilkan signal, agent tidak perlu riset news"""
+    if not signals:
+        return SECTION_INSTRUCTIONS["recent_news_signals"].format(company_name=company_name)
+    collected = ", ".join(signal.model_dump_json() for signal in signals)
+    return f"""
+        STEP 3 - RECENT NEWS SIGNALS:
+        - Already collected from news feeds, do NOT research news: [{collected}]
+        - Return exactly these signals as recent_news_signals
+"""
+
+
+def _section_instruction(company_name: str, section: str, known: Optional[CompanyProfile] = None) -> str:
+    if known is not None and section == "overview":
+        return _overview_instruction(company_name, known.overview)
+    if known is not None and section == "tech_stack":
+        return _tech_stack_instruction(company_name, known.tech_stack)
+    if known is not None and section == "recent_news_signals":
+        return _news_instruction(company_name, known.recent_news_signals)
+    return SECTION_INSTRUCTIONS[section].format(company_name=company_name)
+
+
+def build_task_prompt(company_name: str, known: Optional[CompanyProfile] = None) -> str:
+    """
+    Task prompt untuk SIFT agent (semua section dalam satu run).
+    known (hasil fast path) membuat STEP 1 hanya meminta field overview yang masih kosong
+    STEP 2 melewati teknologi yang sudah terdeteksi, dan STEP 3 dilewati jika feed news
+    sudah menghasilkan signal.
+    """
+    steps = "\n".join(_section_instruction(company_name, section, known) for section in SECTIONS)
+    return f"""
+        You are a B2B sales intelligence agent. Your goal is to build a comprehensive company profile for '{company_name}' to help sales teams identify opportunities.
+{steps}
+{RULES}
         Return the structured data as CompanyProfile schema.
         """
-    
-    agent = Agent(
-        task=task_prompt,
-        llm=llm,
-        browser=browser,
-        output_model_schema=CompanyProfile,
-        max_steps=50
-    )
-    
-    # Capture stdout untuk mendapatkan agent logs
-    step_count = 0
-    max_steps = 50
-    
-    yield f"🤖 Agent initialized with {max_steps} max steps"
-    yield f"📋 Task: Profiling {company_name}"
-    
-    # Simulate step-by-step progress
-    # Karena browser-use agent tidak expose internal logs, kita buat progress simulation
-    yield f"⏳ Step 1/{max_steps}: Searching for company information..."
-    await asyncio.sleep(0.5)
-    
-    yield f"⏳ Step 5/{max_steps}: Analyzing company website..."
-    await asyncio.sleep(0.5)
 
-    yield f"⏳ Step 10/{max_steps}: Extracting tech stack from job postings..."
-    await asyncio.sleep(0.5)
 
-    yield f"⏳ Step 15/{max_steps}: Searching for recent news signals..."
-    await asyncio.sleep(0.5)
+def build_section_prompt(company_name: str, section: str, known: Optional[CompanyProfile] = None) -> str:
+    """Task prompt untuk sub-agent yang hanya meriset satu section"""
+    schema = SECTION_SCHEMAS[section].__name__
+    return f"""
+        You are a B2B sales intelligence agent. Your goal is to research ONE part of the company profile for '{company_name}' to help sales teams identify opportunities. Other agents handle the remaining parts, so do not research anything else.
+{_section_instruction(company_name, section, known)}
+{RULES}
+        Return the structured data as {schema} schema.
+        """
 
-    yield f"⏳ Step 20/{max_steps}: Identifying key contacts..."
-    await asyncio.sleep(0.5)
 
-    yield f"⏳ Step 25/{max_steps}: Verifying data accuracy..."
-    await asyncio.sleep(0.5)
+def _last_history_item(agent: Agent):
+    history = getattr(agent, "history", None) or getattr(agent.state, "history", None)
+    items = getattr(history, "history", None) or []
+    return items[-1] if items else None
 
-    yield f"⏳ Step 30/{max_steps}: Compiling final report..."
-    await asyncio.sleep(0.5)
 
+def _step_event(agent: Agent, max_steps: int, section: Optional[str] = None) -> dict:
+    """Ambil info step terakhir (nomor step, action, URL, token) dari history agent"""
+    item = _last_history_item(agent)
+    metadata = getattr(item, "metadata", None)
+    model_output = getattr(item, "model_output", None)
+    state = getattr(item, "state", None)
 
-async def run_sift_agent(company_name: str) -> CompanyProfile:
+    actions = []
+    for action in getattr(model_output, "action", None) or []:
+        action_data = action.model_dump(exclude_unset=True)
+        actions.extend(name for name, params in action_data.items() if params is not None)
 
-    # task_prompt = f"""
-    # Act as an expert sales intelligence analyst. Your objective is to create a detailed company profile for: "{company_name}".
+    return {
+        "type": "step",
+        "section": section,
+        "step": getattr(metadata, "step_number", None) or agent.state.n_steps,
+        "max_steps": max_steps,
+        "actions": actions,
+        "url": getattr(state, "url", None),
+        "tokens": getattr(metadata, "input_tokens", None),
+        "started_at": getattr(metadata, "step_start_time", None),
+        "finished_at": getattr(metadata, "step_end_time", None),
+    }
 
-    # You have a **maximum of 25 total steps** to complete this entire task. Be efficient.
 
-    # **Plan:**
-    # 1.  **Search & Identify:** Google search for "{company_name} official website" AND "{company_name} official LinkedIn".
-    # 2.  **Scrape Website (Tech Stack):** Go to the official website's 'Careers' or 'Jobs' page. Find 3-5 key technologies.
-    # 3.  **Scrape LinkedIn (Overview & Contacts):** Go to the official LinkedIn page. Find 'Industry', 'Location', 'Employee Count', and 1-2 key tech leaders (CTO, Head of Engineering).
-    # 4.  **Find Buying Signals (News Search):** Perform a *new* search for `"{company_name}" news funding` OR `"{company_name}" news expansion`. Find 2-3 recent news articles.
-    
-    # **CRITICAL INSTRUCTION (PENTING):**
-    # Your mission is to gather as much data as possible within the step limit. **If you cannot find a specific piece of information (e.g., 'tech stack') after 3-4 attempts, STOP searching for that specific piece of data, set its value to `null` or an empty list `[]`, and MOVE ON to the next task in the plan.** Do not get stuck. Returning partial data is better than returning nothing.
-    
-    # You **must** return **only** the final JSON object.
-    # """
+def format_step_event(event: dict) -> str:
+    """Format event agent menjadi log message untuk SSE"""
+    prefix = f"[{event['section']}] " if event.get("section") else ""
+    if event["type"] == "section_done":
+        return f"✅ {prefix}Section finished"
+    if event["type"] == "section_failed":
+        return f"⚠️ {prefix}Section failed: {event['error']}"
+    if event["type"] == "fast_path":
+        if not event["fields"]:
+            return f"⚡ {prefix}Overview fast path: no structured data found"
+        return f"⚡ {prefix}Overview fast path: {', '.join(event['fields'])} from {event['url']}"
+    if event["type"] == "tech_detect":
+        if not event["tech_stack"]:
+            return f"🧩 {prefix}Tech detection: nothing recognized on {event['pages']} pages"
+        return f"🧩 {prefix}Tech detection ({event['pages']} pages): {', '.join(event['tech_stack'])}"
+    if event["type"] == "news_feeds":
+        if not event["signals"]:
+            return f"📰 {prefix}News feeds: no signals in {event['items']} items from {event['feeds']} feeds"
+        return f"📰 {prefix}News feeds: {event['signals']} signals from {event['feeds']} feeds ({event['items']} items)"
+    if event["type"] == "page_cache":
+        return f"📄 {prefix}Page cache: {event['hits']} page loads saved, {event['fetches']} pages fetched"
+    if event["type"] == "completeness":
+        message = f"🎯 {prefix}Completeness {event['score']:.0%}"
+        if event["stopped_early"]:
+            message += f", target reached after {event['steps_used']} steps ({event['steps_saved']} steps saved)"
+        return message
 
-    task_prompt = f"""
-        You are a B2B sales intelligence agent. Your goal is to build a comprehensive company profile for '{company_name}' to help sales teams identify opportunities.
+    message = f"⏳ {prefix}Step {event['step']}/{event['max_steps']}"
+    if event["actions"]:
+        message += f": {', '.join(event['actions'])}"
+    if event["url"]:
+        message += f" → {event['url']}"
+    if event["tokens"]:
+        message += f" ({event['tokens']} tokens)"
+    return message
 
-        STEP 1 - COMPANY OVERVIEW:
-        - Go to the company's official website or LinkedIn company page
-        - Extract:
-        * Website URL (official company website, e.g., "www.gojek.com" or "https://gojek.com")
-        * Industry/sector (be specific, e.g., "E-commerce & Ride-hailing Platform")
-        * Headquarters location (City, Country)
-        * Employee count (exact number or range like "10,000-15,000")
-        * Founded year (e.g., "2010", "2015")
-        * Company description/mission
 
-        STEP 2 - TECH STACK:
-        - Search for: "{company_name} technology stack" OR "{company_name} engineering blog"
-        - Look for job postings (Software Engineer, DevOps, etc.) to identify technologies
-        - Check their GitHub organization if available
-        - Extract specific technologies: programming languages, frameworks, databases, cloud providers
-        - Return as a list of strings, e.g., ["Python", "Go", "React", "PostgreSQL", "AWS"]
-        - If not found, return empty list []
+async def _emit(on_step: Optional[StepCallback], event: dict):
+    if on_step is None:
+        return
+    try:
+        await on_step(event)
+    except Exception as e:
+        print(f"Warning: step callback failed: {e}")
 
-        STEP 3 - RECENT NEWS SIGNALS (Last 6 months):
-        - Search Google News for: "{company_name} funding" OR "{company_name} hiring" OR "{company_name} expansion"
-        - For EACH relevant article, extract:
-        * title (exact article headline)
-        * url (direct link to the news article, NOT search results)
-        * signal_type: choose ONE from ["Funding Round", "Strategic Hiring", "Product Launch", "Market Expansion", "Partnership", "Award/Recognition"]
-        - Only include articles from credible sources (TechCrunch, Reuters, company blog, etc.)
-        - Skip academic papers, job boards, or irrelevant links
-        - Limit to top 5 most relevant signals
 
-        STEP 4 - KEY CONTACTS (CRITICAL - Follow carefully):
-        - Search for "{company_name} leadership team" OR go to company About/Team/Leadership page
-        - Also try: "{company_name} executives" OR "{company_name} management team"
-        - Look for LinkedIn profiles by searching: "site:linkedin.com {company_name} CTO" or similar
-        
-        For EACH contact, you MUST extract:
-        * name: Full name of the person (REQUIRED)
-        * title: Their EXACT job title as shown on the page (e.g., "Chief Technology Officer", "VP of Engineering", "Head of Product", "Co-Founder & CTO")
-          - DO NOT leave title as null if you find the person's name
-          - The title is usually RIGHT NEXT TO or BELOW the person's name
-          - Look for keywords: CEO, CTO, CFO, VP, Director, Head, Chief, President, Manager
-        * linkedin: Full LinkedIn profile URL if available (e.g., "https://www.linkedin.com/in/dara-khosrowshahi-70949862/")
-        * email: Email address if publicly available
-        * phone: Phone number if publicly available
-        
-        IMPORTANT for STEP 4:
-        - If you see a person's name on a page, their title is almost ALWAYS displayed nearby
-        - Don't just copy names without titles - READ the entire section carefully
-        - On LinkedIn company pages, click "People" or "Employees" to see leadership with titles
-        - On company About pages, titles are usually in format "Name - Title" or "Name, Title"
-        - Prioritize C-level (CEO, CTO, CFO, CMO) and VP-level executives
-        - Focus on technical/business decision-makers
-        - Limit to top 5 most senior contacts
+class ReadPageParams(BaseModel):
+    url: str
 
-        IMPORTANT RULES:
-        1. Only return data you can VERIFY from reliable sources
-        2. If a field is not found, use null (not guesses!)
-        3. URLs must be direct links, not search result pages
-        4. Be specific in signal_type - avoid generic terms
-        5. Focus on RECENT and RELEVANT information
-        6. Make sure to extract the official website URL and founded year in the overview section
 
-        Return the structured data as CompanyProfile schema.
-        """
-    
-    agent = Agent(
-        task=task_prompt,
-        llm=llm,
-        browser=browser,
-        output_model_schema=CompanyProfile,
-        max_steps=50
-    )
-    
+def _build_controller(tracker: CompletenessTracker, output_model, page_usage: PageCacheUsage) -> Controller:
+    """
+    Controller dengan action tambahan:
+    - record_findings: mencatat temuan dan mengakhiri run begitu target completeness tercapai
+    - read_page: membaca teks halaman statis lewat page cache bersama tanpa navigasi browser
+    """
+    controller = Controller()
 
-    print(f"Starting SIFT profiling for: {company_name}...")
-    history = await agent.run()
-    print("Agent run finished.")
+    if COMPLETENESS_EARLY_STOP:
+        @controller.action(
+            "Record the verified company information found so far. Returns what is still missing.",
+            param_model=output_model
+        )
+        async def record_findings(params):
+            tracker.merge(params)
+            if tracker.is_complete():
+                tracker.stopped_early = True
+                return ActionResult(
+                    is_done=True,
+                    success=True,
+                    extracted_content=tracker.result_json(output_model)
+                )
+            return ActionResult(
+                extracted_content=f"Recorded. Completeness {tracker.score():.0%}. Still missing: {'; '.join(tracker.missing())}"
+            )
+
+    if PAGE_CACHE_ENABLED:
+        @controller.action(
+            "Read the text content of a static page (About/Team page, news article, company LinkedIn page) "
+            "by URL without opening it in the browser. Faster than navigating.",
+            param_model=ReadPageParams
+        )
+        async def read_page(params: ReadPageParams):
+            try:
+                page = await page_cache.read(params.url, page_usage)
+            except Exception as e:
+                return ActionResult(
+                    extracted_content=f"Could not read {params.url} without a browser ({e}). Navigate to it instead."
+                )
+            return ActionResult(
+                extracted_content=f"Content of {page['url']} (title: {page['title']}):\n{page['text']}"
+            )
+
+    return controller
+
+
+def _apply_known(result, known: CompanyProfile):
+    """
+    Gabungkan hasil fast path ke hasil agent: field overview dari structured data
+    website hanya mengisi field yang dikosongkan agent, tech stack dan news signal dari
+    feed digabung dengan temuan agent.
+    """
+    overview = result if isinstance(result, CompanyOverview) else getattr(result, "overview", None)
+    if overview is not None:
+        for name, value in known.overview.model_dump().items():
+            if value and not getattr(overview, name):
+                setattr(overview, name, value)
+    if hasattr(result, "tech_stack") and known.tech_stack:
+        seen = {tech.casefold() for tech in result.tech_stack}
+        result.tech_stack += [tech for tech in known.tech_stack if tech.casefold() not in seen]
+    if hasattr(result, "recent_news_signals") and known.recent_news_signals:
+        seen = {signal.url for signal in known.recent_news_signals}
+        result.recent_news_signals = known.recent_news_signals + [
+            signal for signal in result.recent_news_signals if signal.url not in seen
+        ]
+
+
+async def _run_agent(
+    company_name: str,
+    task: str,
+    output_model,
+    max_steps: int,
+    on_step: Optional[StepCallback] = None,
+    section: Optional[str] = None,
+    known: Optional[CompanyProfile] = None
+):
+    """
+    Jalankan satu Agent dengan browser dari pool dan validasi output-nya ke output_model.
+    Jika COMPLETENESS_EARLY_STOP aktif, run berhenti begitu temuan lewat record_findings
+    memenuhi target; skor completeness dan step yang dihemat dikirim sebagai event.
+    Jumlah halaman yang dibaca dari page cache (page load yang dihemat) juga dikirim sebagai event.
+    known (partial profile dari fast path) dihitung sebagai temuan awal dan digabung ke hasil.
+    """
+    tracker = CompletenessTracker(company_name, [section] if section else SECTIONS)
+    if known is not None:
+        tracker.merge(known)
+    page_usage = PageCacheUsage()
+    extra = {}
+    if COMPLETENESS_EARLY_STOP:
+        task += RECORD_FINDINGS_INSTRUCTION
+    if PAGE_CACHE_ENABLED:
+        task += READ_PAGE_INSTRUCTION
+    if COMPLETENESS_EARLY_STOP or PAGE_CACHE_ENABLED:
+        extra["controller"] = _build_controller(tracker, output_model, page_usage)
+
+    async def on_step_end(agent: Agent):
+        await _emit(on_step, _step_event(agent, max_steps, section))
+
+    async with browser_pool.lease() as browser:
+        agent = Agent(
+            task=task,
+            llm=llm,
+            browser=browser,
+            output_model_schema=output_model,
+            max_steps=max_steps,
+            **extra
+        )
+        try:
+            history = await agent.run(max_steps=max_steps, on_step_end=on_step_end)
+        finally:
+            if page_usage.hits or page_usage.fetches:
+                PAGE_LOADS_SAVED.labels(section or "all").inc(page_usage.hits)
+                await _emit(on_step, {
+                    "type": "page_cache",
+                    "section": section,
+                    "hits": page_usage.hits,
+                    "fetches": page_usage.fetches,
+                })
+    steps_used = history.number_of_steps()
+    AGENT_STEPS.labels(section or "all").observe(steps_used)
 
     result_json = history.final_result()
     
@@ -228,12 +467,283 @@ async def run_sift_agent(company_name: str) -> CompanyProfile:
         raise HTTPException(status_code=500, detail="AI Agent failed to produce a result.")
     
     try:
-        profile = CompanyProfile.model_validate_json(result_json)
-        return profile
+        result = output_model.model_validate_json(result_json)
     except Exception as e:
         print(f"Error parsing agent result: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to parse AI output: {e}\nRaw output: {result_json}") 
-    
+
+    if known is not None:
+        _apply_known(result, known)
+    tracker.merge(result)
+    steps_saved = max(0, max_steps - steps_used) if tracker.stopped_early else 0
+    AGENT_STEPS_SAVED.labels(section or "all").observe(steps_saved)
+    AGENT_COMPLETENESS.labels(section or "all").observe(tracker.score())
+    await _emit(on_step, {
+        "type": "completeness",
+        "section": section,
+        "score": tracker.score(),
+        "stopped_early": tracker.stopped_early,
+        "steps_used": steps_used,
+        "steps_saved": steps_saved,
+    })
+    return result
+
+
+async def _overview_fast_path(
+    company_name: str,
+    on_step: Optional[StepCallback],
+    website: Optional[str] = None
+) -> dict:
+    """Overview dari JSON-LD / OpenGraph homepage (hasil extract_overview), atau {} jika gagal"""
+    try:
+        found = await extract_overview(company_name, website)
+    except Exception as e:
+        print(f"Warning: overview fast path failed for {company_name}: {e}")
+        OVERVIEW_FAST_PATH.labels("error").inc()
+        return {}
+
+    complete = len(found["fields"]) == len(CompanyOverview.model_fields)
+    OVERVIEW_FAST_PATH.labels("complete" if complete else "partial" if found["fields"] else "miss").inc()
+    await _emit(on_step, {
+        "type": "fast_path",
+        "section": "overview",
+        "fields": found["fields"],
+        "url": found["url"],
+        "started_at": found["started_at"],
+        "finished_at": found["finished_at"],
+    })
+    return found
+
+
+async def _tech_fast_path(website: str, homepage, on_step: Optional[StepCallback]) -> List[str]:
+    """Tech stack dari fingerprint website dan halaman karir, atau [] jika gagal"""
+    try:
+        found = await detect_tech_stack(website, homepage)
+    except Exception as e:
+        print(f"Warning: tech detection failed for {website}: {e}")
+        return []
+
+    TECH_DETECTED.observe(len(found["tech_stack"]))
+    await _emit(on_step, {
+        "type": "tech_detect",
+        "section": "tech_stack",
+        "tech_stack": found["tech_stack"],
+        "pages": found["pages"],
+        "started_at": found["started_at"],
+        "finished_at": found["finished_at"],
+    })
+    return found["tech_stack"]
+
+
+async def _news_fast_path(
+    company_name: str,
+    website: Optional[str],
+    homepage,
+    on_step: Optional[StepCallback]
+) -> List[NewsSignal]:
+    """News signal dari feed RSS/Atom company dan publisher, atau [] jika gagal"""
+    try:
+        found = await collect_news_signals(company_name, website, homepage)
+    except Exception as e:
+        print(f"Warning: news feeds failed for {company_name}: {e}")
+        NEWS_FEED_FAST_PATH.labels("error").inc()
+        return []
+
+    NEWS_FEED_FAST_PATH.labels("hit" if found["signals"] else "miss").inc()
+    await _emit(on_step, {
+        "type": "news_feeds",
+        "section": "recent_news_signals",
+        "signals": len(found["signals"]),
+        "feeds": found["feeds"],
+        "items": found["items"],
+        "started_at": found["started_at"],
+        "finished_at": found["finished_at"],
+    })
+    return found["signals"]
+
+
+async def _fast_path(
+    company_name: str,
+    sections,
+    on_step: Optional[StepCallback],
+    website: Optional[str] = None
+) -> Optional[CompanyProfile]:
+    """
+    Partial CompanyProfile tanpa agent: overview dari structured data homepage,
+    tech stack dari fingerprint website dan news signal dari feed RSS/Atom (tech stack
+    dan news berjalan bersamaan). Return None jika tidak ada yang ditemukan.
+    """
+    known = CompanyProfile(company_name=company_name)
+    homepage = None
+    needs_homepage = "tech_stack" in sections or "recent_news_signals" in sections
+    if OVERVIEW_FAST_PATH_ENABLED and ("overview" in sections or (needs_homepage and not website)):
+        found = await _overview_fast_path(company_name, on_step, website)
+        if found:
+            homepage = found["page"]
+            website = website or found["overview"].website
+            if "overview" in sections:
+                known.overview = found["overview"]
+
+    async def no_result():
+        return []
+
+    tech_stack, news = await asyncio.gather(
+        _tech_fast_path(website, homepage, on_step)
+        if TECH_DETECT_ENABLED and "tech_stack" in sections and website else no_result(),
+        _news_fast_path(company_name, website, homepage, on_step)
+        if NEWS_FEEDS_ENABLED and "recent_news_signals" in sections else no_result(),
+    )
+    known.tech_stack, known.recent_news_signals = tech_stack, news
+
+    if not any(known.overview.model_dump().values()) and not known.tech_stack and not known.recent_news_signals:
+        return None
+    return known
+
+
+async def _run_section(
+    company_name: str,
+    section: str,
+    on_step: Optional[StepCallback],
+    known: Optional[CompanyProfile] = None
+):
+    """Sub-agent untuk satu section, return nilai field CompanyProfile-nya"""
+    if section not in ("overview", "tech_stack", "recent_news_signals"):
+        known = None
+    if section == "overview" and known is not None and all(known.overview.model_dump().values()):
+        # Semua field overview sudah ada dari website, sub-agent tidak perlu jalan
+        await _emit(on_step, {"type": "section_done", "section": section})
+        return known.overview
+    if section == "recent_news_signals" and known is not None and known.recent_news_signals:
+        # Feed sudah menghasilkan signal, agent hanya dipakai jika feed kosong
+        await _emit(on_step, {"type": "section_done", "section": section})
+        return known.recent_news_signals
+
+    result = await _run_agent(
+        company_name,
+        build_section_prompt(company_name, section, known),
+        SECTION_SCHEMAS[section],
+        SECTION_MAX_STEPS[section],
+        on_step,
+        section,
+        known
+    )
+    await _emit(on_step, {"type": "section_done", "section": section})
+    # CompanyOverview dipakai langsung, section lain dibungkus satu field
+    return result if section == "overview" else getattr(result, section)
+
+
+async def run_sift_agent_sections(
+    company_name: str,
+    sections=SECTIONS,
+    on_step: Optional[StepCallback] = None,
+    website: Optional[str] = None
+) -> CompanyProfile:
+    """
+    Menjalankan satu sub-agent per section secara paralel, masing-masing dengan
+    browser dan step budget sendiri, lalu menggabungkan hasilnya ke satu CompanyProfile.
+    Section yang gagal dibiarkan kosong; raise HTTPException jika semua section gagal.
+    Overview, tech stack dan news dicoba dulu lewat fast path (website = homepage yang sudah
+    diketahui, opsional).
+    """
+    print(f"Starting parallel SIFT profiling for: {company_name} ({', '.join(sections)})...")
+    start = time.perf_counter()
+    # Satu browser per section; pool yang lebih kecil akan membuat section saling menunggu sampai 503
+    browser_pool.ensure_capacity(len(sections))
+    known = await _fast_path(company_name, sections, on_step, website)
+    results = await asyncio.gather(
+        *(_run_section(company_name, section, on_step, known) for section in sections),
+        return_exceptions=True
+    )
+    elapsed = time.perf_counter() - start
+
+    profile = CompanyProfile(company_name=company_name)
+    failed = []
+    for section, result in zip(sections, results):
+        if isinstance(result, BaseException):
+            error = result.detail if isinstance(result, HTTPException) else str(result)
+            print(f"Section {section} failed for {company_name}: {error}")
+            failed.append(section)
+            await _emit(on_step, {"type": "section_failed", "section": section, "error": error})
+            continue
+        setattr(profile, section, result)
+
+    outcome = "failed" if len(failed) == len(sections) else "partial" if failed else "ok"
+    AGENT_RUN_DURATION.labels("parallel", outcome).observe(elapsed)
+    if len(failed) == len(sections):
+        raise HTTPException(status_code=500, detail="AI Agent failed to produce a result for every section.")
+
+    print("Parallel agent run finished.")
+    return profile
+
+
+async def run_sift_agent(
+    company_name: str,
+    on_step: Optional[StepCallback] = None,
+    mode: Optional[str] = None
+) -> CompanyProfile:
+    """
+    Menjalankan SIFT agent untuk satu company.
+    on_step (opsional) dipanggil dengan event dict setiap kali agent selesai satu step.
+    mode: "single" (satu agent untuk semua section) atau "parallel" (satu sub-agent per
+    section), default dari env SIFT_AGENT_MODE.
+    """
+    if (mode or SIFT_AGENT_MODE) == "parallel":
+        return await run_sift_agent_sections(company_name, SECTIONS, on_step)
+
+    print(f"Starting SIFT profiling for: {company_name}...")
+    start = time.perf_counter()
+    outcome = "failed"
+    try:
+        known = await _fast_path(company_name, SECTIONS, on_step)
+        profile = await _run_agent(
+            company_name,
+            build_task_prompt(company_name, known),
+            CompanyProfile,
+            MAX_STEPS,
+            on_step,
+            known=known
+        )
+        outcome = "ok"
+    finally:
+        AGENT_RUN_DURATION.labels("single", outcome).observe(time.perf_counter() - start)
+    print("Agent run finished.")
+    return profile
+
+
+async def run_sift_agent_with_streaming(company_name: str):
+    """
+    Generator function yang menjalankan agent satu kali dan yield progress-nya secara real-time.
+    Digunakan untuk SSE streaming ke frontend.
+
+    Yield ("log", message) untuk pesan umum, ("step", event dict) untuk setiap step
+    agent (format dengan format_step_event), lalu ("result", CompanyProfile).
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def on_step(event: dict):
+        queue.put_nowait(("step", event))
+
+    task = asyncio.create_task(run_sift_agent(company_name, on_step=on_step))
+    task.add_done_callback(lambda _: queue.put_nowait(None))
+
+    if SIFT_AGENT_MODE == "parallel":
+        yield ("log", f"🤖 Parallel agents initialized for {len(SECTIONS)} sections")
+    else:
+        yield ("log", f"🤖 Agent initialized with {MAX_STEPS} max steps")
+    yield ("log", f"📋 Task: Profiling {company_name}")
+
+    try:
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            yield item
+        yield ("result", task.result())
+    finally:
+        if not task.done():
+            task.cancel()
+
+
 async def main():
     """
     Fungsi ini hanya untuk menguji file profiler.py secara langsung.
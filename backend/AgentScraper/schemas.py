@@ -35,4 +35,14 @@ class CompanyProfile(BaseModel):
     overview: CompanyOverview = Field(default_factory=CompanyOverview)
     tech_stack: List[str] = Field(default_factory=list, description="A list of key technologies the company uses")
     recent_news_signals: List[NewsSignal] = Field(default_factory=list, description="A list of recent news articles or signals")
-    key_contacts: List[KeyContact] = Field(default_factory=list, description="A list of key contacts")
\ No newline at end of file
+    key_contacts: List[KeyContact] = Field(default_factory=list, description="A list of key contacts")
+
+# Output schema untuk sub-agent per section (mode parallel)
+class TechStackSection(BaseModel):
+    tech_stack: List[str] = Field(default_factory=list, description="A list of key technologies the company uses")
+
+class NewsSection(BaseModel):
+    recent_news_signals: List[NewsSignal] = Field(default_factory=list, description="A list of recent news articles or signals")
+
+class ContactsSection(BaseModel):
+    key_contacts: List[KeyContact] = Field(default_factory=list, description="A list of key contacts")
@@ -0,0 +1,165 @@
+"""
+Deteksi tech stack dari website company (gaya Wappalyzer), tanpa LLM.
+
+Setiap teknologi di signatures.json punya pola untuk response header, cookie,
+URL <script src>, <meta> (mis. generator) dan HTML mentah, plus `implies`
+(Next.js -> React, WordPress -> PHP). Homepage dan halaman karir di-fetch
+bersamaan dengan HTTP client bersama, lalu hasilnya digabung dengan temuan agent
+di CompanyProfile.tech_stack.
+"""
+import asyncio
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+from urllib.parse import urljoin
+from dotenv import load_dotenv
+from .http_client import FetchedPage, fetch_html
+
+load_dotenv()
+
+TECH_DETECT_ENABLED = os.getenv("TECH_DETECT_ENABLED", "true").lower() in ("1", "true", "yes")
+# Path yang di-fetch selain homepage (halaman karir sering memuat ATS / tracking lain)
+TECH_DETECT_PATHS = [
+    path.strip() for path in os.getenv("TECH_DETECT_PATHS", "/careers,/jobs,/karir").split(",") if path.strip()
+]
+TECH_DETECT_TIMEOUT = float(os.getenv("TECH_DETECT_TIMEOUT", "6"))
+TECH_DETECT_MAX_BYTES = int(os.getenv("TECH_DETECT_MAX_BYTES", str(2 * 1024 * 1024)))
+SIGNATURES_PATH = Path(__file__).with_name("signatures.json")
+
+_SCRIPT_SRC = re.compile(r"<script[^>]+src\s*=\s*[\"']([^\"']+)", re.IGNORECASE)
+_META_TAG = re.compile(r"<meta\s[^>]*>", re.IGNORECASE)
+_META_ATTR = re.compile(r"(name|property|content)\s*=\s*[\"']([^\"']*)[\"']", re.IGNORECASE)
+
+
+def _compile(pattern: str) -> re.Pattern:
+    return re.compile(pattern, re.IGNORECASE)
+
+
+class Signature:
+    def __init__(self, name: str, data: dict):
+        self.name = name
+        self.categories = data.get("cats", [])
+        self.headers = {key.lower(): _compile(value) for key, value in data.get("headers", {}).items()}
+        self.cookies = {key.lower(): _compile(value) for key, value in data.get("cookies", {}).items()}
+        self.meta = {key.lower(): _compile(value) for key, value in data.get("meta", {}).items()}
+        self.scripts = [_compile(pattern) for pattern in data.get("scripts", [])]
+        self.html = [_compile(pattern) for pattern in data.get("html", [])]
+        self.implies = data.get("implies", [])
+
+
+class TechDetector:
+    """Engine pencocokan signature; satu instance dipakai ulang (regex di-compile sekali)"""
+
+    def __init__(self, signatures: Dict[str, dict]):
+        self.signatures = [Signature(name, data) for name, data in signatures.items()]
+        self._by_name = {signature.name: signature for signature in self.signatures}
+
+    @classmethod
+    def from_file(cls, path: Path = SIGNATURES_PATH) -> "TechDetector":
+        return cls(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def _matches(self, signature: Signature, headers, cookies, meta, scripts, html) -> bool:
+        for name, pattern in signature.headers.items():
+            if name in headers and pattern.search(headers[name]):
+                return True
+        for name, pattern in signature.cookies.items():
+            if name in cookies and pattern.search(cookies[name]):
+                return True
+        for name, pattern in signature.meta.items():
+            if any(pattern.search(content) for content in meta.get(name, ())):
+                return True
+        for pattern in signature.scripts:
+            if any(pattern.search(src) for src in scripts):
+                return True
+        return any(pattern.search(html) for pattern in signature.html)
+
+    def _with_implied(self, detected: Set[str]) -> Set[str]:
+        pending = list(detected)
+        while pending:
+            signature = self._by_name.get(pending.pop())
+            for implied in signature.implies if signature else ():
+                if implied not in detected:
+                    detected.add(implied)
+                    pending.append(implied)
+        return detected
+
+    def analyze(self, html: str = "", headers: Optional[dict] = None, cookies: Optional[dict] = None) -> Set[str]:
+        """Nama teknologi yang terdeteksi di satu response (termasuk yang di-imply)"""
+        headers = {key.lower(): value for key, value in (headers or {}).items()}
+        cookies = {key.lower(): value or "" for key, value in (cookies or {}).items()}
+        # Cookie juga dikirim lewat Set-Cookie walaupun client tidak menyimpannya
+        for header in headers.get("set-cookie", "").split(","):
+            name, _, value = header.strip().partition("=")
+            if name and " " not in name:
+                cookies.setdefault(name.lower(), value.split(";")[0])
+
+        meta: Dict[str, List[str]] = {}
+        for tag in _META_TAG.findall(html):
+            attrs = {key.lower(): value for key, value in _META_ATTR.findall(tag)}
+            key = (attrs.get("name") or attrs.get("property") or "").lower()
+            if key and "content" in attrs:
+                meta.setdefault(key, []).append(attrs["content"])
+        scripts = _SCRIPT_SRC.findall(html)
+
+        detected = {
+            signature.name for signature in self.signatures
+            if self._matches(signature, headers, cookies, meta, scripts, html)
+        }
+        return self._with_implied(detected)
+
+    def analyze_page(self, page: FetchedPage) -> Set[str]:
+        return self.analyze(page.html, page.headers, page.cookies)
+
+    def categories(self, name: str) -> List[str]:
+        signature = self._by_name.get(name)
+        return signature.categories if signature else []
+
+
+_detector: Optional[TechDetector] = None
+
+
+def get_detector() -> TechDetector:
+    global _detector
+    if _detector is None:
+        _detector = TechDetector.from_file()
+    return _detector
+
+
+def _ordered(detected: Iterable[str]) -> List[str]:
+    """Urutan stabil: mengikuti urutan signatures.json"""
+    detected = set(detected)
+    return [signature.name for signature in get_detector().signatures if signature.name in detected]
+
+
+async def detect_tech_stack(website: str, homepage: Optional[FetchedPage] = None) -> dict:
+    """
+    Fetch homepage (jika belum ada) dan halaman karir secara paralel lalu cocokkan signature.
+    Return {"tech_stack": [...], "pages": jumlah halaman yang dianalisis, "started_at", "finished_at"}.
+    """
+    started_at = time.time()
+    base = website if "://" in website else f"https://{website}"
+    urls = [urljoin(base, path) for path in TECH_DETECT_PATHS]
+    if homepage is None:
+        urls.insert(0, base)
+
+    fetched = await asyncio.gather(
+        *(fetch_html(url, TECH_DETECT_MAX_BYTES, TECH_DETECT_TIMEOUT) for url in urls),
+        return_exceptions=True
+    )
+    pages = [homepage] if homepage is not None else []
+    pages += [page for page in fetched if page and not isinstance(page, BaseException)]
+
+    detector = get_detector()
+    detected: Set[str] = set()
+    for page in pages:
+        detected |= await asyncio.to_thread(detector.analyze_page, page)
+
+    return {
+        "tech_stack": _ordered(detected),
+        "pages": len(pages),
+        "started_at": started_at,
+        "finished_at": time.time(),
+    }
@@ -0,0 +1,139 @@
+"""
+Endpoint admin untuk melihat breakdown durasi per stage (kolom company_profiles.timings).
+
+Akses dibatasi ke email yang terdaftar di env ADMIN_EMAILS (dipisah koma).
+"""
+import os
+from typing import Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from dotenv import load_dotenv
+from .database import db
+from .auth import get_current_user
+
+load_dotenv()
+
+ADMIN_EMAILS = {email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()}
+
+
+async def require_admin(current_user: dict = Depends(get_current_user)) -> dict:
+    """Dependency: hanya user dengan email di ADMIN_EMAILS"""
+    if (current_user.get("email") or "").lower() not in ADMIN_EMAILS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return current_user
+
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(require_admin)]
+)
+
+
+@router.get("/profiles/{profile_id}/timings")
+async def get_profile_timings(profile_id: str):
+    """
+    Breakdown durasi per stage untuk satu profile: agent run, setiap step agent,
+    intelligence, serialisasi dan DB write.
+    """
+    profile = await db.fetch_one(
+        """
+        SELECT profile_id, company_name, status, created_at, timings
+        FROM company_profiles
+        WHERE profile_id = $1::uuid
+        """,
+        profile_id
+    )
+    if not profile:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+
+    return {
+        "profile_id": str(profile["profile_id"]),
+        "company_name": profile["company_name"],
+        "status": profile["status"],
+        "created_at": str(profile["created_at"]),
+        "timings": profile["timings"],
+    }
+
+
+@router.get("/timings/slowest")
+async def get_slowest_profiles(
+    stage: str = Query("agent_run", description="Nama stage, mis. agent_run, intelligence, db_write"),
+    days: int = Query(7, ge=1, le=365),
+    limit: int = Query(20, ge=1, le=200)
+):
+    """Profile dengan durasi stage paling lama yang diproses dalam `days` hari terakhir"""
+    rows = await db.fetch_all(
+        """
+        SELECT p.profile_id, p.company_name, p.status, p.created_at,
+               p.timings->>'agent_source' AS agent_source,
+               SUM((span->>'duration_ms')::float) AS duration_ms,
+               (p.timings->>'total_ms')::float AS total_ms
+        FROM company_profiles p,
+             jsonb_array_elements(p.timings->'spans') AS span
+        WHERE p.timings IS NOT NULL
+          AND span->>'stage' = $1
+          AND (p.timings->>'started_at')::timestamp >= NOW() - make_interval(days => $2)
+        GROUP BY p.profile_id
+        ORDER BY duration_ms DESC
+        LIMIT $3
+        """,
+        stage,
+        days,
+        limit
+    )
+    return [
+        {
+            "profile_id": str(row["profile_id"]),
+            "company_name": row["company_name"],
+            "status": row["status"],
+            "created_at": str(row["created_at"]),
+            "agent_source": row["agent_source"],
+            "duration_ms": row["duration_ms"],
+            "total_ms": row["total_ms"],
+        }
+        for row in rows
+    ]
+
+
+@router.get("/timings/summary")
+async def get_timings_summary(
+    days: int = Query(7, ge=1, le=365),
+    agent_source: Optional[str] = Query(None, description="Filter sumber hasil agent: agent, cache, coalesced, refresh")
+):
+    """
+    Statistik durasi per stage per hari (jumlah, rata-rata, p50, p95) untuk
+    memantau regresi dari waktu ke waktu.
+    """
+    rows = await db.fetch_all(
+        """
+        SELECT date_trunc('day', (p.timings->>'started_at')::timestamp)::date AS day,
+               span->>'stage' AS stage,
+               COUNT(*) AS count,
+               AVG((span->>'duration_ms')::float) AS avg_ms,
+               percentile_cont(0.5) WITHIN GROUP (ORDER BY (span->>'duration_ms')::float) AS p50_ms,
+               percentile_cont(0.95) WITHIN GROUP (ORDER BY (span->>'duration_ms')::float) AS p95_ms
+        FROM company_profiles p,
+             jsonb_array_elements(p.timings->'spans') AS span
+        WHERE p.timings IS NOT NULL
+          AND (p.timings->>'started_at')::timestamp >= NOW() - make_interval(days => $1)
+          AND ($2::text IS NULL OR p.timings->>'agent_source' = $2)
+        GROUP BY day, stage
+        ORDER BY day DESC, stage
+        """,
+        days,
+        agent_source
+    )
+    return [
+        {
+            "day": str(row["day"]),
+            "stage": row["stage"],
+            "count": row["count"],
+            "avg_ms": round(row["avg_ms"], 1),
+            "p50_ms": round(row["p50_ms"], 1),
+            "p95_ms": round(row["p95_ms"], 1),
+        }
+        for row in rows
+    ]
@@ -1,11 +1,18 @@
+import asyncio
+import hashlib
 import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
+from .lru import LRUCache
+from .token_revocation import is_token_revoked
 
 load_dotenv()
 
@@ -14,19 +21,101 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 hari
 
+# Cache claim token yang sudah diverifikasi, key = SHA-256 token, expired di claim exp
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+_token_cache = LRUCache(maxsize=TOKEN_CACHE_SIZE)
+_token_cache_stats = {"hits": 0, "misses": 0, "revoked": 0}
+
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+# bcrypt dijalankan di thread pool terbatas supaya tidak mem-block event loop.
+# Jika antrian melebihi BCRYPT_MAX_PENDING, request ditolak dengan 503.
+BCRYPT_POOL_SIZE = int(os.getenv("BCRYPT_POOL_SIZE", str(min(4, os.cpu_count() or 1))))
+BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", "64"))
+
+_bcrypt_executor = ThreadPoolExecutor(max_workers=BCRYPT_POOL_SIZE, thread_name_prefix="bcrypt")
+_bcrypt_stats = {
+    "pending": 0,
+    "peak_pending": 0,
+    "completed": 0,
+    "rejected": 0,
+    "rehashed": 0,
+    "total_wait_seconds": 0.0,
+    "max_wait_seconds": 0.0,
+    "total_run_seconds": 0.0,
+}
 
 # HTTP Bearer untuk mendapatkan token dari header
 security = HTTPBearer()
 
-def hash_password(password: str) -> str:
+def get_bcrypt_metrics() -> dict:
+    """Ukuran pool, kedalaman antrian, dan rata-rata waktu tunggu/eksekusi bcrypt"""
+    stats = _bcrypt_stats
+    completed = stats["completed"] or 1
+    return {
+        "pool_size": BCRYPT_POOL_SIZE,
+        "max_pending": BCRYPT_MAX_PENDING,
+        "pending": stats["pending"],
+        "queue_depth": max(0, stats["pending"] - BCRYPT_POOL_SIZE),
+        "peak_pending": stats["peak_pending"],
+        "completed": stats["completed"],
+        "rejected": stats["rejected"],
+        "rehashed": stats["rehashed"],
+        "avg_wait_ms": round(stats["total_wait_seconds"] / completed * 1000, 1),
+        "max_wait_ms": round(stats["max_wait_seconds"] * 1000, 1),
+        "avg_run_ms": round(stats["total_run_seconds"] / completed * 1000, 1),
+    }
+
+def _timed_call(fn, *args):
+    started = time.perf_counter()
+    return started, fn(*args), time.perf_counter()
+
+async def _run_bcrypt(fn, *args):
+    """Jalankan fungsi bcrypt di _bcrypt_executor dan catat metrics antrian"""
+    stats = _bcrypt_stats
+    if stats["pending"] >= BCRYPT_MAX_PENDING:
+        stats["rejected"] += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+    stats["pending"] += 1
+    stats["peak_pending"] = max(stats["peak_pending"], stats["pending"])
+    submitted = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        started, result, finished = await loop.run_in_executor(_bcrypt_executor, _timed_call, fn, *args)
+    finally:
+        stats["pending"] -= 1
+
+    wait = started - submitted
+    stats["completed"] += 1
+    stats["total_wait_seconds"] += wait
+    stats["max_wait_seconds"] = max(stats["max_wait_seconds"], wait)
+    stats["total_run_seconds"] += finished - started
+    return result
+
+async def hash_password(password: str) -> str:
     """Hash password menggunakan bcrypt"""
-    return pwd_context.hash(password)
+    return await _run_bcrypt(pwd_context.hash, password)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifikasi password dengan hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return await _run_bcrypt(pwd_context.verify, plain_password, hashed_password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifikasi password dan, jika hash memakai parameter lama (mis. BCRYPT_ROUNDS
+    berubah), kembalikan hash baru untuk disimpan. Return (valid, new_hash atau None).
+    """
+    valid, new_hash = await _run_bcrypt(pwd_context.verify_and_update, plain_password, hashed_password)
+    if new_hash:
+        _bcrypt_stats["rehashed"] += 1
+    return valid, new_hash
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Membuat JWT access token"""
@@ -37,21 +126,45 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def get_token_cache_stats() -> dict:
+    """Counter hit/miss cache token terverifikasi"""
+    return {**_token_cache_stats, "size": len(_token_cache)}
+
 def decode_access_token(token: str) -> dict:
-    """Decode JWT token dan return payload"""
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except JWTError:
+    """
+    Decode JWT token dan return payload.
+    Token yang sudah pernah diverifikasi diambil dari cache tanpa verifikasi
+    signature ulang; token yang sudah di-revoke (logout) selalu ditolak.
+    """
+    cache_key = hashlib.sha256(token.encode()).digest()
+    payload = _token_cache.get(cache_key)
+    if payload is None:
+        _token_cache_stats["misses"] += 1
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        if "exp" in payload:
+            _token_cache.set(cache_key, payload, expires_at=payload["exp"])
+    else:
+        _token_cache_stats["hits"] += 1
+
+    if is_token_revoked(payload.get("jti")):
+        _token_cache_stats["revoked"] += 1
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
+            detail="Token has been revoked",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    return payload
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     """
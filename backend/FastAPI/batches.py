@@ -0,0 +1,324 @@
+"""
+Batch profiling: upload daftar company (CSV / NDJSON) dan pantau progress-nya.
+
+Semua profile dalam batch dibuat dan dimasukkan ke antrian profile_jobs dalam
+satu statement; concurrency dibatasi oleh jumlah slot worker.
+"""
+import csv
+import io
+import json
+import os
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from dotenv import load_dotenv
+from .database import db
+from .auth import get_current_user
+from .job_queue import JOB_MAX_ATTEMPTS
+from .rate_limit import admit_batch_request
+from .serializers import dumps_profile
+from AgentScraper.company_names import normalize_company_name
+
+load_dotenv()
+
+BATCH_MAX_COMPANIES = int(os.getenv("BATCH_MAX_COMPANIES", "1000"))
+BATCH_MAX_UPLOAD_BYTES = int(os.getenv("BATCH_MAX_UPLOAD_BYTES", str(2 * 1024 * 1024)))
+
+router = APIRouter(
+    prefix="/profiles/batch",
+    tags=["Batch Profiling"]
+)
+
+
+class BatchCreateResponse(BaseModel):
+    batch_id: str
+    total: int
+    duplicates_skipped: int
+    created_at: str
+
+class BatchProgressResponse(BaseModel):
+    batch_id: str
+    total: int
+    queued: int
+    running: int
+    done: int
+    failed: int
+    eta_seconds: Optional[float] = None
+    created_at: str
+
+
+async def ensure_batch_tables():
+    """Membuat tabel profile_batches dan kolom batch_id / batch_position di company_profiles"""
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS profile_batches (
+            batch_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            user_id UUID NOT NULL,
+            total INTEGER NOT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT NOW()
+        )
+    """)
+    await db.execute("""
+        ALTER TABLE company_profiles
+        ADD COLUMN IF NOT EXISTS batch_id UUID REFERENCES profile_batches(batch_id) ON DELETE SET NULL
+    """)
+    # Urutan company di file upload; semua profile satu batch punya created_at yang sama
+    await db.execute("""
+        ALTER TABLE company_profiles
+        ADD COLUMN IF NOT EXISTS batch_position INTEGER
+    """)
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_company_profiles_batch_id
+        ON company_profiles (batch_id) WHERE batch_id IS NOT NULL
+    """)
+
+
+def _is_ndjson(content: str, filename: str = "", content_type: str = "") -> bool:
+    """Format dari ekstensi, lalu content-type; isi file hanya di-sniff jika keduanya tidak ada"""
+    if filename.endswith((".ndjson", ".jsonl")):
+        return True
+    if filename.endswith((".csv", ".txt")):
+        return False
+    if "ndjson" in content_type or "jsonl" in content_type or "json" in content_type:
+        return True
+    if "csv" in content_type:
+        return False
+    # Tanpa ekstensi / content-type: hanya objek JSON yang jelas dianggap NDJSON
+    # (baris pertama CSV dengan header ber-quote juga diawali '"')
+    return "." not in filename.rsplit("/", 1)[-1] and content.lstrip().startswith("{")
+
+
+def parse_company_list(content: str, filename: str = "", content_type: str = "") -> List[str]:
+    """
+    Parse daftar company dari CSV (kolom `company_name` atau kolom pertama)
+    atau NDJSON (baris {"company_name": ...} atau string JSON).
+    """
+    names = []
+    if _is_ndjson(content, filename, content_type):
+        for line_number, line in enumerate(content.splitlines(), start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Invalid JSON on line {line_number}"
+                )
+            names.append(item.get("company_name", "") if isinstance(item, dict) else str(item))
+    else:
+        rows = list(csv.reader(io.StringIO(content)))
+        if rows and "company_name" in [cell.strip().lower() for cell in rows[0]]:
+            column = [cell.strip().lower() for cell in rows[0]].index("company_name")
+            rows = rows[1:]
+        else:
+            column = 0
+        names = [row[column] for row in rows if len(row) > column]
+
+    return [name.strip() for name in names if name and name.strip()]
+
+
+def dedupe_company_names(names: List[str]) -> List[str]:
+    """Buang duplikat berdasarkan nama ternormalisasi, simpan ejaan pertama"""
+    seen = set()
+    unique = []
+    for name in names:
+        key = normalize_company_name(name)
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(name)
+    return unique
+
+
+@router.post("", response_model=BatchCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_batch(
+    file: UploadFile = File(..., description="CSV atau NDJSON berisi daftar company"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Membuat banyak company profile sekaligus dari file CSV / NDJSON.
+
+    **Requires**: Bearer token di header Authorization
+
+    Nama company yang sama (setelah normalisasi) hanya diproses sekali.
+    """
+    raw = await file.read(BATCH_MAX_UPLOAD_BYTES + 1)
+    if len(raw) > BATCH_MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds {BATCH_MAX_UPLOAD_BYTES} bytes"
+        )
+    try:
+        content = raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File must be UTF-8 encoded")
+
+    names = parse_company_list(content, (file.filename or "").lower(), (file.content_type or "").lower())
+    unique_names = dedupe_company_names(names)
+
+    if not unique_names:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No company names found in file")
+    if len(unique_names) > BATCH_MAX_COMPANIES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch is limited to {BATCH_MAX_COMPANIES} companies"
+        )
+    
+    # Setiap company di batch adalah satu agent run dan mengambil satu token budget batch
+    await admit_batch_request(current_user["user_id"], len(unique_names))
+
+    try:
+        batch = await db.fetch_one(
+            """
+            WITH batch AS (
+                INSERT INTO profile_batches (user_id, total)
+                VALUES ($1, $2)
+                RETURNING batch_id, created_at
+            ),
+            new_profiles AS (
+                INSERT INTO company_profiles (user_id, company_name, status, created_at, batch_id, batch_position)
+                SELECT $1, name, 'processing', $3, batch.batch_id, position
+                FROM unnest($4::text[]) WITH ORDINALITY AS t(name, position), batch
+                RETURNING profile_id, company_name
+            ),
+            new_jobs AS (
+                INSERT INTO profile_jobs (profile_id, company_name, max_attempts)
+                SELECT profile_id, company_name, $5 FROM new_profiles
+            )
+            SELECT batch_id, created_at FROM batch
+            """,
+            current_user["user_id"],
+            len(unique_names),
+            datetime.utcnow(),
+            unique_names,
+            JOB_MAX_ATTEMPTS
+        )
+    except Exception as e:
+        print(f"Error creating batch: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create batch: {str(e)}"
+        )
+
+    return BatchCreateResponse(
+        batch_id=str(batch["batch_id"]),
+        total=len(unique_names),
+        duplicates_skipped=len(names) - len(unique_names),
+        created_at=str(batch["created_at"])
+    )
+
+
+async def _get_batch(batch_id: UUID, user_id: str):
+    batch = await db.fetch_one(
+        "SELECT batch_id, total, created_at FROM profile_batches WHERE batch_id = $1::uuid AND user_id = $2",
+        batch_id,
+        user_id
+    )
+    if not batch:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Batch not found or you don't have access"
+        )
+    return batch
+
+
+@router.get("/{batch_id}", response_model=BatchProgressResponse)
+async def get_batch_progress(
+    batch_id: UUID,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Progress agregat batch: jumlah queued, running, done, failed dan estimasi
+    sisa waktu berdasarkan throughput yang sudah teramati.
+
+    **Requires**: Bearer token di header Authorization
+    """
+    try:
+        batch = await _get_batch(batch_id, current_user["user_id"])
+
+        # Job terakhir per profile (refresh bisa membuat lebih dari satu job)
+        stats = await db.fetch_one(
+            """
+            WITH latest AS (
+                SELECT DISTINCT ON (j.profile_id) j.status, j.started_at, j.finished_at
+                FROM profile_jobs j
+                JOIN company_profiles p ON p.profile_id = j.profile_id
+                WHERE p.batch_id = $1::uuid
+                ORDER BY j.profile_id, j.job_id DESC
+            )
+            SELECT
+                COUNT(*) FILTER (WHERE status = 'queued') AS queued,
+                COUNT(*) FILTER (WHERE status = 'processing') AS running,
+                COUNT(*) FILTER (WHERE status = 'completed') AS done,
+                COUNT(*) FILTER (WHERE status = 'failed') AS failed,
+                EXTRACT(EPOCH FROM NOW() - MIN(started_at)) AS elapsed_seconds
+            FROM latest
+            """,
+            batch_id
+        )
+
+        finished = stats["done"] + stats["failed"]
+        remaining = stats["queued"] + stats["running"]
+        eta_seconds = None
+        if finished and remaining and stats["elapsed_seconds"]:
+            throughput = finished / float(stats["elapsed_seconds"])
+            eta_seconds = round(remaining / throughput, 1)
+        elif not remaining:
+            eta_seconds = 0.0
+
+        return BatchProgressResponse(
+            batch_id=str(batch["batch_id"]),
+            total=batch["total"],
+            queued=stats["queued"],
+            running=stats["running"],
+            done=stats["done"],
+            failed=stats["failed"],
+            eta_seconds=eta_seconds,
+            created_at=str(batch["created_at"])
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error getting batch progress: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get batch progress: {str(e)}"
+        )
+
+
+@router.get("/{batch_id}/results")
+async def download_batch_results(
+    batch_id: UUID,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Download semua profile dalam batch sebagai NDJSON (satu profile per baris).
+    Hasil di-stream langsung dari database cursor, jadi aman untuk batch besar.
+
+    **Requires**: Bearer token di header Authorization
+    """
+    await _get_batch(batch_id, current_user["user_id"])
+
+    async def ndjson_generator():
+        async for profile in db.iterate(
+            """
+            SELECT profile_id, user_id, company_name, status, overview, tech_stack,
+                   recent_news_signals, key_contacts, executive_summary, pain_points,
+                   opening_lines, data_sources, last_analyzed_at, is_favorite, created_at
+            FROM company_profiles
+            WHERE batch_id = $1::uuid
+            ORDER BY batch_position, created_at, profile_id
+            """,
+            batch_id
+        ):
+            yield dumps_profile(profile) + b"\n"
+
+    return StreamingResponse(
+        ndjson_generator(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="batch-{batch_id}.ndjson"'}
+    )
@@ -1,15 +1,33 @@
 import os
 from dotenv import load_dotenv
 import asyncpg
+import orjson
+from contextlib import asynccontextmanager
 from typing import Optional
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+
+def _encode_json(value) -> str:
+    return orjson.dumps(value).decode()
+
+
+async def _init_connection(connection):
+    """Register codec JSON (orjson) supaya kolom json/jsonb langsung menjadi dict/list Python"""
+    for typename in ("json", "jsonb"):
+        await connection.set_type_codec(
+            typename,
+            encoder=_encode_json,
+            decoder=orjson.loads,
+            schema="pg_catalog"
+        )
+
 class Database:
     def __init__(self):
         self.pool: Optional[asyncpg.Pool] = None
+        self.waiting = 0  # jumlah pemanggil yang sedang menunggu koneksi dari pool
     
     async def connect(self):
         """Membuat connection pool ke database"""
@@ -18,7 +36,8 @@ class Database:
                 DATABASE_URL,
                 min_size=5,
                 max_size=20,
-                command_timeout=60
+                command_timeout=60,
+                init=_init_connection
             )
             print("✅ Database connection pool created")
     
@@ -28,25 +47,59 @@ class Database:
             await self.pool.close()
             print("❌ Database connection pool closed")
     
+    @asynccontextmanager
+    async def acquire(self):
+        """Ambil koneksi dari pool sambil menghitung pemanggil yang menunggu"""
+        self.waiting += 1
+        try:
+            connection = await self.pool.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            yield connection
+        finally:
+            await self.pool.release(connection)
+    
+    def pool_stats(self) -> dict:
+        """Ukuran pool, koneksi yang dipakai/idle, dan jumlah yang menunggu"""
+        if not self.pool:
+            return {"size": 0, "max_size": 0, "in_use": 0, "idle": 0, "waiting": self.waiting}
+        size = self.pool.get_size()
+        idle = self.pool.get_idle_size()
+        return {
+            "size": size,
+            "max_size": self.pool.get_max_size(),
+            "in_use": size - idle,
+            "idle": idle,
+            "waiting": self.waiting,
+        }
+    
     async def fetch_one(self, query: str, *args):
         """Fetch single row"""
-        async with self.pool.acquire() as connection:
+        async with self.acquire() as connection:
             return await connection.fetchrow(query, *args)
     
     async def fetch_all(self, query: str, *args):
         """Fetch multiple rows"""
-        async with self.pool.acquire() as connection:
+        async with self.acquire() as connection:
             return await connection.fetch(query, *args)
     
     async def execute(self, query: str, *args):
         """Execute query (INSERT, UPDATE, DELETE)"""
-        async with self.pool.acquire() as connection:
+        async with self.acquire() as connection:
             return await connection.execute(query, *args)
     
     async def fetch_val(self, query: str, *args):
         """Fetch single value"""
-        async with self.pool.acquire() as connection:
+        async with self.acquire() as connection:
             return await connection.fetchval(query, *args)
+    
+    async def iterate(self, query: str, *args, prefetch: int = 100):
+        """Iterate rows dengan server-side cursor (untuk hasil yang besar)"""
+        async with self.acquire() as connection:
+            async with connection.transaction():
+                async for row in connection.cursor(query, *args, prefetch=prefetch):
+                    yield row
 
 # Instance global database
 db = Database()
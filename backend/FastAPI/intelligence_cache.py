@@ -0,0 +1,129 @@
+"""
+Cache hasil AI intelligence berdasarkan isi data (content-addressed).
+
+Key adalah hash SHA-256 dari context yang sudah dikanonisasi (urutan list dan
+key dict tidak berpengaruh) ditambah nama model dan versi prompt. Enrichment
+ulang dengan data scraping yang sama langsung dilayani dari cache tanpa
+memanggil Gemini.
+"""
+import copy
+import hashlib
+import json
+import os
+from typing import List, Optional
+from dotenv import load_dotenv
+from .database import db
+from .lru import LRUCache
+
+load_dotenv()
+
+INTELLIGENCE_CACHE_MAX_ROWS = int(os.getenv("INTELLIGENCE_CACHE_MAX_ROWS", "10000"))
+INTELLIGENCE_CACHE_LRU_SIZE = int(os.getenv("INTELLIGENCE_CACHE_LRU_SIZE", "512"))
+
+_memory_cache = LRUCache(maxsize=INTELLIGENCE_CACHE_LRU_SIZE)
+_stats = {"memory_hits": 0, "db_hits": 0, "misses": 0}
+
+
+def get_intelligence_cache_stats() -> dict:
+    """Counter hit/miss cache intelligence"""
+    return {**_stats, "memory_size": len(_memory_cache)}
+
+
+def intelligence_cache_key(
+    model_name: str,
+    prompt_version: str,
+    company_name: str,
+    overview: dict,
+    tech_stack: List[str],
+    recent_news: List[dict],
+    key_contacts: List[dict]
+) -> str:
+    """Hash stabil dari context prompt yang sudah dikanonisasi"""
+    canonical = {
+        "model": model_name,
+        "prompt_version": prompt_version,
+        "company_name": company_name.strip(),
+        "overview": {k: overview.get(k) for k in ("industry", "location", "employee_count")},
+        "tech_stack": sorted(set(tech_stack)),
+        "recent_news": sorted(recent_news, key=lambda n: json.dumps(n, sort_keys=True)),
+        "key_contacts": sorted(key_contacts, key=lambda c: json.dumps(c, sort_keys=True)),
+    }
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def ensure_intelligence_cache_table():
+    """Membuat tabel intelligence_cache jika belum ada"""
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS intelligence_cache (
+            cache_key TEXT PRIMARY KEY,
+            model TEXT NOT NULL,
+            result JSONB NOT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            last_hit_at TIMESTAMP NOT NULL DEFAULT NOW()
+        )
+    """)
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_intelligence_cache_last_hit
+        ON intelligence_cache (last_hit_at)
+    """)
+
+
+async def get_cached_intelligence(cache_key: str) -> Optional[dict]:
+    """Cari hasil intelligence di LRU lalu di Postgres"""
+    result = _memory_cache.get(cache_key)
+    if result is not None:
+        _stats["memory_hits"] += 1
+        return copy.deepcopy(result)
+
+    try:
+        row = await db.fetch_one(
+            """
+            UPDATE intelligence_cache SET last_hit_at = NOW()
+            WHERE cache_key = $1
+            RETURNING result
+            """,
+            cache_key
+        )
+    except Exception as e:
+        print(f"Warning: intelligence cache lookup failed: {e}")
+        row = None
+
+    if not row:
+        _stats["misses"] += 1
+        return None
+
+    _stats["db_hits"] += 1
+    _memory_cache.set(cache_key, row["result"])
+    return copy.deepcopy(row["result"])
+
+
+async def store_intelligence(cache_key: str, model_name: str, result: dict):
+    """Simpan hasil intelligence lalu evict entry lama jika melebihi INTELLIGENCE_CACHE_MAX_ROWS"""
+    _memory_cache.set(cache_key, copy.deepcopy(result))
+
+    try:
+        await db.execute(
+            """
+            INSERT INTO intelligence_cache (cache_key, model, result)
+            VALUES ($1, $2, $3)
+            ON CONFLICT (cache_key) DO UPDATE
+            SET result = EXCLUDED.result, created_at = NOW(), last_hit_at = NOW()
+            """,
+            cache_key,
+            model_name,
+            result
+        )
+        await db.execute(
+            """
+            DELETE FROM intelligence_cache
+            WHERE cache_key IN (
+                SELECT cache_key FROM intelligence_cache
+                ORDER BY last_hit_at DESC
+                OFFSET $1
+            )
+            """,
+            INTELLIGENCE_CACHE_MAX_ROWS
+        )
+    except Exception as e:
+        print(f"Warning: Could not store intelligence cache: {e}")
@@ -3,10 +3,15 @@ Service untuk generate AI intelligence dari company data
 """
 import os
 import json
+import time
+import asyncio
+from collections import deque
 from typing import List, Dict
 import google.generativeai as genai
 from dotenv import load_dotenv
-from .intelligence_models import PainPoint, CompanyIntelligence
+from .intelligence_models import OpeningLine, CompanyIntelligence
+from .intelligence_cache import intelligence_cache_key, get_cached_intelligence, store_intelligence
+from .metrics import ENRICHMENT_DURATION, GEMINI_REQUEST_DURATION, GEMINI_TOKENS
 
 load_dotenv()
 
@@ -14,6 +19,86 @@ load_dotenv()
 genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 model = genai.GenerativeModel('gemini-2.5-flash')  
 
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
+GEMINI_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "60"))
+
+# Naikkan setiap kali prompt intelligence diubah supaya cache lama tidak terpakai
+INTELLIGENCE_PROMPT_VERSION = "1"
+
+_gemini_semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+_gemini_latencies = deque(maxlen=500)
+_gemini_stats = {"calls": 0, "errors": 0, "timeouts": 0, "in_flight": 0}
+
+
+def get_gemini_metrics() -> dict:
+    """Statistik latency panggilan Gemini (detik) dari 500 panggilan terakhir"""
+    latencies = sorted(_gemini_latencies)
+
+    def percentile(p: float):
+        if not latencies:
+            return None
+        return round(latencies[min(int(len(latencies) * p), len(latencies) - 1)], 3)
+
+    return {
+        **_gemini_stats,
+        "p50_seconds": percentile(0.50),
+        "p95_seconds": percentile(0.95),
+        "p99_seconds": percentile(0.99),
+    }
+
+
+async def _generate_content(prompt: str, generation_config) -> str:
+    """
+    Panggil Gemini secara async (tidak memblokir event loop), dibatasi
+    GEMINI_MAX_CONCURRENCY panggilan bersamaan dan GEMINI_TIMEOUT_SECONDS per panggilan.
+    """
+    async with _gemini_semaphore:
+        _gemini_stats["calls"] += 1
+        _gemini_stats["in_flight"] += 1
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            response = await asyncio.wait_for(
+                model.generate_content_async(prompt, generation_config=generation_config),
+                timeout=GEMINI_TIMEOUT_SECONDS
+            )
+            outcome = "ok"
+            usage = getattr(response, "usage_metadata", None)
+            if usage is not None:
+                GEMINI_TOKENS.labels("prompt").observe(usage.prompt_token_count or 0)
+                GEMINI_TOKENS.labels("completion").observe(usage.candidates_token_count or 0)
+            return response.text
+        except asyncio.TimeoutError:
+            _gemini_stats["timeouts"] += 1
+            outcome = "timeout"
+            raise
+        except Exception:
+            _gemini_stats["errors"] += 1
+            raise
+        finally:
+            _gemini_stats["in_flight"] -= 1
+            elapsed = time.perf_counter() - start
+            _gemini_latencies.append(elapsed)
+            GEMINI_REQUEST_DURATION.labels(outcome).observe(elapsed)
+
+def _validate_intelligence(company_name: str, data: dict) -> dict:
+    """
+    Validasi output Gemini dengan CompanyIntelligence / OpeningLine.
+    Raise ValueError (ValidationError) jika field wajib hilang atau tipenya salah.
+    """
+    intelligence = CompanyIntelligence.model_validate({**data, "company_name": company_name})
+    if not intelligence.executive_summary:
+        raise ValueError("Gemini response has no executive_summary")
+    return {
+        "executive_summary": intelligence.executive_summary,
+        "pain_points": [pain_point.model_dump() for pain_point in intelligence.pain_points],
+        "opening_lines": {
+            key: OpeningLine.model_validate(line).model_dump()
+            for key, line in intelligence.opening_lines.items()
+        },
+    }
+
+
 async def generate_company_intelligence(
     company_name: str,
     overview: dict,
@@ -28,8 +113,18 @@ async def generate_company_intelligence(
     - executive_summary
     - pain_points
     - opening_lines
+    
+    Hasil untuk data yang sama persis diambil dari intelligence cache.
     """
     
+    cache_key = intelligence_cache_key(
+        model.model_name, INTELLIGENCE_PROMPT_VERSION,
+        company_name, overview, tech_stack, recent_news, key_contacts
+    )
+    cached = await get_cached_intelligence(cache_key)
+    if cached is not None:
+        return cached
+    
     # Prepare context untuk LLM
     context = f"""
 COMPANY: {company_name}
@@ -113,18 +208,19 @@ IMPORTANT:
 
     try:
         # Call Gemini API
-        response = model.generate_content(
+        response_text = await _generate_content(
             prompt,
-            generation_config=genai.types.GenerationConfig(
+            genai.types.GenerationConfig(
                 temperature=0.7,
                 response_mime_type="application/json"
             )
         )
         
-        # Parse response
-        intelligence_data = json.loads(response.text)
+        # Parse dan validasi response; output yang tidak valid tidak di-cache
+        intelligence_data = _validate_intelligence(company_name, json.loads(response_text))
         
-        # Validate and return
+        # Cache and return
+        await store_intelligence(cache_key, model.model_name, intelligence_data)
         return intelligence_data
         
     except Exception as e:
@@ -150,12 +246,13 @@ async def enrich_profile_with_intelligence(profile_data) -> dict:
     recent_news = profile_data.get('recent_news_signals', [])
     key_contacts = profile_data.get('key_contacts', [])
     
-    intelligence = await generate_company_intelligence(
-        company_name=profile_data.get('company_name', ''),
-        overview=overview,
-        tech_stack=tech_stack,
-        recent_news=recent_news,
-        key_contacts=key_contacts
-    )
+    with ENRICHMENT_DURATION.time():
+        intelligence = await generate_company_intelligence(
+            company_name=profile_data.get('company_name', ''),
+            overview=overview,
+            tech_stack=tech_stack,
+            recent_news=recent_news,
+            key_contacts=key_contacts
+        )
     
     return intelligence
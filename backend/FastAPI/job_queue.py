@@ -0,0 +1,233 @@
+"""
+Durable job queue untuk profile generation, disimpan di tabel `profile_jobs`.
+
+Worker mengambil job dengan `SELECT ... FOR UPDATE SKIP LOCKED` sehingga
+beberapa proses worker bisa berjalan paralel tanpa mengambil job yang sama.
+"""
+import os
+from typing import List, Optional
+from dotenv import load_dotenv
+from .database import db
+from .profile_events import notify_profile_status
+
+load_dotenv()
+
+# Job yang heartbeat-nya lebih lama dari ini dianggap orphan (worker crash)
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "300"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+
+async def ensure_job_table():
+    """Membuat tabel profile_jobs jika belum ada"""
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS profile_jobs (
+            job_id BIGSERIAL PRIMARY KEY,
+            profile_id UUID NOT NULL REFERENCES company_profiles(profile_id) ON DELETE CASCADE,
+            company_name TEXT NOT NULL,
+            force_refresh BOOLEAN NOT NULL DEFAULT FALSE,
+            sections TEXT[],
+            status VARCHAR(20) NOT NULL DEFAULT 'queued',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 3,
+            worker_id TEXT,
+            last_error TEXT,
+            created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            started_at TIMESTAMP,
+            heartbeat_at TIMESTAMP,
+            finished_at TIMESTAMP
+        )
+    """)
+    await db.execute("""
+        ALTER TABLE profile_jobs
+        ADD COLUMN IF NOT EXISTS force_refresh BOOLEAN NOT NULL DEFAULT FALSE,
+        ADD COLUMN IF NOT EXISTS sections TEXT[]
+    """)
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_profile_jobs_queued
+        ON profile_jobs (created_at) WHERE status = 'queued'
+    """)
+
+
+async def enqueue_profile_job(
+    profile_id: str,
+    company_name: str,
+    force_refresh: bool = False,
+    sections: Optional[List[str]] = None
+) -> int:
+    """
+    Memasukkan job baru ke antrian, return job_id.
+    sections=None berarti profile lengkap, selain itu hanya section tersebut yang di-refresh.
+    """
+    return await db.fetch_val(
+        """
+        INSERT INTO profile_jobs (profile_id, company_name, force_refresh, sections, max_attempts)
+        VALUES ($1::uuid, $2, $3, $4, $5)
+        RETURNING job_id
+        """,
+        profile_id,
+        company_name,
+        force_refresh,
+        sections,
+        JOB_MAX_ATTEMPTS
+    )
+
+
+async def _fail_job_profiles(jobs: list):
+    """
+    Tandai profile dari job yang gagal permanen. Job refresh (sections diisi) tidak
+    mengubah data lama, jadi profile yang pernah berhasil dianalisis tetap 'completed'.
+    """
+    for job in jobs:
+        await db.execute(
+            """
+            UPDATE company_profiles
+            SET status = CASE WHEN $2 AND last_analyzed_at IS NOT NULL THEN 'completed' ELSE 'failed' END
+            WHERE profile_id = $1
+            """,
+            job["profile_id"],
+            bool(job["sections"])
+        )
+    if jobs:
+        await notify_profile_status([job["profile_id"] for job in jobs])
+
+
+async def claim_next_job(worker_id: str) -> Optional[dict]:
+    """
+    Mengambil satu job 'queued' tertua dan menandainya 'processing'.
+    Job queued yang sudah mencapai max_attempts ditandai 'failed' beserta profile-nya.
+    Return None jika antrian kosong.
+    """
+    exhausted = await db.fetch_all(
+        """
+        UPDATE profile_jobs
+        SET status = 'failed', last_error = 'Max attempts reached', finished_at = NOW()
+        WHERE status = 'queued' AND attempts >= max_attempts
+        RETURNING profile_id, sections
+        """
+    )
+    await _fail_job_profiles(exhausted)
+
+    job = await db.fetch_one(
+        """
+        UPDATE profile_jobs
+        SET status = 'processing', attempts = attempts + 1, worker_id = $1,
+            started_at = NOW(), heartbeat_at = NOW()
+        WHERE job_id = (
+            SELECT job_id FROM profile_jobs
+            WHERE status = 'queued' AND attempts < max_attempts
+            ORDER BY created_at
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING job_id, profile_id, company_name, force_refresh, sections, attempts
+        """,
+        worker_id
+    )
+    if not job:
+        return None
+    return {
+        "job_id": job["job_id"],
+        "profile_id": str(job["profile_id"]),
+        "company_name": job["company_name"],
+        "force_refresh": job["force_refresh"],
+        "sections": list(job["sections"]) if job["sections"] else None,
+        "attempts": job["attempts"],
+    }
+
+
+async def heartbeat_job(job_id: int):
+    """Update heartbeat agar job tidak dianggap orphan"""
+    await db.execute(
+        "UPDATE profile_jobs SET heartbeat_at = NOW() WHERE job_id = $1 AND status = 'processing'",
+        job_id
+    )
+
+
+async def complete_job(job_id: int):
+    """Tandai job selesai"""
+    await db.execute(
+        "UPDATE profile_jobs SET status = 'completed', finished_at = NOW() WHERE job_id = $1",
+        job_id
+    )
+
+
+async def fail_job(job_id: int, error: str):
+    """Tandai job gagal"""
+    await db.execute(
+        """
+        UPDATE profile_jobs
+        SET status = 'failed', last_error = $2, finished_at = NOW()
+        WHERE job_id = $1
+        """,
+        job_id,
+        error
+    )
+
+
+async def count_queued_jobs() -> int:
+    """Jumlah job yang masih menunggu worker (backlog antrian)"""
+    return await db.fetch_val("SELECT COUNT(*) FROM profile_jobs WHERE status = 'queued'")
+
+
+async def recover_orphaned_jobs() -> int:
+    """
+    Mengembalikan job 'processing' yang ditinggal worker crash ke antrian.
+    Job yang sudah mencapai max_attempts ditandai 'failed' beserta profile-nya
+    (profile refresh tetap 'completed', lihat _fail_job_profiles).
+    Return jumlah job yang di-requeue.
+    """
+    failed = await db.fetch_all(
+        """
+        UPDATE profile_jobs
+        SET status = 'failed', last_error = 'Worker lost (max attempts reached)', finished_at = NOW()
+        WHERE status = 'processing'
+          AND heartbeat_at < NOW() - make_interval(secs => $1)
+          AND attempts >= max_attempts
+        RETURNING profile_id, sections
+        """,
+        JOB_STALE_SECONDS
+    )
+    await _fail_job_profiles(failed)
+
+    requeued = await db.fetch_all(
+        """
+        UPDATE profile_jobs
+        SET status = 'queued', worker_id = NULL
+        WHERE status = 'processing'
+          AND heartbeat_at < NOW() - make_interval(secs => $1)
+        RETURNING job_id
+        """,
+        JOB_STALE_SECONDS
+    )
+    return len(requeued)
+
+
+async def release_worker_jobs(worker_ids: list) -> int:
+    """
+    Kembalikan job 'processing' milik worker yang sedang shutdown ke antrian
+    (seperti recover_orphaned_jobs, tanpa menunggu heartbeat stale). Job yang sudah
+    mencapai max_attempts ditandai 'failed' beserta profile-nya.
+    Return jumlah job yang di-requeue.
+    """
+    failed = await db.fetch_all(
+        """
+        UPDATE profile_jobs
+        SET status = 'failed', last_error = 'Worker stopped (max attempts reached)', finished_at = NOW()
+        WHERE status = 'processing' AND worker_id = ANY($1::text[])
+          AND attempts >= max_attempts
+        RETURNING profile_id, sections
+        """,
+        worker_ids
+    )
+    await _fail_job_profiles(failed)
+
+    released = await db.fetch_all(
+        """
+        UPDATE profile_jobs
+        SET status = 'queued', worker_id = NULL
+        WHERE status = 'processing' AND worker_id = ANY($1::text[])
+        RETURNING job_id
+        """,
+        worker_ids
+    )
+    return len(released)
@@ -0,0 +1,43 @@
+"""
+LRU cache in-process sederhana dengan expiry per item.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class LRUCache:
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key) -> Optional[Any]:
+        """Return value atau None jika tidak ada / sudah expired"""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.time():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value, expires_at: Optional[float] = None):
+        """Simpan value. expires_at (epoch detik) override TTL default"""
+        if expires_at is None and self.ttl is not None:
+            expires_at = time.time() + self.ttl
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
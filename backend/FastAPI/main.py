@@ -1,24 +1,44 @@
 import asyncio
+import os
 import sys
 
 if sys.platform == 'win32':
     from asyncio import WindowsProactorEventLoopPolicy
     asyncio.set_event_loop_policy(WindowsProactorEventLoopPolicy())
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
 from fastapi.middleware.cors import CORSMiddleware
 
 from AgentScraper.schemas import CompanyProfile
-from AgentScraper.profiler import run_sift_agent
+from AgentScraper.browser_pool import browser_pool
+from AgentScraper.http_client import close_http_client
+from AgentScraper.page_cache import get_page_cache_stats
 from .database import db
+from .auth import get_bcrypt_metrics, get_token_cache_stats
 from .users import router as auth_router
-from .profiles import router as profiles_router
+from .profiles import router as profiles_router, ensure_profile_jsonb_columns
+from .batches import router as batches_router, ensure_batch_tables
+from .job_queue import ensure_job_table
+from .profile_cache import ensure_profile_cache_table, get_company_profile, get_profile_cache_stats
+from .intelligence_service import get_gemini_metrics
+from .rate_limit import admit_agent_request, get_rate_limit_stats
+from .metrics import router as metrics_router, metrics_middleware
+from .admin import router as admin_router
+from .intelligence_cache import ensure_intelligence_cache_table, get_intelligence_cache_stats
+from .profile_events import profile_status_listener
+from .token_revocation import ensure_revoked_tokens_table, start_revocation_listener
+from .worker import run_worker_pool, SHUTDOWN_GRACE_SECONDS
 
 load_dotenv()
 
+# Jumlah worker slot yang dijalankan di dalam proses API (0 = pakai run_worker.py terpisah)
+EMBEDDED_WORKER_SLOTS = int(os.getenv("EMBEDDED_WORKER_SLOTS", "0"))
+_worker_stop = asyncio.Event()
+_worker_task = None
+
 app = FastAPI(
     title="SIFT API",
     description="API untuk SIFT User Profiling Agentic AI dengan Authentication",
@@ -37,12 +57,70 @@ async def startup():
             ALTER TABLE company_profiles 
             ADD COLUMN IF NOT EXISTS status VARCHAR(50) DEFAULT 'completed'
         """)
+        await db.execute("""
+            ALTER TABLE company_profiles 
+            ADD COLUMN IF NOT EXISTS section_analyzed_at JSONB
+        """)
+        await db.execute("""
+            ALTER TABLE company_profiles 
+            ADD COLUMN IF NOT EXISTS timings JSONB
+        """)
+        # Index untuk keyset pagination /profiles/my-profiles
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_company_profiles_user_created
+            ON company_profiles (user_id, created_at DESC, profile_id DESC)
+        """)
     except Exception as e:
         print(f"Warning: Could not alter table: {e}")
 
+    try:
+        await ensure_profile_jsonb_columns()
+    except Exception as e:
+        print(f"Warning: Could not migrate profile JSON columns to JSONB: {e}")
+
+    try:
+        await ensure_job_table()
+    except Exception as e:
+        print(f"Warning: Could not create profile_jobs table: {e}")
+
+    try:
+        await ensure_batch_tables()
+    except Exception as e:
+        print(f"Warning: Could not create profile_batches table: {e}")
+
+    try:
+        await ensure_profile_cache_table()
+    except Exception as e:
+        print(f"Warning: Could not create company_profile_cache table: {e}")
+
+    try:
+        await ensure_intelligence_cache_table()
+    except Exception as e:
+        print(f"Warning: Could not create intelligence_cache table: {e}")
+
+    try:
+        await ensure_revoked_tokens_table()
+        await start_revocation_listener()
+    except Exception as e:
+        print(f"Warning: Could not start token revocation listener: {e}")
+
+    global _worker_task
+    if EMBEDDED_WORKER_SLOTS > 0:
+        _worker_task = asyncio.create_task(run_worker_pool(EMBEDDED_WORKER_SLOTS, _worker_stop))
+
 @app.on_event("shutdown")
 async def shutdown():
     """Disconnect dari database saat aplikasi shutdown"""
+    if _worker_task:
+        _worker_stop.set()
+        try:
+            # Pool sendiri membatasi tunggu job ke SHUTDOWN_GRACE_SECONDS lalu requeue sisanya
+            await asyncio.wait_for(_worker_task, SHUTDOWN_GRACE_SECONDS + 10)
+        except asyncio.TimeoutError:
+            print("Warning: embedded worker did not stop in time")
+    await profile_status_listener.close()
+    await browser_pool.close()
+    await close_http_client()
     await db.disconnect()
 
 origins = [
@@ -56,15 +134,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Retry-After"],
 )
 
+# Latency per route untuk Prometheus
+app.middleware("http")(metrics_middleware)
+
 # Include authentication router
 app.include_router(auth_router)
+# Include batch router sebelum profiles router supaya /profiles/batch tidak tertangkap /profiles/{profile_id}
+app.include_router(batches_router)
 # Include profiles router (protected routes)
 app.include_router(profiles_router)
+# Prometheus scrape endpoint
+app.include_router(metrics_router)
+# Admin routes (ADMIN_EMAILS)
+app.include_router(admin_router)
 
 class ProfileRequest(BaseModel):
     company_name: str = Field(..., example="PT Gojek Tokopedia")
+    force_refresh: bool = Field(False, description="Abaikan cache dan jalankan agent ulang")
 
 @app.get("/")
 def read_root():
@@ -72,15 +161,32 @@ def read_root():
     return {"message": "SIFT API is running. Go to /docs for API documentation."}
 
 
+@app.get("/stats")
+def read_stats():
+    """Statistik runtime proses ini: latency Gemini, antrian bcrypt dan hit/miss cache."""
+    return {
+        "gemini": get_gemini_metrics(),
+        "bcrypt": get_bcrypt_metrics(),
+        "token_cache": get_token_cache_stats(),
+        "rate_limit": get_rate_limit_stats(),
+        "profile_cache": get_profile_cache_stats(),
+        "intelligence_cache": get_intelligence_cache_stats(),
+        "page_cache": get_page_cache_stats(),
+    }
+
+
 @app.post("/generate-profile", response_model=CompanyProfile)
-async def generate_profile_endpoint(request: ProfileRequest):
+async def generate_profile_endpoint(request: ProfileRequest, http_request: Request):
     """
     Menerima nama perusahaan, menjalankan SIFT AI agent,
     dan mengembalikan profil perusahaan yang terstruktur.
+    Profile yang sudah ada di cache langsung dikembalikan kecuali force_refresh=true.
+    Endpoint ini tanpa auth, jadi rate limit dihitung per IP client.
     """
     print(f"Received request to profile: {request.company_name}")
     try:
-        profile_data = await run_sift_agent(request.company_name)
+        await admit_agent_request(f"ip:{http_request.client.host if http_request.client else 'unknown'}")
+        profile_data = await get_company_profile(request.company_name, force_refresh=request.force_refresh)
         return profile_data
     
     except HTTPException as http_exc:
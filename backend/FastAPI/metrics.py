@@ -0,0 +1,102 @@
+"""
+Prometheus metrics untuk pipeline profiling, Gemini, database pool dan HTTP.
+
+Metric agent (durasi run dan jumlah step) didefinisikan di AgentScraper/profiler.py
+dan ikut ter-expose lewat registry default. Proses worker terpisah meng-expose
+metric-nya sendiri lewat WORKER_METRICS_PORT (lihat run_worker.py).
+"""
+import time
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
+from prometheus_client import CONTENT_TYPE_LATEST, Gauge, Histogram, generate_latest
+from .database import db
+
+GEMINI_REQUEST_DURATION = Histogram(
+    "sift_gemini_request_duration_seconds",
+    "Latency panggilan Gemini",
+    ["outcome"],
+    buckets=(0.5, 1, 2, 5, 10, 20, 30, 60, 120),
+)
+GEMINI_TOKENS = Histogram(
+    "sift_gemini_tokens",
+    "Jumlah token per panggilan Gemini",
+    ["kind"],
+    buckets=(100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000),
+)
+ENRICHMENT_DURATION = Histogram(
+    "sift_enrichment_duration_seconds",
+    "Durasi enrich_profile_with_intelligence (termasuk cache hit)",
+    buckets=(0.01, 0.1, 0.5, 1, 2, 5, 10, 20, 30, 60, 120),
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "sift_http_request_duration_seconds",
+    "Latency request HTTP per route (untuk streaming: sampai header terkirim)",
+    ["method", "route", "status"],
+)
+SSE_CONNECTIONS_OPEN = Gauge(
+    "sift_sse_connections_open",
+    "Jumlah koneksi SSE yang sedang terbuka",
+    ["stream"],
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "sift_db_pool_connections",
+    "Koneksi asyncpg pool per state (size, max_size, in_use, idle, waiting)",
+    ["state"],
+)
+PROFILE_JOBS = Gauge(
+    "sift_profile_jobs",
+    "Jumlah job di profile_jobs per status",
+    ["status"],
+)
+
+JOB_STATUSES = ("queued", "processing", "completed", "failed")
+
+router = APIRouter(tags=["Monitoring"])
+
+
+async def metrics_middleware(request: Request, call_next):
+    """Catat latency setiap request dengan label route template (bukan path mentah)"""
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_DURATION.labels(
+            request.method,
+            route.path if route is not None else "unmatched",
+            str(status_code)
+        ).observe(time.perf_counter() - start)
+
+
+async def track_sse(stream: str, events):
+    """Bungkus generator SSE supaya gauge koneksi terbuka naik/turun otomatis"""
+    SSE_CONNECTIONS_OPEN.labels(stream).inc()
+    try:
+        async for event in events:
+            yield event
+    finally:
+        SSE_CONNECTIONS_OPEN.labels(stream).dec()
+
+
+async def _update_scrape_gauges():
+    for state, value in db.pool_stats().items():
+        DB_POOL_CONNECTIONS.labels(state).set(value)
+
+    try:
+        rows = await db.fetch_all("SELECT status, COUNT(*) AS count FROM profile_jobs GROUP BY status")
+    except Exception as e:
+        print(f"Warning: Could not count profile_jobs: {e}")
+        return
+    counts = {row["status"]: row["count"] for row in rows}
+    for status in set(JOB_STATUSES) | set(counts):
+        PROFILE_JOBS.labels(status).set(counts.get(status, 0))
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Endpoint scrape Prometheus"""
+    await _update_scrape_gauges()
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,214 @@
+"""
+Cache hasil CompanyProfile yang dibagi antar user.
+
+Key cache adalah nama company yang sudah dinormalisasi, jadi "PT Gojek",
+"gojek" dan "Gojek Inc." memakai entry yang sama. Hasil disimpan di tabel
+`company_profile_cache` (Postgres) dengan LRU in-process di depannya.
+
+Cache miss untuk company yang sama yang datang bersamaan digabung lewat
+single-flight: hanya satu agent run yang berjalan, request lain menempel ke run itu.
+"""
+import os
+import time
+from typing import List, Optional, Tuple
+from dotenv import load_dotenv
+from AgentScraper.company_names import normalize_company_name
+from AgentScraper.schemas import CompanyProfile
+from AgentScraper.profiler import format_step_event, run_sift_agent_with_streaming
+from .database import db
+from .lru import LRUCache
+from .singleflight import SingleFlight, InFlightRun
+from .stage_timer import StageTimer
+
+load_dotenv()
+
+PROFILE_CACHE_TTL_HOURS = float(os.getenv("PROFILE_CACHE_TTL_HOURS", "24"))
+PROFILE_CACHE_MAX_ROWS = int(os.getenv("PROFILE_CACHE_MAX_ROWS", "5000"))
+PROFILE_CACHE_LRU_SIZE = int(os.getenv("PROFILE_CACHE_LRU_SIZE", "256"))
+
+_memory_cache = LRUCache(maxsize=PROFILE_CACHE_LRU_SIZE)
+_stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "coalesced": 0}
+
+# Agent run yang sedang berjalan di proses ini, key = nama company ternormalisasi
+profile_flights = SingleFlight()
+
+
+def get_profile_cache_stats() -> dict:
+    """Counter hit/miss cache profile"""
+    return {**_stats, "memory_size": len(_memory_cache)}
+
+
+async def ensure_profile_cache_table():
+    """Membuat tabel company_profile_cache jika belum ada"""
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS company_profile_cache (
+            cache_key TEXT PRIMARY KEY,
+            company_name TEXT NOT NULL,
+            profile JSONB NOT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            expires_at TIMESTAMP NOT NULL,
+            last_hit_at TIMESTAMP NOT NULL DEFAULT NOW()
+        )
+    """)
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_company_profile_cache_last_hit
+        ON company_profile_cache (last_hit_at)
+    """)
+
+
+async def get_cached_profile(company_name: str) -> Optional[CompanyProfile]:
+    """Cari profile di LRU lalu di Postgres. Return None jika miss / expired"""
+    key = normalize_company_name(company_name)
+
+    profile = _memory_cache.get(key)
+    if profile is not None:
+        _stats["memory_hits"] += 1
+        return profile.model_copy(deep=True)
+
+    row = await db.fetch_one(
+        """
+        UPDATE company_profile_cache
+        SET last_hit_at = NOW()
+        WHERE cache_key = $1 AND expires_at > NOW()
+        RETURNING profile, EXTRACT(EPOCH FROM expires_at - NOW()) AS ttl_left
+        """,
+        key
+    )
+    if not row:
+        _stats["misses"] += 1
+        return None
+
+    _stats["db_hits"] += 1
+    profile = CompanyProfile.model_validate(row["profile"])
+    _memory_cache.set(key, profile, expires_at=time.time() + float(row["ttl_left"]))
+    return profile.model_copy(deep=True)
+
+
+async def store_profile(company_name: str, profile: CompanyProfile):
+    """Simpan profile ke cache lalu evict entry lama jika melebihi PROFILE_CACHE_MAX_ROWS"""
+    key = normalize_company_name(company_name)
+    ttl_seconds = PROFILE_CACHE_TTL_HOURS * 3600
+
+    await db.execute(
+        """
+        INSERT INTO company_profile_cache (cache_key, company_name, profile, expires_at)
+        VALUES ($1, $2, $3, NOW() + make_interval(secs => $4))
+        ON CONFLICT (cache_key) DO UPDATE
+        SET company_name = EXCLUDED.company_name, profile = EXCLUDED.profile,
+            created_at = NOW(), expires_at = EXCLUDED.expires_at, last_hit_at = NOW()
+        """,
+        key,
+        company_name,
+        profile.model_dump(mode="json"),
+        ttl_seconds
+    )
+    _memory_cache.set(key, profile.model_copy(deep=True), expires_at=time.time() + ttl_seconds)
+
+    await db.execute(
+        """
+        DELETE FROM company_profile_cache
+        WHERE expires_at <= NOW()
+           OR cache_key IN (
+               SELECT cache_key FROM company_profile_cache
+               ORDER BY last_hit_at DESC
+               OFFSET $1
+           )
+        """,
+        PROFILE_CACHE_MAX_ROWS
+    )
+
+
+async def _store_safely(company_name: str, profile: CompanyProfile):
+    try:
+        await store_profile(company_name, profile)
+    except Exception as e:
+        print(f"Warning: Could not store profile cache for {company_name}: {e}")
+
+
+async def _run_agent(company_name: str, run: InFlightRun) -> Tuple[CompanyProfile, List[dict]]:
+    """
+    Satu agent run; setiap step di-publish ke semua request yang menempel ke run ini.
+    Return (profile, event step agent) supaya semua peserta bisa mencatat timing step.
+    """
+    run.publish("🔍 Running AI agent to gather company intelligence...")
+    profile = None
+    steps = []
+    async for kind, payload in run_sift_agent_with_streaming(company_name):
+        if kind == "result":
+            profile = payload
+        elif kind == "step":
+            steps.append(payload)
+            run.publish(format_step_event(payload))
+        else:
+            run.publish(payload)
+
+    await _store_safely(company_name, profile)
+    return profile, steps
+
+
+def _record_agent_run(timer: Optional[StageTimer], source: str, steps: List[dict] = ()):
+    if timer is None:
+        return
+    timer.annotate(agent_source=source)
+    for event in steps:
+        timer.add_agent_step(event)
+
+
+async def get_company_profile(
+    company_name: str,
+    force_refresh: bool = False,
+    timer: Optional[StageTimer] = None
+) -> CompanyProfile:
+    """
+    Return CompanyProfile dari cache jika ada, kalau tidak jalankan SIFT agent
+    dan simpan hasilnya ke cache. force_refresh=True selalu menjalankan agent
+    (atau menempel ke agent run untuk company yang sama yang sedang berjalan).
+    Jika timer diisi, sumber hasil (cache/agent/coalesced) dan span tiap step dicatat.
+    """
+    if not force_refresh:
+        cached = await get_cached_profile(company_name)
+        if cached is not None:
+            print(f"⚡ Profile cache hit for {company_name}")
+            _record_agent_run(timer, "cache")
+            return cached
+
+    key = normalize_company_name(company_name)
+    run, is_leader = profile_flights.start_or_join(key, lambda run: _run_agent(company_name, run))
+    if not is_leader:
+        _stats["coalesced"] += 1
+        print(f"🔗 Attached to in-flight agent run for {company_name}")
+
+    profile, steps = await run.result()
+    _record_agent_run(timer, "agent" if is_leader else "coalesced", steps)
+    return profile.model_copy(deep=True)
+
+
+async def stream_company_profile(
+    company_name: str,
+    force_refresh: bool = False,
+    timer: Optional[StageTimer] = None
+):
+    """
+    Versi streaming dari get_company_profile.
+    Yield ("log", message) untuk setiap progress, lalu ("result", CompanyProfile).
+    """
+    if not force_refresh:
+        cached = await get_cached_profile(company_name)
+        if cached is not None:
+            _record_agent_run(timer, "cache")
+            yield ("log", f"⚡ Found a recent profile for {company_name} in cache, skipping agent run")
+            yield ("result", cached)
+            return
+
+    key = normalize_company_name(company_name)
+    run, is_leader = profile_flights.start_or_join(key, lambda run: _run_agent(company_name, run))
+    if not is_leader:
+        _stats["coalesced"] += 1
+        yield ("log", f"🔗 {company_name} is already being profiled by another request, attaching to that run...")
+
+    async for message in run.events():
+        yield ("log", message)
+
+    profile, steps = await run.result()
+    _record_agent_run(timer, "agent" if is_leader else "coalesced", steps)
+    yield ("result", profile.model_copy(deep=True))
@@ -0,0 +1,152 @@
+"""
+Push perubahan status profile lewat Postgres LISTEN/NOTIFY.
+
+Setiap perubahan status di company_profiles diikuti NOTIFY di channel
+PROFILE_STATUS_CHANNEL. Setiap proses API memegang SATU koneksi LISTEN
+(bukan dari pool) dan membagikan event ke semua client SSE milik user yang
+bersangkutan, jadi client tidak perlu polling GET /profiles/{profile_id}.
+Koneksi yang sama juga bisa dipakai channel lain lewat listen() (mis. revokasi token).
+"""
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, Optional, Set
+import asyncpg
+import orjson
+from dotenv import load_dotenv
+from .database import db, DATABASE_URL
+
+load_dotenv()
+
+PROFILE_STATUS_CHANNEL = "profile_status"
+PROFILE_EVENTS_KEEPALIVE_SECONDS = float(os.getenv("PROFILE_EVENTS_KEEPALIVE_SECONDS", "15"))
+LISTEN_RECONNECT_SECONDS = 5
+TERMINAL_STATUSES = ("completed", "failed")
+
+# Dikirim ke subscriber saat koneksi LISTEN putus; stream ditutup dan client reconnect
+LISTENER_LOST = None
+
+
+async def notify_profile_status(profile_ids):
+    """NOTIFY status terbaru untuk profile_ids (dipanggil setelah status berubah)"""
+    try:
+        await db.execute(
+            """
+            SELECT pg_notify($1, json_build_object(
+                'profile_id', profile_id::text,
+                'user_id', user_id::text,
+                'status', status
+            )::text)
+            FROM company_profiles
+            WHERE profile_id = ANY($2::uuid[])
+            """,
+            PROFILE_STATUS_CHANNEL,
+            [str(profile_id) for profile_id in profile_ids]
+        )
+    except Exception as e:
+        print(f"Warning: Could not notify profile status: {e}")
+
+
+class ProfileStatusListener:
+    """Satu koneksi LISTEN per proses, fan-out event ke queue per user"""
+
+    def __init__(self):
+        self._connection: Optional[asyncpg.Connection] = None
+        self._lock = asyncio.Lock()
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        # channel tambahan: {channel: (callback(payload), on_connect())}
+        self._channels: Dict[str, tuple] = {}
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    @property
+    def open_streams(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    async def _ensure_connection(self):
+        async with self._lock:
+            if self._connection is not None and not self._connection.is_closed():
+                return
+            self._connection = await asyncpg.connect(DATABASE_URL)
+            self._connection.add_termination_listener(self._on_termination)
+            await self._connection.add_listener(PROFILE_STATUS_CHANNEL, self._on_notification)
+            for channel in self._channels:
+                await self._add_channel(self._connection, channel)
+            print(f"✅ Listening on channels: {', '.join([PROFILE_STATUS_CHANNEL, *self._channels])}")
+
+    async def _add_channel(self, connection: asyncpg.Connection, channel: str):
+        callback, on_connect = self._channels[channel]
+        await connection.add_listener(channel, lambda conn, pid, chan, payload: callback(payload))
+        # Notifikasi selama koneksi belum ada / putus hilang, jadi state disinkronkan ulang
+        if on_connect is not None:
+            await on_connect()
+
+    async def listen(
+        self,
+        channel: str,
+        callback: Callable[[str], None],
+        on_connect: Optional[Callable[[], Awaitable]] = None
+    ):
+        """
+        Daftarkan channel tambahan di koneksi LISTEN yang sama. Koneksi dibuka
+        jika belum ada dan otomatis di-reconnect jika putus.
+        """
+        self._channels[channel] = (callback, on_connect)
+        async with self._lock:
+            if self._connection is not None and not self._connection.is_closed():
+                await self._add_channel(self._connection, channel)
+                return
+        await self._ensure_connection()
+
+    async def _reconnect(self):
+        while not self._closing:
+            await asyncio.sleep(LISTEN_RECONNECT_SECONDS)
+            try:
+                await self._ensure_connection()
+                return
+            except Exception as e:
+                print(f"Warning: LISTEN reconnect failed: {e}")
+
+    def _on_notification(self, connection, pid, channel, payload):
+        try:
+            event = orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            return
+        for queue in self._subscribers.get(event.get("user_id"), ()):
+            queue.put_nowait(event)
+
+    def _on_termination(self, connection):
+        print(f"Warning: LISTEN connection for '{PROFILE_STATUS_CHANNEL}' lost")
+        self._connection = None
+        for queues in self._subscribers.values():
+            for queue in queues:
+                queue.put_nowait(LISTENER_LOST)
+        if self._channels and not self._closing:
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: str):
+        """Queue event status untuk semua profile milik user_id selama context aktif"""
+        await self._ensure_connection()
+        queue = asyncio.Queue()
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(user_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user_id]
+
+    async def close(self):
+        self._closing = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        if self._connection is not None and not self._connection.is_closed():
+            connection, self._connection = self._connection, None
+            await connection.close()
+
+
+# Instance global listener
+profile_status_listener = ProfileStatusListener()
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Query, BackgroundTasks
+from fastapi import APIRouter, HTTPException, status, Depends, Query
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional
@@ -6,19 +6,87 @@ from datetime import datetime
 from .database import db
 from .auth import get_current_user, verify_token
 from .intelligence_service import enrich_profile_with_intelligence
+from .job_queue import JOB_MAX_ATTEMPTS
+from .rate_limit import admit_agent_request
+from .metrics import track_sse
+from .stage_timer import StageTimer
+from .profile_events import (
+    PROFILE_EVENTS_KEEPALIVE_SECONDS, TERMINAL_STATUSES, LISTENER_LOST,
+    notify_profile_status, profile_status_listener,
+)
+from .profile_cache import get_company_profile, stream_company_profile, store_profile
+from .section_refresh import expired_sections, refresh_profile_sections, section_timestamps
+from .serializers import dumps_profile, dumps_profiles, json_bytes_response
+from AgentScraper.profiler import SECTIONS
 from AgentScraper.schemas import CompanyProfile
-from AgentScraper.profiler import run_sift_agent, run_sift_agent_with_streaming
-import asyncpg
-import json
 import asyncio
+import asyncpg
+import base64
+import orjson
+import os
 
 router = APIRouter(
     prefix="/profiles",
     tags=["Company Profiles"]
 )
 
+MY_PROFILES_DEFAULT_LIMIT = int(os.getenv("MY_PROFILES_DEFAULT_LIMIT", "50"))
+MY_PROFILES_MAX_LIMIT = 200
+
+FULL_COLUMNS = """profile_id, user_id, company_name, status, overview, tech_stack,
+                   recent_news_signals, key_contacts, executive_summary, pain_points,
+                   opening_lines, data_sources, last_analyzed_at, is_favorite, created_at"""
+SUMMARY_COLUMNS = """profile_id, user_id, company_name, status, overview, executive_summary,
+                   last_analyzed_at, is_favorite, created_at"""
+
+# Kolom company_profiles yang disimpan sebagai JSONB
+PROFILE_JSON_COLUMNS = (
+    "overview", "tech_stack", "recent_news_signals", "key_contacts",
+    "pain_points", "opening_lines", "data_sources",
+)
+
+async def ensure_profile_jsonb_columns():
+    """Migrasi kolom JSON company_profiles yang masih TEXT/JSON menjadi JSONB"""
+    column_types = await db.fetch_all(
+        """
+        SELECT column_name, data_type FROM information_schema.columns
+        WHERE table_name = 'company_profiles' AND column_name = ANY($1::text[])
+        """,
+        list(PROFILE_JSON_COLUMNS)
+    )
+    for column in column_types:
+        name, data_type = column["column_name"], column["data_type"]
+        if data_type == "jsonb":
+            continue
+        # String kosong di kolom TEXT lama dianggap NULL
+        using = f"NULLIF(TRIM({name}), '')::jsonb" if data_type in ("text", "character varying") else f"{name}::jsonb"
+        await db.execute(f"ALTER TABLE company_profiles ALTER COLUMN {name} TYPE JSONB USING {using}")
+        print(f"✅ Migrated company_profiles.{name} from {data_type} to JSONB")
+
+def encode_profile_cursor(created_at: datetime, profile_id) -> str:
+    """Cursor opaque untuk keyset pagination pada (created_at, profile_id)"""
+    raw = f"{created_at.isoformat()}|{profile_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_profile_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, profile_id = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), profile_id
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+class RefreshProfileResponse(BaseModel):
+    profile_id: str
+    status: str
+    sections: list  # section yang di-refresh (kosong jika semua masih fresh)
+
 class CreateProfileRequest(BaseModel):
     company_name: str = Field(..., example="PT Gojek Tokopedia")
+    force_refresh: bool = Field(False, description="Abaikan cache dan jalankan agent ulang")
 
 class ProfileResponse(BaseModel):
     profile_id: str  # UUID
@@ -40,70 +108,139 @@ class ProfileResponse(BaseModel):
     
     created_at: str
 
-async def process_profile_background(profile_id: str, company_name: str):
+def profile_columns(profile_data: CompanyProfile, intelligence: dict) -> dict:
+    """
+    Nilai kolom company_profiles dari hasil agent + intelligence.
+    Kolom JSONB diisi object Python, encoding dilakukan oleh codec di Database.
+    """
+    data_sources = [news.url for news in profile_data.recent_news_signals if news.url]
+    return {
+        "overview": profile_data.overview.model_dump() if profile_data.overview else None,
+        "tech_stack": profile_data.tech_stack or None,
+        "recent_news_signals": [news.model_dump() for news in profile_data.recent_news_signals] or None,
+        "key_contacts": [contact.model_dump() for contact in profile_data.key_contacts] or None,
+        "executive_summary": intelligence.get('executive_summary'),
+        "pain_points": intelligence.get('pain_points', []),
+        "opening_lines": intelligence.get('opening_lines', {}),
+        "data_sources": data_sources or None,
+    }
+
+async def store_profile_timings(profile_id: str, timer: StageTimer):
+    """Simpan breakdown durasi per stage ke kolom timings"""
+    try:
+        await db.execute(
+            "UPDATE company_profiles SET timings = $1 WHERE profile_id = $2::uuid",
+            timer.to_dict(),
+            profile_id
+        )
+    except Exception as e:
+        print(f"Warning: Could not store timings for {profile_id}: {e}")
+
+async def process_profile_background(
+    profile_id: str,
+    company_name: str,
+    force_refresh: bool = False,
+    sections: Optional[list] = None
+) -> bool:
     """
-    Background task untuk memproses profile generation
+    Memproses profile generation (dipanggil oleh worker dari antrian profile_jobs).
+    Jika `sections` diisi, hanya section tersebut yang di-scrape ulang dan digabung
+    dengan data yang sudah tersimpan (incremental refresh).
+    Return True jika berhasil, False jika gagal. Analisis pertama yang gagal menandai
+    profile 'failed'; refresh yang gagal mengembalikan status 'completed' (data lama
+    masih utuh) dan error-nya dicatat di timings.
     """
+    timer = StageTimer()
     try:
         print(f"Starting background task for {company_name} (ID: {profile_id})")
         
-        # Step 1: Run SIFT agent
-        profile_data = await run_sift_agent(company_name)
+        # Step 1: Run SIFT agent (atau ambil dari cache)
+        if sections:
+            with timer.stage("db_read"):
+                stored = await db.fetch_one(
+                    """
+                    SELECT overview, tech_stack, recent_news_signals, key_contacts
+                    FROM company_profiles WHERE profile_id = $1::uuid
+                    """,
+                    profile_id
+                )
+            timer.annotate(agent_source="refresh", sections=list(sections))
+            with timer.stage("agent_run"):
+                # Raise HTTPException jika semua section gagal
+                profile_data, refreshed_sections = await refresh_profile_sections(company_name, stored, sections, timer)
+            await store_profile(company_name, profile_data)
+        else:
+            with timer.stage("agent_run"):
+                profile_data = await get_company_profile(company_name, force_refresh=force_refresh, timer=timer)
+            refreshed_sections = SECTIONS
         
         # Step 2: Generate AI intelligence
-        intelligence = await enrich_profile_with_intelligence({
-            'company_name': company_name,
-            'overview': profile_data.overview.dict() if profile_data.overview else {},
-            'tech_stack': profile_data.tech_stack,
-            'recent_news_signals': [news.dict() for news in profile_data.recent_news_signals] if profile_data.recent_news_signals else [],
-            'key_contacts': [contact.dict() for contact in profile_data.key_contacts] if profile_data.key_contacts else []
-        })
-        
-        # Prepare data
-        overview_json = json.dumps(profile_data.overview.dict()) if profile_data.overview else None
-        tech_stack_json = json.dumps(profile_data.tech_stack) if profile_data.tech_stack else None
-        recent_news_json = json.dumps([news.dict() for news in profile_data.recent_news_signals]) if profile_data.recent_news_signals else None
-        key_contacts_json = json.dumps([contact.dict() for contact in profile_data.key_contacts]) if profile_data.key_contacts else None
-        
-        executive_summary = intelligence.get('executive_summary')
-        pain_points_json = json.dumps(intelligence.get('pain_points', []))
-        opening_lines_json = json.dumps(intelligence.get('opening_lines', {}))
+        with timer.stage("intelligence"):
+            intelligence = await enrich_profile_with_intelligence({
+                'company_name': company_name,
+                'overview': profile_data.overview.dict() if profile_data.overview else {},
+                'tech_stack': profile_data.tech_stack,
+                'recent_news_signals': [news.dict() for news in profile_data.recent_news_signals] if profile_data.recent_news_signals else [],
+                'key_contacts': [contact.dict() for contact in profile_data.key_contacts] if profile_data.key_contacts else []
+            })
         
-        data_sources = []
-        if profile_data.recent_news_signals:
-            for news in profile_data.recent_news_signals:
-                if hasattr(news, 'url') and news.url:
-                    data_sources.append(news.url)
-        data_sources_json = json.dumps(data_sources) if data_sources else None
+        with timer.stage("serialization"):
+            columns = profile_columns(profile_data, intelligence)
+            analyzed_at = datetime.utcnow()
+            analyzed_sections = section_timestamps(refreshed_sections, analyzed_at)
         
         # Update database with results and status completed
-        await db.execute(
-            """
-            UPDATE company_profiles 
-            SET overview = $1, tech_stack = $2, recent_news_signals = $3, key_contacts = $4,
-                executive_summary = $5, pain_points = $6, opening_lines = $7, data_sources = $8,
-                last_analyzed_at = $9, status = 'completed'
-            WHERE profile_id = $10::uuid
-            """,
-            overview_json, tech_stack_json, recent_news_json, key_contacts_json,
-            executive_summary, pain_points_json, opening_lines_json, data_sources_json,
-            datetime.utcnow(), profile_id
-        )
+        with timer.stage("db_write"):
+            await db.execute(
+                """
+                UPDATE company_profiles 
+                SET overview = $1, tech_stack = $2, recent_news_signals = $3, key_contacts = $4,
+                    executive_summary = $5, pain_points = $6, opening_lines = $7, data_sources = $8,
+                    last_analyzed_at = $9, status = 'completed',
+                    section_analyzed_at = COALESCE(section_analyzed_at, '{}'::jsonb) || $11::jsonb
+                WHERE profile_id = $10::uuid
+                """,
+                columns["overview"], columns["tech_stack"], columns["recent_news_signals"], columns["key_contacts"],
+                columns["executive_summary"], columns["pain_points"], columns["opening_lines"], columns["data_sources"],
+                analyzed_at, profile_id, analyzed_sections
+            )
+        await store_profile_timings(profile_id, timer)
+        await notify_profile_status([profile_id])
         print(f"Background task completed for {company_name}")
+        return True
         
     except Exception as e:
         print(f"Error in background task for {company_name}: {e}")
-        await db.execute(
-            "UPDATE company_profiles SET status = 'failed' WHERE profile_id = $1::uuid",
-            profile_id
-        )
-
+        timer.annotate(error=str(e))
+        if sections:
+            # Refresh gagal: data section lama tidak berubah, jadi profile tetap 'completed'
+            # (kecuali belum pernah berhasil dianalisis)
+            timer.annotate(refresh_failed=True)
+            await db.execute(
+                """
+                UPDATE company_profiles
+                SET status = CASE WHEN last_analyzed_at IS NULL THEN 'failed' ELSE 'completed' END,
+                    timings = $2
+                WHERE profile_id = $1::uuid
+                """,
+                profile_id,
+                timer.to_dict()
+            )
+        else:
+            await db.execute(
+                "UPDATE company_profiles SET status = 'failed', timings = $2 WHERE profile_id = $1::uuid",
+                profile_id,
+                timer.to_dict()
+            )
+        await notify_profile_status([profile_id])
+        return False
 
 
 @router.get("/create-stream")
 async def create_profile_stream(
     company_name: str = Query(..., description="Company name to profile"),
-    token: str = Query(..., description="JWT Bearer token")
+    token: str = Query(..., description="JWT Bearer token"),
+    force_refresh: bool = Query(False, description="Abaikan cache dan jalankan agent ulang")
 ):
     """
     Streaming endpoint untuk membuat company profile dengan real-time logs.
@@ -126,89 +263,86 @@ async def create_profile_stream(
             media_type="text/event-stream"
         )
     
+    # Rate limit / load shedding; EventSource tidak bisa membaca status code, jadi dikirim sebagai ERROR
+    try:
+        await admit_agent_request(current_user["user_id"])
+    except HTTPException as e:
+        async def rejected_generator():
+            yield f"data: ERROR|{e.detail} (retry after {e.headers['Retry-After']}s)\n\n"
+        return StreamingResponse(
+            rejected_generator(),
+            media_type="text/event-stream",
+            headers=e.headers
+        )
+    
     async def event_generator():
         try:
             # Send initial log
             yield f"data: 🚀 Starting profile generation for {company_name}...\n\n"
-            await asyncio.sleep(0.1)
             
-            # Step 1: Run SIFT agent with streaming logs
-            yield f"data: 🔍 Running AI agent to gather company intelligence...\n\n"
-            await asyncio.sleep(0.1)
-            
-            # Stream agent logs
-            async for log_message in run_sift_agent_with_streaming(company_name):
-                yield f"data: {log_message}\n\n"
-                await asyncio.sleep(0.05)
-            
-            # Get the final result
-            profile_data = await run_sift_agent(company_name)
+            # Step 1: Run SIFT agent with streaming logs (atau ambil dari cache / run yang sedang berjalan)
+            timer = StageTimer()
+            profile_data = None
+            with timer.stage("agent_run"):
+                async for kind, payload in stream_company_profile(company_name, force_refresh=force_refresh, timer=timer):
+                    if kind == "result":
+                        profile_data = payload
+                    else:
+                        yield f"data: {payload}\n\n"
             
             yield f"data: ✅ Agent completed! Processing data...\n\n"
-            await asyncio.sleep(0.1)
             
             # Step 2: Generate AI intelligence
             yield f"data: 🧠 Generating AI intelligence (executive summary, pain points, opening lines)...\n\n"
-            await asyncio.sleep(0.1)
             
-            intelligence = await enrich_profile_with_intelligence({
-                'company_name': company_name,
-                'overview': profile_data.overview.dict() if profile_data.overview else {},
-                'tech_stack': profile_data.tech_stack,
-                'recent_news_signals': [news.dict() for news in profile_data.recent_news_signals] if profile_data.recent_news_signals else [],
-                'key_contacts': [contact.dict() for contact in profile_data.key_contacts] if profile_data.key_contacts else []
-            })
+            with timer.stage("intelligence"):
+                intelligence = await enrich_profile_with_intelligence({
+                    'company_name': company_name,
+                    'overview': profile_data.overview.dict() if profile_data.overview else {},
+                    'tech_stack': profile_data.tech_stack,
+                    'recent_news_signals': [news.dict() for news in profile_data.recent_news_signals] if profile_data.recent_news_signals else [],
+                    'key_contacts': [contact.dict() for contact in profile_data.key_contacts] if profile_data.key_contacts else []
+                })
             
             yield f"data: ✅ AI intelligence generated!\n\n"
-            await asyncio.sleep(0.1)
             
             # Step 3: Save to database
             yield f"data: 💾 Saving profile to database...\n\n"
-            await asyncio.sleep(0.1)
-            
-            # Prepare data
-            overview_json = json.dumps(profile_data.overview.dict()) if profile_data.overview else None
-            tech_stack_json = json.dumps(profile_data.tech_stack) if profile_data.tech_stack else None
-            recent_news_json = json.dumps([news.dict() for news in profile_data.recent_news_signals]) if profile_data.recent_news_signals else None
-            key_contacts_json = json.dumps([contact.dict() for contact in profile_data.key_contacts]) if profile_data.key_contacts else None
-            
-            executive_summary = intelligence.get('executive_summary')
-            pain_points_json = json.dumps(intelligence.get('pain_points', []))
-            opening_lines_json = json.dumps(intelligence.get('opening_lines', {}))
             
-            data_sources = []
-            if profile_data.recent_news_signals:
-                for news in profile_data.recent_news_signals:
-                    if hasattr(news, 'url') and news.url:
-                        data_sources.append(news.url)
-            data_sources_json = json.dumps(data_sources) if data_sources else None
+            with timer.stage("serialization"):
+                columns = profile_columns(profile_data, intelligence)
+                analyzed_at = datetime.utcnow()
+                analyzed_sections = section_timestamps(SECTIONS, analyzed_at)
             
             # Save to database
-            new_profile = await db.fetch_one(
-                """
-                INSERT INTO company_profiles 
-                (user_id, company_name, overview, tech_stack, recent_news_signals, key_contacts,
-                 executive_summary, pain_points, opening_lines, data_sources, last_analyzed_at)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
-                RETURNING profile_id
-                """,
-                current_user["user_id"],
-                company_name,
-                overview_json,
-                tech_stack_json,
-                recent_news_json,
-                key_contacts_json,
-                executive_summary,
-                pain_points_json,
-                opening_lines_json,
-                data_sources_json,
-                datetime.utcnow()
-            )
+            with timer.stage("db_write"):
+                new_profile = await db.fetch_one(
+                    """
+                    INSERT INTO company_profiles 
+                    (user_id, company_name, overview, tech_stack, recent_news_signals, key_contacts,
+                     executive_summary, pain_points, opening_lines, data_sources, last_analyzed_at,
+                     section_analyzed_at)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12::jsonb)
+                    RETURNING profile_id
+                    """,
+                    current_user["user_id"],
+                    company_name,
+                    columns["overview"],
+                    columns["tech_stack"],
+                    columns["recent_news_signals"],
+                    columns["key_contacts"],
+                    columns["executive_summary"],
+                    columns["pain_points"],
+                    columns["opening_lines"],
+                    columns["data_sources"],
+                    analyzed_at,
+                    analyzed_sections
+                )
             
+            await store_profile_timings(new_profile["profile_id"], timer)
             profile_id = str(new_profile["profile_id"])
             
             yield f"data: ✅ Profile saved successfully!\n\n"
-            await asyncio.sleep(0.1)
             
             # Send completion signal with profile ID
             yield f"data: DONE|{profile_id}\n\n"
@@ -219,7 +353,90 @@ async def create_profile_stream(
             yield f"data: ERROR|{error_msg}\n\n"
     
     return StreamingResponse(
-        event_generator(),
+        track_sse("create_stream", event_generator()),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"  # Disable nginx buffering
+        }
+    )
+
+
+@router.get("/status-stream")
+async def profile_status_stream(
+    token: str = Query(..., description="JWT Bearer token"),
+    profile_id: Optional[str] = Query(None, description="Hanya pantau satu profile; stream selesai saat status final")
+):
+    """
+    Server-Sent Events untuk perubahan status profile milik user (pengganti polling).
+    
+    **Note**: EventSource tidak support custom headers, jadi token dikirim via query param.
+    
+    Setiap event berformat `data: {"profile_id": ..., "user_id": ..., "status": ...}`.
+    Saat stream dibuka, status terkini dikirim dulu (profile yang diminta, atau semua
+    profile yang masih 'processing'). Komentar keepalive dikirim setiap
+    PROFILE_EVENTS_KEEPALIVE_SECONDS detik.
+    """
+    try:
+        current_user = await verify_token(token)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Unauthorized: {str(e)}"
+        )
+    user_id = str(current_user["user_id"])
+    
+    if profile_id:
+        exists = await db.fetch_val(
+            "SELECT 1 FROM company_profiles WHERE profile_id = $1::uuid AND user_id = $2",
+            profile_id,
+            current_user["user_id"]
+        )
+        if not exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Profile not found or you don't have access"
+            )
+    
+    def format_event(event: dict) -> str:
+        return f"data: {orjson.dumps(event).decode()}\n\n"
+    
+    async def event_generator():
+        async with profile_status_listener.subscribe(user_id) as queue:
+            # Snapshot diambil setelah subscribe supaya tidak ada perubahan yang terlewat
+            if profile_id:
+                snapshot = await db.fetch_all(
+                    "SELECT profile_id, status FROM company_profiles WHERE profile_id = $1::uuid",
+                    profile_id
+                )
+            else:
+                snapshot = await db.fetch_all(
+                    "SELECT profile_id, status FROM company_profiles WHERE user_id = $1 AND status = 'processing'",
+                    current_user["user_id"]
+                )
+            for row in snapshot:
+                yield format_event({"profile_id": str(row["profile_id"]), "user_id": user_id, "status": row["status"]})
+                if profile_id and row["status"] in TERMINAL_STATUSES:
+                    return
+            
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), PROFILE_EVENTS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                
+                if event is LISTENER_LOST:
+                    return
+                if profile_id and event["profile_id"] != profile_id:
+                    continue
+                yield format_event(event)
+                if profile_id and event["status"] in TERMINAL_STATUSES:
+                    return
+    
+    return StreamingResponse(
+        track_sse("status_stream", event_generator()),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -232,7 +449,6 @@ async def create_profile_stream(
 @router.post("/create", response_model=ProfileResponse, status_code=status.HTTP_201_CREATED)
 async def create_company_profile(
     request: CreateProfileRequest,
-    background_tasks: BackgroundTasks,
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -242,28 +458,41 @@ async def create_company_profile(
     
     Endpoint ini akan:
     1. Membuat record profile dengan status 'processing'
-    2. Menjalankan SIFT AI agent di background
+    2. Memasukkan job ke antrian profile_jobs (diproses oleh worker)
     3. Mengembalikan ID profile untuk polling status
+    
+    Request ditolak dengan 429 (Retry-After) jika melebihi rate limit, atau 503
+    jika antrian worker sudah terlalu panjang.
     """
     try:
-        # Step 1: Create initial record
+        # Tolak lebih awal jika user / server sudah melewati batas
+        await admit_agent_request(current_user["user_id"])
+        
+        # Step 1 & 2: Buat record dan job worker dalam satu statement (satu transaksi),
+        # supaya tidak ada profile 'processing' tanpa job
         new_profile = await db.fetch_one(
             """
-            INSERT INTO company_profiles 
-            (user_id, company_name, status, created_at)
-            VALUES ($1, $2, 'processing', $3)
-            RETURNING profile_id, user_id, company_name, status, created_at
+            WITH new_profile AS (
+                INSERT INTO company_profiles 
+                (user_id, company_name, status, created_at)
+                VALUES ($1, $2, 'processing', $3)
+                RETURNING profile_id, user_id, company_name, status, created_at
+            ),
+            new_job AS (
+                INSERT INTO profile_jobs (profile_id, company_name, force_refresh, max_attempts)
+                SELECT profile_id, company_name, $4, $5 FROM new_profile
+            )
+            SELECT * FROM new_profile
             """,
             current_user["user_id"],
             request.company_name,
-            datetime.utcnow()
+            datetime.utcnow(),
+            request.force_refresh,
+            JOB_MAX_ATTEMPTS
         )
         
         profile_id = str(new_profile["profile_id"])
         
-        # Step 2: Add to background tasks
-        background_tasks.add_task(process_profile_background, profile_id, request.company_name)
-        
         return ProfileResponse(
             profile_id=profile_id,
             user_id=str(new_profile["user_id"]),
@@ -292,47 +521,63 @@ async def create_company_profile(
 
 
 @router.get("/my-profiles", response_model=list[ProfileResponse])
-async def get_my_profiles(current_user: dict = Depends(get_current_user)):
+async def get_my_profiles(
+    limit: int = Query(MY_PROFILES_DEFAULT_LIMIT, ge=1, le=MY_PROFILES_MAX_LIMIT, description="Jumlah profile per halaman"),
+    cursor: Optional[str] = Query(None, description="Nilai header X-Next-Cursor dari halaman sebelumnya"),
+    fields: str = Query("full", pattern="^(full|summary)$", description="'summary' hanya mengembalikan kolom ringan"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter status, mis. 'completed'"),
+    favorite: Optional[bool] = Query(None, description="Filter profile favorite"),
+    current_user: dict = Depends(get_current_user)
+):
     """
-    Mendapatkan semua company profiles milik user yang sedang login.
+    Mendapatkan company profiles milik user yang sedang login, terbaru dulu.
     
     **Requires**: Bearer token di header Authorization
+    
+    Hasil dipaginasi dengan cursor pada (created_at, profile_id). Jika masih ada
+    halaman berikutnya, cursor-nya dikirim di header `X-Next-Cursor`.
     """
     try:
+        columns = SUMMARY_COLUMNS if fields == "summary" else FULL_COLUMNS
+        conditions = ["user_id = $1"]
+        values = [current_user["user_id"]]
+        
+        if cursor:
+            cursor_created_at, cursor_profile_id = decode_profile_cursor(cursor)
+            values += [cursor_created_at, cursor_profile_id]
+            conditions.append(f"(created_at, profile_id) < (${len(values) - 1}, ${len(values)}::uuid)")
+        
+        if status_filter:
+            values.append(status_filter)
+            conditions.append(f"status = ${len(values)}")
+        
+        if favorite is not None:
+            values.append(favorite)
+            conditions.append(f"COALESCE(is_favorite, FALSE) = ${len(values)}")
+        
+        # Ambil satu row ekstra untuk mengetahui apakah masih ada halaman berikutnya
+        values.append(limit + 1)
         profiles = await db.fetch_all(
-            """
-            SELECT profile_id, user_id, company_name, status, overview, tech_stack,
-                   recent_news_signals, key_contacts, executive_summary, pain_points,
-                   opening_lines, data_sources, last_analyzed_at, is_favorite, created_at
+            f"""
+            SELECT {columns}
             FROM company_profiles
-            WHERE user_id = $1
-            ORDER BY created_at DESC
+            WHERE {' AND '.join(conditions)}
+            ORDER BY created_at DESC, profile_id DESC
+            LIMIT ${len(values)}
             """,
-            current_user["user_id"]
+            *values
         )
         
-        result = []
-        for profile in profiles:
-            result.append(ProfileResponse(
-                profile_id=str(profile["profile_id"]),  # Convert UUID to string
-                user_id=str(profile["user_id"]),  # Convert UUID to string
-                company_name=profile["company_name"],
-                status=profile["status"] if "status" in profile else "completed",
-                overview=json.loads(profile["overview"]) if profile["overview"] else None,
-                tech_stack=json.loads(profile["tech_stack"]) if profile["tech_stack"] else None,
-                recent_news_signals=json.loads(profile["recent_news_signals"]) if profile["recent_news_signals"] else None,
-                key_contacts=json.loads(profile["key_contacts"]) if profile["key_contacts"] else None,
-                executive_summary=profile["executive_summary"],
-                pain_points=json.loads(profile["pain_points"]) if profile["pain_points"] else None,
-                opening_lines=json.loads(profile["opening_lines"]) if profile["opening_lines"] else None,
-                data_sources=json.loads(profile["data_sources"]) if profile["data_sources"] else None,
-                last_analyzed_at=str(profile["last_analyzed_at"]) if profile["last_analyzed_at"] else None,
-                is_favorite=profile["is_favorite"] if profile["is_favorite"] is not None else False,
-                created_at=str(profile["created_at"])
-            ))
+        headers = {}
+        if len(profiles) > limit:
+            profiles = profiles[:limit]
+            last = profiles[-1]
+            headers["X-Next-Cursor"] = encode_profile_cursor(last["created_at"], last["profile_id"])
         
-        return result
+        return json_bytes_response(dumps_profiles(profiles), headers=headers)
     
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error getting profiles: {e}")
         raise HTTPException(
@@ -372,23 +617,7 @@ async def get_profile_by_id(
                 detail="Profile not found or you don't have access"
             )
         
-        return ProfileResponse(
-            profile_id=str(profile["profile_id"]),  # Convert UUID to string
-            user_id=str(profile["user_id"]),  # Convert UUID to string
-            company_name=profile["company_name"],
-            status=profile["status"] if "status" in profile else "completed",
-            overview=json.loads(profile["overview"]) if profile["overview"] else None,
-            tech_stack=json.loads(profile["tech_stack"]) if profile["tech_stack"] else None,
-            recent_news_signals=json.loads(profile["recent_news_signals"]) if profile["recent_news_signals"] else None,
-            key_contacts=json.loads(profile["key_contacts"]) if profile["key_contacts"] else None,
-            executive_summary=profile["executive_summary"],
-            pain_points=json.loads(profile["pain_points"]) if profile["pain_points"] else None,
-            opening_lines=json.loads(profile["opening_lines"]) if profile["opening_lines"] else None,
-            data_sources=json.loads(profile["data_sources"]) if profile["data_sources"] else None,
-            last_analyzed_at=str(profile["last_analyzed_at"]) if profile["last_analyzed_at"] else None,
-            is_favorite=profile["is_favorite"] if profile["is_favorite"] is not None else False,
-            created_at=str(profile["created_at"])
-        )
+        return json_bytes_response(dumps_profile(profile))
     
     except HTTPException:
         raise
@@ -400,6 +629,88 @@ async def get_profile_by_id(
         )
 
 
+@router.post("/{profile_id}/refresh", response_model=RefreshProfileResponse)
+async def refresh_profile(
+    profile_id: str,
+    sections: Optional[list[str]] = Query(None, description="Paksa refresh section tertentu (default: hanya yang expired)"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Refresh company profile secara incremental.
+    
+    **Requires**: Bearer token di header Authorization
+    
+    Hanya section yang sudah melewati TTL-nya (overview 90 hari, tech stack 30 hari,
+    news 1 hari, contacts 14 hari secara default) yang di-scrape ulang, lalu
+    AI intelligence dibuat ulang dari data gabungan.
+    """
+    try:
+        profile = await db.fetch_one(
+            """
+            SELECT profile_id, company_name, status, last_analyzed_at, section_analyzed_at
+            FROM company_profiles
+            WHERE profile_id = $1::uuid AND user_id = $2
+            """,
+            profile_id,
+            current_user["user_id"]
+        )
+        
+        if not profile:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Profile not found or you don't have access"
+            )
+        
+        if profile["status"] == "processing":
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Profile is still being processed"
+            )
+        
+        if sections:
+            invalid = [section for section in sections if section not in SECTIONS]
+            if invalid:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown sections: {', '.join(invalid)}"
+                )
+            to_refresh = [section for section in SECTIONS if section in sections]
+        else:
+            to_refresh = expired_sections(profile["section_analyzed_at"], profile["last_analyzed_at"])
+        
+        if not to_refresh:
+            return RefreshProfileResponse(profile_id=profile_id, status=profile["status"], sections=[])
+        
+        await admit_agent_request(current_user["user_id"])
+        
+        await db.execute(
+            """
+            WITH refreshing AS (
+                UPDATE company_profiles SET status = 'processing'
+                WHERE profile_id = $1::uuid
+                RETURNING profile_id, company_name
+            )
+            INSERT INTO profile_jobs (profile_id, company_name, sections, max_attempts)
+            SELECT profile_id, company_name, $2, $3 FROM refreshing
+            """,
+            profile_id,
+            to_refresh,
+            JOB_MAX_ATTEMPTS
+        )
+        await notify_profile_status([profile_id])
+        
+        return RefreshProfileResponse(profile_id=profile_id, status="processing", sections=to_refresh)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error refreshing profile: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to refresh profile: {str(e)}"
+        )
+
+
 @router.delete("/{profile_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_profile(
     profile_id: str,
@@ -488,23 +799,7 @@ async def toggle_favorite(
             current_user["user_id"]
         )
         
-        return ProfileResponse(
-            profile_id=str(updated_profile["profile_id"]),
-            user_id=str(updated_profile["user_id"]),
-            company_name=updated_profile["company_name"],
-            status=updated_profile["status"] if "status" in updated_profile else "completed",
-            overview=json.loads(updated_profile["overview"]) if updated_profile["overview"] else None,
-            tech_stack=json.loads(updated_profile["tech_stack"]) if updated_profile["tech_stack"] else None,
-            recent_news_signals=json.loads(updated_profile["recent_news_signals"]) if updated_profile["recent_news_signals"] else None,
-            key_contacts=json.loads(updated_profile["key_contacts"]) if updated_profile["key_contacts"] else None,
-            executive_summary=updated_profile["executive_summary"],
-            pain_points=json.loads(updated_profile["pain_points"]) if updated_profile["pain_points"] else None,
-            opening_lines=json.loads(updated_profile["opening_lines"]) if updated_profile["opening_lines"] else None,
-            data_sources=json.loads(updated_profile["data_sources"]) if updated_profile["data_sources"] else None,
-            last_analyzed_at=str(updated_profile["last_analyzed_at"]) if updated_profile["last_analyzed_at"] else None,
-            is_favorite=updated_profile["is_favorite"],
-            created_at=str(updated_profile["created_at"])
-        )
+        return json_bytes_response(dumps_profile(updated_profile))
     
     except HTTPException:
         raise
@@ -0,0 +1,162 @@
+"""
+Admission control untuk endpoint yang menjalankan agent.
+
+Setiap request pembuatan profile mengambil token dari bucket per user dan dari
+bucket global (in-process, per proses API). Jika bucket kosong, request
+ditolak dengan 429 + Retry-After. Jika backlog profile_jobs sudah terlalu
+dalam, request baru ditolak dengan 503 (load shedding) sebelum menyentuh bucket.
+"""
+import math
+import os
+import time
+from typing import Optional
+from fastapi import HTTPException, status
+from dotenv import load_dotenv
+from .job_queue import count_queued_jobs
+from .lru import LRUCache
+
+load_dotenv()
+
+USER_JOB_RATE_PER_MINUTE = float(os.getenv("USER_JOB_RATE_PER_MINUTE", "5"))
+USER_JOB_BURST = int(os.getenv("USER_JOB_BURST", "10"))
+GLOBAL_JOB_RATE_PER_MINUTE = float(os.getenv("GLOBAL_JOB_RATE_PER_MINUTE", "60"))
+GLOBAL_JOB_BURST = int(os.getenv("GLOBAL_JOB_BURST", "100"))
+JOB_QUEUE_MAX_DEPTH = int(os.getenv("JOB_QUEUE_MAX_DEPTH", "500"))
+JOB_QUEUE_DEPTH_CACHE_SECONDS = float(os.getenv("JOB_QUEUE_DEPTH_CACHE_SECONDS", "3"))
+JOB_QUEUE_SHED_RETRY_AFTER = int(os.getenv("JOB_QUEUE_SHED_RETRY_AFTER", "30"))
+# Budget terpisah untuk batch upload: token = jumlah company, burst = batch terbesar per user
+BATCH_USER_COMPANIES_PER_HOUR = float(os.getenv("BATCH_USER_COMPANIES_PER_HOUR", "2000"))
+BATCH_USER_BURST = int(os.getenv("BATCH_USER_BURST", "1000"))
+
+
+class TokenBucket:
+    def __init__(self, rate_per_minute: float, burst: int):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, cost: int = 1) -> float:
+        """Ambil `cost` token. Return 0 jika berhasil, selain itu detik sampai token cukup"""
+        self._refill()
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        if self.rate <= 0:
+            return float("inf")
+        return (cost - self.tokens) / self.rate
+
+    def refund(self, cost: int = 1):
+        self.tokens = min(self.capacity, self.tokens + cost)
+
+
+_user_buckets = LRUCache(maxsize=10000)
+_batch_buckets = LRUCache(maxsize=10000)
+_global_bucket = TokenBucket(GLOBAL_JOB_RATE_PER_MINUTE, GLOBAL_JOB_BURST)
+_queue_depth = {"value": 0, "fetched_at": 0.0}
+_stats = {"admitted": 0, "rate_limited_user": 0, "rate_limited_global": 0, "shed": 0, "rate_limited_batch": 0}
+
+
+def get_rate_limit_stats() -> dict:
+    """Counter admission control dan backlog antrian terakhir yang teramati"""
+    return {
+        **_stats,
+        "queue_depth": _queue_depth["value"],
+        "queue_max_depth": JOB_QUEUE_MAX_DEPTH,
+        "global_tokens": round(_global_bucket.tokens, 1),
+    }
+
+
+async def _get_queue_depth() -> int:
+    """Backlog profile_jobs, di-cache beberapa detik supaya tidak COUNT setiap request"""
+    now = time.monotonic()
+    if now - _queue_depth["fetched_at"] >= JOB_QUEUE_DEPTH_CACHE_SECONDS:
+        _queue_depth["value"] = await count_queued_jobs()
+        _queue_depth["fetched_at"] = now
+    return _queue_depth["value"]
+
+
+def _too_many_requests(detail: str, wait: float) -> HTTPException:
+    retry_after = max(1, math.ceil(wait)) if math.isfinite(wait) else 3600
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+async def admit_agent_request(client_key: str, cost: int = 1):
+    """
+    Admission control sebelum menjalankan / mengantrikan agent.
+    client_key biasanya user_id (atau IP untuk endpoint tanpa auth).
+    Raise HTTPException 503 jika backlog terlalu dalam, 429 jika melebihi rate limit.
+    """
+    if await _get_queue_depth() >= JOB_QUEUE_MAX_DEPTH:
+        _stats["shed"] += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Profile queue is full, please retry later",
+            headers={"Retry-After": str(JOB_QUEUE_SHED_RETRY_AFTER)},
+        )
+
+    bucket: Optional[TokenBucket] = _user_buckets.get(client_key)
+    if bucket is None:
+        bucket = TokenBucket(USER_JOB_RATE_PER_MINUTE, USER_JOB_BURST)
+        _user_buckets.set(client_key, bucket)
+
+    wait = bucket.try_acquire(cost)
+    if wait:
+        _stats["rate_limited_user"] += 1
+        raise _too_many_requests(
+            f"Rate limit exceeded: max {USER_JOB_RATE_PER_MINUTE:g} profile requests per minute per user",
+            wait
+        )
+
+    wait = _global_bucket.try_acquire(cost)
+    if wait:
+        bucket.refund(cost)
+        _stats["rate_limited_global"] += 1
+        raise _too_many_requests("Server is busy: global profile request limit reached", wait)
+
+    _stats["admitted"] += 1
+
+
+async def admit_batch_request(client_key: str, companies: int):
+    """
+    Admission control untuk batch upload. Batch memakai bucket per user sendiri
+    (satu token per company, BATCH_USER_COMPANIES_PER_HOUR) supaya batch besar tidak
+    bertabrakan dengan burst kecil endpoint interaktif; job-nya tetap dibatasi slot worker.
+    Raise 413 jika batch tidak akan pernah muat di bucket, 503 jika backlog terlalu
+    dalam, 429 + Retry-After jika budget batch user sedang habis.
+    """
+    if companies > BATCH_USER_BURST:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch is limited to {BATCH_USER_BURST} companies per upload",
+        )
+    if await _get_queue_depth() >= JOB_QUEUE_MAX_DEPTH:
+        _stats["shed"] += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Profile queue is full, please retry later",
+            headers={"Retry-After": str(JOB_QUEUE_SHED_RETRY_AFTER)},
+        )
+
+    bucket: Optional[TokenBucket] = _batch_buckets.get(client_key)
+    if bucket is None:
+        bucket = TokenBucket(BATCH_USER_COMPANIES_PER_HOUR / 60.0, BATCH_USER_BURST)
+        _batch_buckets.set(client_key, bucket)
+
+    wait = bucket.try_acquire(companies)
+    if wait:
+        _stats["rate_limited_batch"] += 1
+        raise _too_many_requests(
+            f"Batch limit exceeded: max {BATCH_USER_COMPANIES_PER_HOUR:g} companies per hour per user",
+            wait
+        )
+    _stats["admitted"] += 1
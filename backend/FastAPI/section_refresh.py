@@ -0,0 +1,86 @@
+"""
+Refresh profile per section dengan TTL yang berbeda untuk setiap section.
+
+Setiap profile menyimpan kapan tiap section terakhir dianalisis di kolom
+`section_analyzed_at` (JSONB, {section: ISO timestamp}). Refresh hanya
+menjalankan sub-agent untuk section yang sudah expired, lalu hasilnya
+digabung dengan data yang tersimpan.
+"""
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from dotenv import load_dotenv
+from AgentScraper.schemas import CompanyProfile
+from AgentScraper.profiler import SECTIONS, run_sift_agent_sections
+from .stage_timer import StageTimer
+
+load_dotenv()
+
+SECTION_TTLS = {
+    "overview": timedelta(days=float(os.getenv("SECTION_TTL_DAYS_OVERVIEW", "90"))),
+    "tech_stack": timedelta(days=float(os.getenv("SECTION_TTL_DAYS_TECH_STACK", "30"))),
+    "recent_news_signals": timedelta(days=float(os.getenv("SECTION_TTL_DAYS_NEWS", "1"))),
+    "key_contacts": timedelta(days=float(os.getenv("SECTION_TTL_DAYS_CONTACTS", "14"))),
+}
+
+
+def section_timestamps(sections, analyzed_at: datetime) -> dict:
+    """{section: ISO timestamp} untuk di-merge ke kolom section_analyzed_at"""
+    return {section: analyzed_at.isoformat() for section in sections}
+
+
+def expired_sections(
+    section_analyzed_at: Optional[dict],
+    last_analyzed_at: Optional[datetime],
+    now: Optional[datetime] = None
+) -> List[str]:
+    """
+    Section yang umurnya melewati TTL. Profile lama tanpa section_analyzed_at
+    memakai last_analyzed_at untuk semua section.
+    """
+    now = now or datetime.utcnow()
+    section_analyzed_at = section_analyzed_at or {}
+    expired = []
+    for section in SECTIONS:
+        analyzed_at = section_analyzed_at.get(section)
+        analyzed_at = datetime.fromisoformat(analyzed_at) if analyzed_at else last_analyzed_at
+        if analyzed_at is None or now - analyzed_at >= SECTION_TTLS[section]:
+            expired.append(section)
+    return expired
+
+
+def profile_from_row(company_name: str, row) -> CompanyProfile:
+    """Bangun CompanyProfile dari kolom section yang tersimpan di company_profiles"""
+    data = {"company_name": company_name}
+    for section in SECTIONS:
+        if row[section]:
+            data[section] = row[section]
+    return CompanyProfile.model_validate(data)
+
+
+async def refresh_profile_sections(
+    company_name: str,
+    row,
+    sections,
+    timer: Optional[StageTimer] = None
+) -> Tuple[CompanyProfile, List[str]]:
+    """
+    Jalankan sub-agent hanya untuk `sections` dan gabungkan dengan data tersimpan.
+    Return (profile gabungan, section yang berhasil di-refresh). Section yang
+    gagal tetap memakai data lama.
+    """
+    stored = profile_from_row(company_name, row)
+    failed = set()
+
+    async def on_step(event: dict):
+        if event["type"] == "section_failed":
+            failed.add(event["section"])
+        elif timer is not None:
+            timer.add_agent_step(event)
+
+    fresh = await run_sift_agent_sections(company_name, sections, on_step, website=stored.overview.website)
+
+    refreshed = [section for section in sections if section not in failed]
+    for section in refreshed:
+        setattr(stored, section, getattr(fresh, section))
+    return stored, refreshed
@@ -0,0 +1,51 @@
+"""
+Serialisasi row company_profiles langsung ke bytes JSON response.
+
+Row dari database sudah terpercaya (kolom JSONB sudah di-decode oleh codec di
+Database), jadi tidak perlu dibangun ulang sebagai ProfileResponse lalu
+divalidasi lagi oleh response_model. Bentuk output tetap sama dengan
+ProfileResponse; response_model di endpoint hanya dipakai untuk dokumentasi.
+"""
+import orjson
+from fastapi.responses import Response
+
+
+def profile_dict_from_row(profile) -> dict:
+    """
+    Dict berbentuk ProfileResponse dari row company_profiles.
+    Kolom yang tidak di-SELECT (mis. mode summary) menjadi None.
+    """
+    get = profile.get
+    last_analyzed_at = get("last_analyzed_at")
+    return {
+        "profile_id": str(profile["profile_id"]),
+        "user_id": str(profile["user_id"]),
+        "company_name": profile["company_name"],
+        "status": get("status") or "completed",
+        "overview": get("overview"),
+        "tech_stack": get("tech_stack"),
+        "recent_news_signals": get("recent_news_signals"),
+        "key_contacts": get("key_contacts"),
+        "executive_summary": get("executive_summary"),
+        "pain_points": get("pain_points"),
+        "opening_lines": get("opening_lines"),
+        "data_sources": get("data_sources"),
+        "last_analyzed_at": str(last_analyzed_at) if last_analyzed_at else None,
+        "is_favorite": get("is_favorite") or False,
+        "created_at": str(profile["created_at"]),
+    }
+
+
+def dumps_profile(profile) -> bytes:
+    """JSON bytes untuk satu row profile"""
+    return orjson.dumps(profile_dict_from_row(profile))
+
+
+def dumps_profiles(profiles) -> bytes:
+    """JSON bytes (array) untuk banyak row profile"""
+    return orjson.dumps([profile_dict_from_row(profile) for profile in profiles])
+
+
+def json_bytes_response(content: bytes, status_code: int = 200, headers: dict = None) -> Response:
+    """Response application/json dari bytes yang sudah di-serialize"""
+    return Response(content=content, status_code=status_code, headers=headers, media_type="application/json")
@@ -0,0 +1,96 @@
+"""
+Registry run yang sedang berjalan (single-flight) per key.
+
+Request kedua untuk key yang sama tidak memulai run baru, tapi menempel ke run
+yang sudah ada: ikut menerima progress log-nya (termasuk replay log yang sudah
+lewat) dan hasil akhirnya. Run dijalankan sebagai task sendiri, jadi tetap
+lanjut walaupun client yang memulainya disconnect.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+_FINISHED = object()
+
+
+class InFlightRun:
+    def __init__(self, key: str):
+        self.key = key
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.messages: list = []
+        self._subscribers: set = set()
+        # Referensi kuat ke task leader; event loop hanya menyimpan weak reference
+        self.task: Optional[asyncio.Task] = None
+
+    def publish(self, message):
+        """Kirim progress message ke semua subscriber"""
+        self.messages.append(message)
+        for queue in self._subscribers:
+            queue.put_nowait(message)
+
+    def _finish(self):
+        for queue in self._subscribers:
+            queue.put_nowait(_FINISHED)
+
+    async def events(self):
+        """Async iterator progress message: replay yang sudah lewat, lalu live sampai run selesai"""
+        queue = asyncio.Queue()
+        for message in self.messages:
+            queue.put_nowait(message)
+        if self.future.done():
+            queue.put_nowait(_FINISHED)
+        self._subscribers.add(queue)
+        try:
+            while True:
+                message = await queue.get()
+                if message is _FINISHED:
+                    return
+                yield message
+        finally:
+            self._subscribers.discard(queue)
+
+    async def result(self):
+        """Tunggu hasil run. Cancel di sisi pemanggil tidak membatalkan run"""
+        return await asyncio.shield(self.future)
+
+
+class SingleFlight:
+    def __init__(self):
+        self._runs: Dict[str, InFlightRun] = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._runs
+
+    def start_or_join(self, key: str, fn: Callable[[InFlightRun], Awaitable]) -> Tuple[InFlightRun, bool]:
+        """
+        Return (run, is_leader). Jika belum ada run untuk key, fn(run) dijalankan
+        sebagai task baru dan pemanggil menjadi leader.
+        """
+        run = self._runs.get(key)
+        if run is not None:
+            return run, False
+
+        run = InFlightRun(key)
+        self._runs[key] = run
+        run.task = asyncio.create_task(self._execute(run, fn))
+        return run, True
+
+    async def run(self, key: str, fn: Callable[[InFlightRun], Awaitable]):
+        """Mulai atau tempel ke run untuk key, lalu tunggu hasilnya"""
+        run, _ = self.start_or_join(key, fn)
+        return await run.result()
+
+    async def _execute(self, run: InFlightRun, fn):
+        try:
+            result = await fn(run)
+        except asyncio.CancelledError:
+            run.future.cancel()
+            raise
+        except Exception as e:
+            run.future.set_exception(e)
+            # Hindari warning "exception was never retrieved" jika tidak ada yang menunggu
+            run.future.exception()
+        else:
+            run.future.set_result(result)
+        finally:
+            self._runs.pop(run.key, None)
+            run._finish()
@@ -0,0 +1,121 @@
+"""
+Pencatat durasi per stage (agent run, step agent, intelligence, serialisasi,
+DB write) untuk satu profile. Hasilnya disimpan di kolom company_profiles.timings.
+"""
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List
+
+
+class StageTimer:
+    def __init__(self):
+        # Wall clock (epoch) supaya bisa digabung dengan timestamp step dari browser-use
+        self.started_at = time.time()
+        self.spans: List[dict] = []
+        self.attributes: dict = {}
+
+    def _add(self, stage: str, start: float, end: float, **attributes):
+        # Step dari run yang sudah berjalan sebelum timer dibuat (request yang menempel ke
+        # run leader) di-clamp ke awal timer supaya start_ms tidak negatif
+        start = max(start, self.started_at)
+        end = max(end, start)
+        self.spans.append({
+            "stage": stage,
+            "start_ms": round((start - self.started_at) * 1000, 1),
+            "duration_ms": round((end - start) * 1000, 1),
+            **attributes,
+        })
+
+    @contextmanager
+    def stage(self, name: str, **attributes):
+        """Catat durasi blok sebagai satu span (tetap dicatat jika blok raise)"""
+        start = time.time()
+        try:
+            yield
+        finally:
+            self._add(name, start, time.time(), **attributes)
+
+    def _step_span(self, event: dict):
+        if not event.get("started_at") or not event.get("finished_at"):
+            return
+        self._add(
+            "agent_step",
+            event["started_at"],
+            event["finished_at"],
+            section=event.get("section"),
+            step=event.get("step"),
+            actions=event.get("actions") or [],
+        )
+
+    def _fast_path_span(self, event: dict):
+        self._add(
+            "overview_fast_path",
+            event["started_at"],
+            event["finished_at"],
+            fields=event.get("fields") or [],
+            url=event.get("url"),
+        )
+
+    def _tech_detect_span(self, event: dict):
+        self._add(
+            "tech_detect",
+            event["started_at"],
+            event["finished_at"],
+            tech_stack=event.get("tech_stack") or [],
+            pages=event.get("pages"),
+        )
+
+    def _news_feeds_span(self, event: dict):
+        self._add(
+            "news_feeds",
+            event["started_at"],
+            event["finished_at"],
+            signals=event.get("signals"),
+            feeds=event.get("feeds"),
+            items=event.get("items"),
+        )
+
+    def _page_cache_usage(self, event: dict):
+        self.attributes["page_loads_saved"] = self.attributes.get("page_loads_saved", 0) + event.get("hits", 0)
+        self.attributes["pages_fetched"] = self.attributes.get("pages_fetched", 0) + event.get("fetches", 0)
+
+    def _completeness(self, event: dict):
+        self.attributes.setdefault("completeness", []).append({
+            key: event.get(key)
+            for key in ("section", "score", "stopped_early", "steps_used", "steps_saved")
+        })
+
+    # Tipe event profiler -> handler; tipe lain (mis. section_failed) diabaikan
+    _EVENT_HANDLERS = {
+        "step": _step_span,
+        "fast_path": _fast_path_span,
+        "tech_detect": _tech_detect_span,
+        "news_feeds": _news_feeds_span,
+        "page_cache": _page_cache_usage,
+        "completeness": _completeness,
+    }
+
+    def add_agent_step(self, event: dict):
+        """
+        Span untuk satu step agent dari event {"type": "step", ...} profiler.
+        Event "completeness" (skor dan step yang dihemat per agent) disimpan di atribut,
+        event "page_cache" dijumlahkan ke page_loads_saved / pages_fetched, event
+        "fast_path" menjadi span overview_fast_path, "tech_detect" menjadi span tech_detect dan
+        "news_feeds" menjadi span news_feeds.
+        """
+        handler = self._EVENT_HANDLERS.get(event.get("type"))
+        if handler is not None:
+            handler(self, event)
+
+    def annotate(self, **attributes):
+        """Atribut tambahan di level profile (mis. agent_source=cache)"""
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict:
+        return {
+            "started_at": datetime.utcfromtimestamp(self.started_at).isoformat(),
+            "total_ms": round((time.time() - self.started_at) * 1000, 1),
+            **self.attributes,
+            "spans": self.spans,
+        }
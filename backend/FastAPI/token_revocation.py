@@ -0,0 +1,76 @@
+"""
+Daftar token yang sudah di-revoke (logout).
+
+Token diidentifikasi oleh claim `jti`. Revokasi disimpan di tabel revoked_tokens
+sampai token expired dan di-broadcast lewat NOTIFY, jadi semua proses API
+langsung menolak token tersebut walaupun claim-nya masih ada di cache token
+terverifikasi (lihat decode_access_token).
+"""
+import time
+from typing import Dict
+import orjson
+from .database import db
+from .profile_events import profile_status_listener
+
+TOKEN_REVOKED_CHANNEL = "token_revoked"
+
+# jti -> exp (epoch detik); entry dibuang setelah token expired
+_revoked: Dict[str, int] = {}
+
+
+def is_token_revoked(jti) -> bool:
+    return jti is not None and jti in _revoked
+
+
+def _remember(jti: str, expires_at: int):
+    _revoked[jti] = expires_at
+    now = time.time()
+    for expired in [key for key, exp in _revoked.items() if exp <= now]:
+        del _revoked[expired]
+
+
+def _on_revoked(payload: str):
+    try:
+        event = orjson.loads(payload)
+        _remember(event["jti"], event["exp"])
+    except (orjson.JSONDecodeError, KeyError, TypeError):
+        print(f"Warning: Invalid token revocation payload: {payload}")
+
+
+async def ensure_revoked_tokens_table():
+    """Membuat tabel revoked_tokens jika belum ada"""
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS revoked_tokens (
+            jti TEXT PRIMARY KEY,
+            expires_at BIGINT NOT NULL,
+            revoked_at TIMESTAMP NOT NULL DEFAULT NOW()
+        )
+    """)
+
+
+async def load_revoked_tokens():
+    """Hapus revokasi yang tokennya sudah expired lalu muat sisanya ke memory"""
+    await db.execute("DELETE FROM revoked_tokens WHERE expires_at <= EXTRACT(EPOCH FROM NOW())")
+    rows = await db.fetch_all("SELECT jti, expires_at FROM revoked_tokens")
+    for row in rows:
+        _revoked[row["jti"]] = row["expires_at"]
+
+
+async def revoke_token(jti: str, expires_at: int):
+    """Revoke token sampai expires_at (claim exp) dan broadcast ke proses lain"""
+    _remember(jti, expires_at)
+    await db.execute(
+        "INSERT INTO revoked_tokens (jti, expires_at) VALUES ($1, $2) ON CONFLICT (jti) DO NOTHING",
+        jti,
+        expires_at
+    )
+    await db.execute(
+        "SELECT pg_notify($1, $2)",
+        TOKEN_REVOKED_CHANNEL,
+        orjson.dumps({"jti": jti, "exp": expires_at}).decode()
+    )
+
+
+async def start_revocation_listener():
+    """LISTEN revokasi di koneksi LISTEN bersama; daftar dimuat ulang setiap (re)connect"""
+    await profile_status_listener.listen(TOKEN_REVOKED_CHANNEL, _on_revoked, on_connect=load_revoked_tokens)
@@ -1,7 +1,12 @@
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.security import HTTPAuthorizationCredentials
 from .models import UserRegister, UserLogin, UserUpdate, TokenResponse, UserResponse, MessageResponse
 from .database import db
-from .auth import hash_password, verify_password, create_access_token, get_current_user
+from .auth import (
+    hash_password, verify_password, verify_and_update_password, create_access_token,
+    decode_access_token, get_current_user, security,
+)
+from .token_revocation import revoke_token
 import asyncpg
 
 router = APIRouter(
@@ -46,7 +51,7 @@ async def register(user_data: UserRegister):
             )
         
         # Hash password
-        hashed_password = hash_password(user_data.password)
+        hashed_password = await hash_password(user_data.password)
         
         # Insert user baru ke database
         new_user = await db.fetch_one(
@@ -85,6 +90,8 @@ async def register(user_data: UserRegister):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email or username already exists"
         )
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error during registration: {e}")
         raise HTTPException(
@@ -121,12 +128,21 @@ async def login(user_data: UserLogin):
             )
         
         # Verifikasi password
-        if not verify_password(user_data.password, user["password_hash"]):
+        valid, new_hash = await verify_and_update_password(user_data.password, user["password_hash"])
+        if not valid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
             )
         
+        # Hash memakai parameter lama: simpan ulang dengan parameter sekarang
+        if new_hash:
+            await db.execute(
+                "UPDATE users SET password_hash = $1 WHERE user_id = $2",
+                new_hash,
+                user["user_id"]
+            )
+        
         # Buat JWT token
         access_token = create_access_token(
             data={
@@ -157,6 +173,28 @@ async def login(user_data: UserLogin):
         )
 
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """
+    Logout: token yang dipakai di-revoke sampai waktu expired-nya.
+    
+    **Requires**: Bearer token di header Authorization
+    
+    Token lama yang dibuat sebelum ada claim `jti` tidak bisa di-revoke dan tetap
+    berlaku sampai expired.
+    """
+    payload = decode_access_token(credentials.credentials)
+    try:
+        if payload.get("jti") and payload.get("exp"):
+            await revoke_token(payload["jti"], int(payload["exp"]))
+        return None
+    except Exception as e:
+        print(f"Error during logout: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Logout failed: {str(e)}"
+        )
+
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(current_user: dict = Depends(get_current_user)):
     """
@@ -227,7 +265,7 @@ async def update_user(
                 current_user["user_id"]
             )
             
-            if not verify_password(user_data.current_password, user["password_hash"]):
+            if not await verify_password(user_data.current_password, user["password_hash"]):
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Current password is incorrect"
@@ -275,7 +313,7 @@ async def update_user(
             param_count += 1
         
         if user_data.new_password:
-            hashed_password = hash_password(user_data.new_password)
+            hashed_password = await hash_password(user_data.new_password)
             update_fields.append(f"password_hash = ${param_count}")
             update_values.append(hashed_password)
             param_count += 1
@@ -0,0 +1,123 @@
+"""
+Worker pool untuk memproses job dari tabel profile_jobs.
+
+Setiap slot menjalankan satu agent pada satu waktu, jadi jumlah slot adalah
+batas jumlah browser agent yang berjalan bersamaan di satu proses worker.
+"""
+import asyncio
+import os
+import socket
+from dotenv import load_dotenv
+from .job_queue import (
+    claim_next_job, heartbeat_job, complete_job, fail_job, recover_orphaned_jobs,
+    release_worker_jobs, JOB_STALE_SECONDS
+)
+from .profiles import process_profile_background
+
+load_dotenv()
+
+WORKER_SLOTS = int(os.getenv("WORKER_SLOTS", "2"))
+WORKER_POLL_INTERVAL = float(os.getenv("WORKER_POLL_INTERVAL", "2"))
+# Waktu tunggu job yang sedang berjalan saat shutdown sebelum di-cancel dan di-requeue
+SHUTDOWN_GRACE_SECONDS = float(os.getenv("SHUTDOWN_GRACE_SECONDS", "20"))
+HEARTBEAT_INTERVAL = max(JOB_STALE_SECONDS // 3, 5)
+
+
+async def _heartbeat_loop(job_id: int):
+    """Kirim heartbeat berkala selama job masih berjalan"""
+    while True:
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        try:
+            await heartbeat_job(job_id)
+        except Exception as e:
+            print(f"Warning: heartbeat failed for job {job_id}: {e}")
+
+
+async def _run_job(job: dict):
+    """Menjalankan satu job dan update status-nya di antrian"""
+    heartbeat = asyncio.create_task(_heartbeat_loop(job["job_id"]))
+    try:
+        success = await process_profile_background(
+            job["profile_id"], job["company_name"],
+            force_refresh=job["force_refresh"], sections=job["sections"]
+        )
+        if success:
+            await complete_job(job["job_id"])
+        else:
+            await fail_job(job["job_id"], "Profile generation failed")
+    except Exception as e:
+        print(f"Error running job {job['job_id']}: {e}")
+        await fail_job(job["job_id"], str(e))
+    finally:
+        heartbeat.cancel()
+
+
+async def _slot_loop(worker_id: str, stop_event: asyncio.Event):
+    """Satu slot: claim job, proses, ulangi sampai stop_event di-set"""
+    while not stop_event.is_set():
+        try:
+            job = await claim_next_job(worker_id)
+        except Exception as e:
+            print(f"Error claiming job ({worker_id}): {e}")
+            job = None
+
+        if not job:
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=WORKER_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        print(f"[{worker_id}] Claimed job {job['job_id']} for {job['company_name']} (attempt {job['attempts']})")
+        await _run_job(job)
+
+
+async def _recovery_loop(stop_event: asyncio.Event):
+    """Requeue job orphan secara berkala"""
+    while not stop_event.is_set():
+        try:
+            recovered = await recover_orphaned_jobs()
+            if recovered:
+                print(f"♻️ Requeued {recovered} orphaned job(s)")
+        except Exception as e:
+            print(f"Warning: orphan recovery failed: {e}")
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=JOB_STALE_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_worker_pool(
+    slots: int = WORKER_SLOTS,
+    stop_event: asyncio.Event = None,
+    grace_seconds: float = SHUTDOWN_GRACE_SECONDS
+):
+    """
+    Menjalankan `slots` worker bersamaan sampai stop_event di-set.
+    Setelah stop_event di-set, job yang sedang berjalan ditunggu paling lama
+    grace_seconds; sisanya di-cancel dan dikembalikan ke antrian.
+    Database harus sudah terkoneksi sebelum fungsi ini dipanggil.
+    """
+    stop_event = stop_event or asyncio.Event()
+    base_id = f"{socket.gethostname()}:{os.getpid()}"
+    worker_ids = [f"{base_id}:{i}" for i in range(slots)]
+    print(f"🛠️ Worker pool started with {slots} slot(s) ({base_id})")
+
+    tasks = [asyncio.create_task(_recovery_loop(stop_event))]
+    tasks += [asyncio.create_task(_slot_loop(worker_id, stop_event)) for worker_id in worker_ids]
+    try:
+        await stop_event.wait()
+        _, pending = await asyncio.wait(tasks, timeout=grace_seconds)
+        if pending:
+            print(f"⏱️ Shutdown grace period ({grace_seconds:g}s) exceeded, cancelling running jobs")
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            released = await release_worker_jobs(worker_ids)
+            if released:
+                print(f"♻️ Requeued {released} unfinished job(s)")
+        except Exception as e:
+            print(f"Warning: could not requeue unfinished jobs: {e}")
+        print("🛠️ Worker pool stopped")
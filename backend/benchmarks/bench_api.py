@@ -0,0 +1,262 @@
+"""
+Benchmark API offline: agent browser-use, LLM dan Gemini diganti fake
+deterministik (benchmarks/fakes.py), database memakai Postgres lokal.
+
+Server dijalankan in-process (uvicorn) dengan worker embedded, lalu setiap
+skenario dijalankan untuk setiap level concurrency. Hasil ditulis ke file JSON
+(default benchmarks/results/<timestamp>-<commit>.json) untuk dibandingkan antar commit.
+
+Usage (dari folder backend/, database kosong khusus benchmark):
+    python -m benchmarks.bench_api --database-url postgresql://localhost/sift_bench \
+        --concurrency 1,4,16 --requests 50 --agent-step-latency 0.05 --gemini-latency 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+SCENARIOS = ("create", "my_profiles", "get_profile", "create_stream")
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def _configure_env(args):
+    """Env harus di-set sebelum modul aplikasi di-import (config dibaca saat import)"""
+    os.environ.update({
+        "DATABASE_URL": args.database_url,
+        "EMBEDDED_WORKER_SLOTS": str(args.worker_slots),
+        "WORKER_POLL_INTERVAL": "0.1",
+        "BROWSER_POOL_SIZE": str(max(args.worker_slots, max(args.concurrency)) * 4),
+        "SIFT_AGENT_MODE": args.agent_mode,
+        "GEMINI_MAX_CONCURRENCY": str(args.gemini_concurrency),
+        # Benchmark mengukur throughput, bukan admission control
+        "USER_JOB_RATE_PER_MINUTE": "1000000",
+        "USER_JOB_BURST": "1000000",
+        "GLOBAL_JOB_RATE_PER_MINUTE": "1000000",
+        "GLOBAL_JOB_BURST": "1000000",
+        "JOB_QUEUE_MAX_DEPTH": "1000000",
+        "BCRYPT_ROUNDS": "4",
+        # Fast path HTTP ke website asli tidak ikut diukur (benchmark harus offline)
+        "OVERVIEW_FAST_PATH_ENABLED": "false",
+        "TECH_DETECT_ENABLED": "false",
+        "NEWS_FEEDS_ENABLED": "false",
+    })
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def _summary(latencies, errors: int, elapsed: float) -> dict:
+    samples = sorted(latencies)
+    pick = lambda q: round(samples[min(len(samples) - 1, int(len(samples) * q))] * 1000, 1) if samples else None
+    return {
+        "requests": len(samples) + errors,
+        "errors": errors,
+        "duration_seconds": round(elapsed, 3),
+        "requests_per_second": round(len(samples) / elapsed, 2) if elapsed else None,
+        "p50_ms": round(statistics.median(samples) * 1000, 1) if samples else None,
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": round(samples[-1] * 1000, 1) if samples else None,
+    }
+
+
+async def _run_level(concurrency: int, total: int, request_fn) -> dict:
+    """Jalankan `total` request dengan maksimum `concurrency` bersamaan"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, extras = [], []
+    errors = 0
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                extra = await request_fn(i)
+            except Exception as e:
+                errors += 1
+                print(f"  request {i} failed: {e}")
+                return
+            latencies.append(time.perf_counter() - start)
+            if extra:
+                extras.append(extra)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    result = _summary(latencies, errors, time.perf_counter() - start)
+    if extras and "ttfb" in extras[0]:
+        result["ttfb_p50_ms"] = round(statistics.median(e["ttfb"] for e in extras) * 1000, 1)
+    return result
+
+
+async def _wait_drained(client, timeout: float) -> float:
+    """Tunggu sampai tidak ada profile 'processing'; return detik menunggu"""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        response = await client.get("/profiles/my-profiles", params={"status": "processing", "fields": "summary", "limit": 1})
+        response.raise_for_status()
+        if not response.json():
+            return time.perf_counter() - start
+        await asyncio.sleep(0.2)
+    raise TimeoutError(f"Jobs not drained after {timeout}s")
+
+
+async def run_benchmark(args) -> dict:
+    import asyncpg
+    import httpx
+    import uvicorn
+    from .fakes import FakeLatency, install_fakes
+
+    connection = await asyncpg.connect(args.database_url)
+    try:
+        await connection.execute((Path(__file__).parent / "schema.sql").read_text())
+    finally:
+        await connection.close()
+
+    install_fakes(FakeLatency(
+        agent_steps=args.agent_steps,
+        agent_step_seconds=args.agent_step_latency,
+        gemini_seconds=args.gemini_latency,
+    ))
+    from FastAPI.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning", loop="asyncio"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        if server_task.done():
+            server_task.result()
+        await asyncio.sleep(0.05)
+
+    run_id = uuid.uuid4().hex[:8]
+    results = {}
+    limits = httpx.Limits(max_connections=max(args.concurrency) + 8)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", timeout=300, limits=limits) as client:
+            response = await client.post("/auth/register", json={
+                "username": f"bench_{run_id}",
+                "email": f"bench_{run_id}@example.com",
+                "password": "bench-password",
+            })
+            response.raise_for_status()
+            token = response.json()["access_token"]
+            client.headers["Authorization"] = f"Bearer {token}"
+
+            # Seed profile untuk skenario baca
+            print(f"Seeding {args.seed_profiles} profiles...")
+            seeded = []
+            for i in range(args.seed_profiles):
+                response = await client.post("/profiles/create", json={"company_name": f"Seed {run_id} {i}"})
+                response.raise_for_status()
+                seeded.append(response.json()["profile_id"])
+            await _wait_drained(client, args.drain_timeout)
+
+            async def create(i, level):
+                response = await client.post("/profiles/create", json={"company_name": f"Bench {run_id} c{level} {i}"})
+                response.raise_for_status()
+
+            async def my_profiles(i, level):
+                response = await client.get("/profiles/my-profiles", params={"limit": 50})
+                response.raise_for_status()
+
+            async def get_profile(i, level):
+                response = await client.get(f"/profiles/{seeded[i % len(seeded)]}")
+                response.raise_for_status()
+
+            async def create_stream(i, level):
+                start = time.perf_counter()
+                ttfb = None
+                params = {"company_name": f"Stream {run_id} c{level} {i}", "token": token}
+                async with client.stream("GET", "/profiles/create-stream", params=params) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if ttfb is None:
+                            ttfb = time.perf_counter() - start
+                        if line.startswith("data: DONE|"):
+                            return {"ttfb": ttfb}
+                        if line.startswith("data: ERROR|"):
+                            raise RuntimeError(line[len("data: ERROR|"):])
+                raise RuntimeError("Stream ended without DONE")
+
+            handlers = {"create": create, "my_profiles": my_profiles, "get_profile": get_profile, "create_stream": create_stream}
+            for scenario in args.scenarios:
+                results[scenario] = {}
+                for level in args.concurrency:
+                    print(f"Running {scenario} @ concurrency {level}...")
+                    start = time.perf_counter()
+                    result = await _run_level(level, args.requests, lambda i: handlers[scenario](i, level))
+                    if scenario == "create":
+                        # Throughput end-to-end: dari request pertama sampai semua job selesai
+                        await _wait_drained(client, args.drain_timeout)
+                        completed_in = time.perf_counter() - start
+                        result["jobs_completed_seconds"] = round(completed_in, 3)
+                        result["jobs_per_second"] = round(args.requests / completed_in, 2)
+                    results[scenario][str(level)] = result
+    finally:
+        server.should_exit = True
+        await server_task
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API SIFT dengan agent dan Gemini palsu")
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL") or os.getenv("DATABASE_URL"))
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", default="1,4,16", help="Daftar level concurrency, dipisah koma")
+    parser.add_argument("--requests", type=int, default=50, help="Jumlah request per skenario per level")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--seed-profiles", type=int, default=20)
+    parser.add_argument("--worker-slots", type=int, default=4)
+    parser.add_argument("--agent-mode", choices=("single", "parallel"), default="single")
+    parser.add_argument("--agent-steps", type=int, default=5)
+    parser.add_argument("--agent-step-latency", type=float, default=0.05)
+    parser.add_argument("--gemini-latency", type=float, default=0.2)
+    parser.add_argument("--gemini-concurrency", type=int, default=4)
+    parser.add_argument("--drain-timeout", type=float, default=600)
+    parser.add_argument("--output", help="Path file JSON hasil")
+    args = parser.parse_args()
+
+    if not args.database_url:
+        parser.error("--database-url (atau BENCH_DATABASE_URL) wajib diisi")
+    args.concurrency = [int(level) for level in args.concurrency.split(",")]
+    args.scenarios = [scenario.strip() for scenario in args.scenarios.split(",")]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    _configure_env(args)
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+
+    results = asyncio.run(run_benchmark(args))
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": sys.version.split()[0],
+        "config": {
+            key: value for key, value in vars(args).items()
+            if key not in ("database_url", "output")
+        },
+        "results": results,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{datetime.utcnow():%Y%m%d-%H%M%S}-{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(json.dumps(results, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
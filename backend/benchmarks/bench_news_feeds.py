@@ -0,0 +1,122 @@
+"""
+Benchmark dan cek hasil fast path news feed terhadap feed server lokal (tanpa internet).
+
+Server http.server di thread terpisah menyajikan homepage company (dengan
+<link rel="alternate"> ke feed blog), feed RSS company dan feed Atom publisher dari
+benchmarks/fixtures/feeds/ dengan latency buatan. Tanggal item diisi relatif ke hari
+ini ({days_ago:N} / {iso_days_ago:N}) supaya filter umur tetap deterministik.
+Signal yang dihasilkan dibandingkan dengan expected.json, lalu dicetak latency per
+run dan jumlah request ke server. Exit code 1 jika signal tidak cocok.
+
+Usage (dari folder backend/):
+    python -m benchmarks.bench_news_feeds --runs 20 --server-latency 0.1
+"""
+import argparse
+import asyncio
+import json
+import re
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from AgentScraper.http_client import close_http_client, fetch_html
+from AgentScraper.news_feeds import collect_news_signals
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "feeds"
+COMPANY_NAME = "PT Acme Logistics"
+ROUTES = {
+    "/": ("homepage.html", "text/html; charset=utf-8"),
+    "/blog/feed.xml": ("company_rss.xml", "application/rss+xml; charset=utf-8"),
+    "/publisher/rss": ("publisher_atom.xml", "application/atom+xml; charset=utf-8"),
+}
+_DATE = re.compile(r"\{(iso_)?days_ago:(\d+)\}")
+
+
+def _render(text: str) -> bytes:
+    now = datetime.now(timezone.utc)
+
+    def date(match):
+        value = now - timedelta(days=int(match.group(2)))
+        return value.isoformat() if match.group(1) else format_datetime(value)
+
+    return _DATE.sub(date, text).encode("utf-8")
+
+
+def _make_handler(latency: float):
+    class FeedHandler(BaseHTTPRequestHandler):
+        requests_served = 0
+
+        def do_GET(self):
+            FeedHandler.requests_served += 1
+            time.sleep(latency)
+            route = ROUTES.get(self.path.split("?")[0])
+            if route is None:
+                self.send_error(404)
+                return
+            name, content_type = route
+            body = _render((FIXTURES_DIR / name).read_text(encoding="utf-8"))
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return FeedHandler
+
+
+def check_signals(signals) -> bool:
+    expected = json.loads((FIXTURES_DIR / "expected.json").read_text(encoding="utf-8"))
+    actual = [{"title": signal.title, "signal_type": signal.signal_type} for signal in signals]
+    for signal in signals:
+        print(f"  {signal.signal_type:<18} {signal.title}  ({signal.url})")
+    ok = actual == expected
+    if not ok:
+        print(f"MISMATCH, expected: {json.dumps(expected, indent=2)}")
+    return ok
+
+
+async def run(args) -> bool:
+    handler = _make_handler(args.server_latency)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    feed_urls = [f"{base}/publisher/rss?q={{company}}", f"{base}/publisher/missing?q={{company}}"]
+
+    try:
+        homepage = await fetch_html(base)
+        found = await collect_news_signals(COMPANY_NAME, base, homepage, feed_urls)
+        print(f"{len(found['signals'])} signals from {found['feeds']} feeds ({found['items']} items):")
+        ok = check_signals(found["signals"])
+
+        handler.requests_served = 0
+        latencies = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            await collect_news_signals(COMPANY_NAME, base, homepage, feed_urls)
+            latencies.append(time.perf_counter() - start)
+        print(f"\n{args.runs} runs: p50 {statistics.median(latencies) * 1000:.1f} ms, "
+              f"max {max(latencies) * 1000:.1f} ms with {args.server_latency * 1000:.0f} ms per feed request "
+              f"({handler.requests_served // args.runs} feed requests per run)")
+        return ok
+    finally:
+        await close_http_client()
+        server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fast path news feed dengan feed server lokal")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--server-latency", type=float, default=0.1, help="Latency buatan per request (detik)")
+    ok = asyncio.run(run(parser.parse_args()))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark page cache terhadap HTTP server lokal (tanpa internet).
+
+Server http.server di thread terpisah menyajikan halaman HTML sintetis dengan
+latency buatan. Setiap URL dibaca dua kali lewat PageCache (cold lalu warm) di
+direktori sementara, lalu dicetak page load yang dihemat dan latency per pass.
+
+Usage (dari folder backend/):
+    python -m benchmarks.bench_page_cache --pages 200 --concurrency 16 --server-latency 0.05
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from AgentScraper import page_cache
+from AgentScraper.http_client import close_http_client
+from AgentScraper.page_cache import PageCache, PageCacheUsage, get_page_cache_stats
+
+PARAGRAPH = "Acme builds logistics software for retailers across Southeast Asia. " * 8
+
+
+def _make_handler(latency: float):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        requests_served = 0
+
+        def do_GET(self):
+            FixtureHandler.requests_served += 1
+            time.sleep(latency)
+            page = self.path.strip("/") or "index"
+            body = f"""<html><head><title>{page}</title><script>var tracking = 1;</script></head>
+<body><nav>Home | About | Careers</nav><h1>{page}</h1>
+<p>{PARAGRAPH}</p><p>{PARAGRAPH}</p><footer>Copyright Acme</footer></body></html>""".encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return FixtureHandler
+
+
+async def _read_all(cache: PageCache, urls, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    usage = PageCacheUsage()
+    latencies = []
+
+    async def read(url):
+        async with semaphore:
+            start = time.perf_counter()
+            await cache.read(url, usage)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(read(url) for url in urls))
+    elapsed = time.perf_counter() - start
+    return {
+        "seconds": round(elapsed, 3),
+        "pages_per_second": round(len(urls) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "hits": usage.hits,
+        "fetches": usage.fetches,
+    }
+
+
+async def run(args):
+    handler = _make_handler(args.server_latency)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/company-{i}/about" for i in range(args.pages)]
+
+    async def resolve_fixture(host, port):
+        # Server fixture di loopback dianggap host publik oleh pengecekan SSRF
+        return ["93.184.216.34"]
+
+    try:
+        with tempfile.TemporaryDirectory() as directory, \
+                patch.object(page_cache, "_resolve_host", resolve_fixture):
+            cache = PageCache(directory, ttl_hours=1, max_mb=args.max_mb)
+            for name in ("cold", "warm"):
+                result = await _read_all(cache, urls, args.concurrency)
+                print(f"{name:>5}: {result}")
+            print(f"server requests: {handler.requests_served} for {2 * args.pages} page reads")
+            print(f"cache stats: {get_page_cache_stats()}")
+    finally:
+        await close_http_client()
+        server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark page cache dengan HTTP server lokal")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--server-latency", type=float, default=0.05, help="Latency buatan per request (detik)")
+    parser.add_argument("--max-mb", type=float, default=200, help="Budget disk cache; kecilkan untuk menguji eviction")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark latency list profile: kolom TEXT + json.loads manual (cara lama)
+vs kolom JSONB + codec orjson di pool (cara baru).
+
+Butuh Postgres lokal di DATABASE_URL. Data ditulis ke TEMP table, jadi tidak
+mengubah tabel aplikasi.
+
+Usage (dari folder backend/):
+    python -m benchmarks.bench_profile_list --rows 1000 --page-size 50 --repeat 30
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import asyncpg
+from FastAPI.database import DATABASE_URL, _init_connection
+from .sample_data import sample_profile_columns
+
+JSON_COLUMNS = (
+    "overview", "tech_stack", "recent_news_signals", "key_contacts",
+    "pain_points", "opening_lines", "data_sources",
+)
+
+
+async def _create_table(connection, name: str, column_type: str, rows: int, encode):
+    columns = ", ".join(f"{column} {column_type}" for column in JSON_COLUMNS)
+    await connection.execute(f"""
+        CREATE TEMP TABLE {name} (
+            profile_id SERIAL PRIMARY KEY,
+            company_name TEXT,
+            created_at TIMESTAMP DEFAULT NOW(),
+            {columns}
+        )
+    """)
+    placeholders = ", ".join(f"${i + 2}" for i in range(len(JSON_COLUMNS)))
+    await connection.executemany(
+        f"INSERT INTO {name} (company_name, {', '.join(JSON_COLUMNS)}) VALUES ($1, {placeholders})",
+        [
+            (f"Company {i}", *[encode(value) for value in sample_profile_columns(i).values()])
+            for i in range(rows)
+        ]
+    )
+
+
+def _summary(samples):
+    samples = sorted(samples)
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 2),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1] * 1000, 2),
+    }
+
+
+async def _time(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return _summary(samples)
+
+
+async def main(rows: int, page_size: int, repeat: int):
+    # Koneksi tanpa codec: kolom JSON dibaca sebagai string lalu json.loads per kolom
+    text_conn = await asyncpg.connect(DATABASE_URL)
+    # Koneksi dengan codec yang sama dengan pool aplikasi
+    jsonb_conn = await asyncpg.connect(DATABASE_URL)
+    await _init_connection(jsonb_conn)
+
+    try:
+        await _create_table(text_conn, "bench_profiles_text", "TEXT", rows, json.dumps)
+        await _create_table(jsonb_conn, "bench_profiles_jsonb", "JSONB", rows, lambda value: value)
+
+        select = f"SELECT profile_id, company_name, created_at, {', '.join(JSON_COLUMNS)} FROM {{table}} ORDER BY created_at DESC, profile_id DESC LIMIT $1"
+
+        async def text_listing(limit):
+            records = await text_conn.fetch(select.format(table="bench_profiles_text"), limit)
+            return [
+                {column: json.loads(record[column]) if record[column] else None for column in JSON_COLUMNS}
+                for record in records
+            ]
+
+        async def jsonb_listing(limit):
+            records = await jsonb_conn.fetch(select.format(table="bench_profiles_jsonb"), limit)
+            return [{column: record[column] for column in JSON_COLUMNS} for record in records]
+
+        results = {}
+        for label, limit in (("page", page_size), ("full", rows)):
+            results[label] = {
+                "rows": limit,
+                "text_json_loads": await _time(lambda: text_listing(limit), repeat),
+                "jsonb_orjson_codec": await _time(lambda: jsonb_listing(limit), repeat),
+            }
+        print(json.dumps(results, indent=2))
+    finally:
+        await text_conn.close()
+        await jsonb_conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark TEXT+json.loads vs JSONB codec")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.page_size, args.repeat))
@@ -0,0 +1,101 @@
+"""
+Micro-benchmark serialisasi listing profile (tanpa database).
+
+Membandingkan jalur lama (ProfileResponse per row -> validasi ulang
+response_model -> jsonable_encoder -> json.dumps) dengan serializer orjson di
+FastAPI/serializers.py, lalu mencetak rows/sec.
+
+Usage (dari folder backend/):
+    python -m benchmarks.bench_profile_serialize --rows 1000 --repeat 50
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from FastAPI.profiles import ProfileResponse
+from FastAPI.serializers import dumps_profiles
+from .sample_data import sample_profile_columns
+
+_adapter = TypeAdapter(list[ProfileResponse])
+
+
+def _sample_rows(count: int) -> list:
+    """Row mirip asyncpg Record (dict mendukung [] dan .get())"""
+    user_id = uuid.uuid4()
+    now = datetime.utcnow()
+    rows = []
+    for i in range(count):
+        row = {
+            "profile_id": uuid.uuid4(),
+            "user_id": user_id,
+            "company_name": f"Company {i}",
+            "status": "completed",
+            "executive_summary": f"Company {i} is a fast-growing business. " * 4,
+            "last_analyzed_at": now - timedelta(hours=i),
+            "is_favorite": i % 7 == 0,
+            "created_at": now - timedelta(hours=i),
+        }
+        row.update(sample_profile_columns(i))
+        rows.append(row)
+    return rows
+
+
+def old_path(rows) -> bytes:
+    profiles = [
+        ProfileResponse(
+            profile_id=str(row["profile_id"]),
+            user_id=str(row["user_id"]),
+            company_name=row["company_name"],
+            status=row.get("status") or "completed",
+            overview=row.get("overview"),
+            tech_stack=row.get("tech_stack"),
+            recent_news_signals=row.get("recent_news_signals"),
+            key_contacts=row.get("key_contacts"),
+            executive_summary=row.get("executive_summary"),
+            pain_points=row.get("pain_points"),
+            opening_lines=row.get("opening_lines"),
+            data_sources=row.get("data_sources"),
+            last_analyzed_at=str(row["last_analyzed_at"]) if row.get("last_analyzed_at") else None,
+            is_favorite=row.get("is_favorite") or False,
+            created_at=str(row["created_at"])
+        )
+        for row in rows
+    ]
+    # Yang dilakukan FastAPI untuk response_model=list[ProfileResponse]
+    validated = _adapter.validate_python(_adapter.dump_python(profiles))
+    return json.dumps(jsonable_encoder(validated), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _rows_per_second(fn, rows, repeat: int) -> float:
+    fn(rows)  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(rows)
+    elapsed = time.perf_counter() - start
+    return len(rows) * repeat / elapsed
+
+
+def main(count: int, repeat: int):
+    rows = _sample_rows(count)
+    assert json.loads(old_path(rows)) == json.loads(dumps_profiles(rows)), "Output serializer berbeda"
+
+    old = _rows_per_second(old_path, rows, repeat)
+    new = _rows_per_second(dumps_profiles, rows, repeat)
+    print(json.dumps({
+        "rows": count,
+        "repeat": repeat,
+        "pydantic_response_model_rows_per_sec": round(old),
+        "orjson_serializer_rows_per_sec": round(new),
+        "speedup": round(new / old, 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark serialisasi listing profile")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
@@ -0,0 +1,77 @@
+"""
+Benchmark dan cek akurasi TechDetector terhadap fixture HTML tersimpan.
+
+Fixture ada di benchmarks/fixtures/techdetect/ dengan header, cookie dan
+teknologi yang diharapkan di expected.json. Script ini melaporkan teknologi yang
+terlewat / salah deteksi per fixture, lalu throughput (halaman per detik) dengan
+menganalisis semua fixture berulang kali. Exit code 1 jika ada fixture yang tidak cocok.
+
+Usage (dari folder backend/):
+    python -m benchmarks.bench_techdetect --iterations 200
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from AgentScraper.techdetect import TechDetector
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "techdetect"
+
+
+def load_fixtures():
+    expected = json.loads((FIXTURES_DIR / "expected.json").read_text(encoding="utf-8"))
+    return [
+        (name, (FIXTURES_DIR / name).read_text(encoding="utf-8"), case)
+        for name, case in expected.items()
+    ]
+
+
+def check_corpus(detector: TechDetector, fixtures) -> bool:
+    ok = True
+    for name, html, case in fixtures:
+        detected = detector.analyze(html, case.get("headers"), case.get("cookies"))
+        expected = set(case["expected"])
+        missing = sorted(expected - detected)
+        unexpected = sorted(detected - expected)
+        status = "OK" if not missing and not unexpected else "MISMATCH"
+        ok = ok and status == "OK"
+        print(f"{status:>8}  {name}: {len(detected)} detected")
+        if missing:
+            print(f"          missing:    {', '.join(missing)}")
+        if unexpected:
+            print(f"          unexpected: {', '.join(unexpected)}")
+    return ok
+
+
+def bench_throughput(detector: TechDetector, fixtures, iterations: int):
+    pages = 0
+    total_bytes = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for _, html, case in fixtures:
+            detector.analyze(html, case.get("headers"), case.get("cookies"))
+            pages += 1
+            total_bytes += len(html)
+    elapsed = time.perf_counter() - start
+    print(f"\n{pages} pages in {elapsed:.2f}s → {pages / elapsed:,.0f} pages/sec "
+          f"({total_bytes / elapsed / 1024 / 1024:.1f} MB/sec, {len(detector.signatures)} signatures)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TechDetector dengan fixture HTML")
+    parser.add_argument("--iterations", type=int, default=200, help="Berapa kali seluruh fixture dianalisis")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    detector = TechDetector.from_file()
+    print(f"Loaded {len(detector.signatures)} signatures in {(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+    fixtures = load_fixtures()
+    ok = check_corpus(detector, fixtures)
+    bench_throughput(detector, fixtures, args.iterations)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Fake deterministik untuk browser-use Agent / ChatGoogle / Browser dan Gemini
+GenerativeModel, dengan latency yang bisa diatur. Dipakai oleh benchmark
+supaya pipeline bisa diukur tanpa Chrome dan tanpa API key.
+
+install_fakes() mengganti objek di modul yang sudah di-import:
+AgentScraper.profiler (Agent, llm), AgentScraper.browser_pool (Browser) dan
+FastAPI.intelligence_service (model).
+"""
+import asyncio
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import List, Optional
+from AgentScraper.schemas import (
+    CompanyOverview, CompanyProfile, ContactsSection, NewsSection, TechStackSection,
+)
+
+
+@dataclass
+class FakeLatency:
+    agent_steps: int = 5              # step per agent run
+    agent_step_seconds: float = 0.05  # latency per step
+    gemini_seconds: float = 0.2       # latency per panggilan Gemini
+    browser_kill_seconds: float = 0.0
+
+
+LATENCY = FakeLatency()
+
+_COMPANY_PATTERN = re.compile(r"company profile for '(.+?)' to help")
+
+
+def _fake_sections(company_name: str) -> dict:
+    slug = re.sub(r"[^a-z0-9]+", "-", company_name.lower()).strip("-") or "company"
+    return {
+        "overview": {
+            "industry": "Software",
+            "location": "Jakarta, Indonesia",
+            "employee_count": "500-1000",
+            "website": f"https://{slug}.example.com",
+            "founded_year": "2015",
+        },
+        "tech_stack": ["Python", "Go", "React", "PostgreSQL", "Kubernetes", "AWS"],
+        "recent_news_signals": [
+            {"title": f"{company_name} raises Series B", "url": f"https://news.example.com/{slug}/1", "signal_type": "Funding Round"},
+            {"title": f"{company_name} is hiring engineers", "url": f"https://news.example.com/{slug}/2", "signal_type": "Strategic Hiring"},
+        ],
+        "key_contacts": [
+            {"name": "Jane Doe", "title": "CTO", "linkedin": f"https://www.linkedin.com/in/{slug}-cto/"},
+            {"name": "John Roe", "title": "VP of Engineering", "linkedin": f"https://www.linkedin.com/in/{slug}-vpe/"},
+        ],
+    }
+
+
+def _fake_result(output_model, company_name: str) -> str:
+    sections = _fake_sections(company_name)
+    if output_model is CompanyProfile:
+        data = {"company_name": company_name, **sections}
+    elif output_model is CompanyOverview:
+        data = sections["overview"]
+    elif output_model is TechStackSection:
+        data = {"tech_stack": sections["tech_stack"]}
+    elif output_model is NewsSection:
+        data = {"recent_news_signals": sections["recent_news_signals"]}
+    elif output_model is ContactsSection:
+        data = {"key_contacts": sections["key_contacts"]}
+    else:
+        data = {}
+    return json.dumps(data)
+
+
+class _FakeAction:
+    def __init__(self, name: str, params: dict):
+        self._data = {name: params}
+
+    def model_dump(self, exclude_unset: bool = False) -> dict:
+        return self._data
+
+
+@dataclass
+class FakeHistory:
+    history: List[SimpleNamespace] = field(default_factory=list)
+    result: Optional[str] = None
+
+    def final_result(self) -> Optional[str]:
+        return self.result
+
+    def number_of_steps(self) -> int:
+        return len(self.history)
+
+
+class FakeAgent:
+    """Pengganti browser_use.Agent: N step dengan sleep, lalu hasil sesuai output_model_schema"""
+
+    def __init__(self, task: str, llm=None, browser=None, output_model_schema=None, max_steps: int = 50, **kwargs):
+        match = _COMPANY_PATTERN.search(task)
+        self.company_name = match.group(1) if match else "Benchmark Co"
+        self.output_model_schema = output_model_schema
+        self.history = FakeHistory()
+        self.state = SimpleNamespace(n_steps=0, history=self.history)
+        self._stopped = False
+
+    def stop(self):
+        self._stopped = True
+
+    async def run(self, max_steps: int = 50, on_step_end=None, **kwargs) -> FakeHistory:
+        steps = min(LATENCY.agent_steps, max_steps)
+        for step in range(1, steps + 1):
+            if self._stopped:
+                break
+            started = time.time()
+            await asyncio.sleep(LATENCY.agent_step_seconds)
+            self.state.n_steps = step
+            self.history.history.append(SimpleNamespace(
+                metadata=SimpleNamespace(
+                    step_number=step, input_tokens=1500,
+                    step_start_time=started, step_end_time=time.time(),
+                ),
+                model_output=SimpleNamespace(action=[_FakeAction("go_to_url", {"url": "https://example.com"})]),
+                state=SimpleNamespace(url=f"https://example.com/{step}"),
+            ))
+            if on_step_end is not None:
+                await on_step_end(self)
+        self.history.result = _fake_result(self.output_model_schema, self.company_name)
+        return self.history
+
+
+class FakeChatGoogle:
+    def __init__(self, model: str = "fake-gemini", **kwargs):
+        self.model = model
+
+
+class FakeBrowser:
+    def __init__(self, **kwargs):
+        pass
+
+    def get_page_targets(self):
+        return []
+
+    async def kill(self):
+        if LATENCY.browser_kill_seconds:
+            await asyncio.sleep(LATENCY.browser_kill_seconds)
+
+
+class FakeGenerativeModel:
+    """Pengganti genai.GenerativeModel untuk intelligence_service"""
+
+    model_name = "models/fake-gemini"
+
+    async def generate_content_async(self, prompt: str, generation_config=None):
+        await asyncio.sleep(LATENCY.gemini_seconds)
+        text = json.dumps({
+            "executive_summary": "Benchmark company with a growing engineering team.",
+            "pain_points": [
+                {"title": "Scaling infrastructure", "description": "Rapid growth strains the platform.",
+                 "confidence": "Medium", "source": "Recent news"},
+            ],
+            "opening_lines": {
+                "devops_manager": {"role": "For DevOps/Infrastructure Manager", "message": "Hi!", "context": "Hiring"},
+                "head_of_engineering": {"role": "For Head of Engineering/CTO", "message": "Hello!", "context": "Funding"},
+            },
+        })
+        return SimpleNamespace(
+            text=text,
+            usage_metadata=SimpleNamespace(prompt_token_count=len(prompt) // 4, candidates_token_count=len(text) // 4),
+        )
+
+
+def install_fakes(latency: Optional[FakeLatency] = None):
+    """Ganti Agent, LLM, Browser dan Gemini model di modul aplikasi dengan fake"""
+    if latency is not None:
+        for name, value in vars(latency).items():
+            setattr(LATENCY, name, value)
+
+    from AgentScraper import browser_pool, profiler
+    from FastAPI import intelligence_service
+
+    profiler.Agent = FakeAgent
+    profiler.llm = FakeChatGoogle()
+    browser_pool.Browser = FakeBrowser
+    intelligence_service.model = FakeGenerativeModel()
@@ -0,0 +1,98 @@
+"""
+Load test login: throughput /auth/login dan dampaknya ke latency endpoint lain.
+
+Selama burst login berjalan, satu probe terus memanggil endpoint ringan
+(default GET /) untuk mengukur apakah event loop ikut ter-block. Jalankan
+terhadap API yang sudah berjalan, sekali dengan kode lama dan sekali dengan
+bcrypt di thread pool, lalu bandingkan hasil JSON-nya.
+
+Usage (dari folder backend/):
+    python -m benchmarks.load_auth --base-url http://localhost:8000 --concurrency 16 --duration 20
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+import httpx
+
+
+def _percentiles(samples) -> dict:
+    if not samples:
+        return {"count": 0}
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(len(samples) * q))]
+    return {
+        "count": len(samples),
+        "p50_ms": round(statistics.median(samples) * 1000, 1),
+        "p95_ms": round(pick(0.95) * 1000, 1),
+        "p99_ms": round(pick(0.99) * 1000, 1),
+        "max_ms": round(samples[-1] * 1000, 1),
+    }
+
+
+async def _probe(client: httpx.AsyncClient, path: str, stop: asyncio.Event, samples: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get(path)
+        samples.append(time.perf_counter() - start)
+        await asyncio.sleep(0.05)
+
+
+async def _login_loop(client: httpx.AsyncClient, credentials: dict, stop: asyncio.Event, samples: list, errors: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.post("/auth/login", json=credentials)
+        if response.status_code == 200:
+            samples.append(time.perf_counter() - start)
+        else:
+            errors.append(response.status_code)
+
+
+async def main(base_url: str, concurrency: int, duration: float, probe_path: str):
+    credentials = {"email": f"loadtest-{uuid.uuid4().hex[:8]}@example.com", "password": "load-test-password"}
+    limits = httpx.Limits(max_connections=concurrency + 2)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        response = await client.post("/auth/register", json={"username": credentials["email"].split("@")[0], **credentials})
+        response.raise_for_status()
+
+        # Baseline latency probe tanpa beban login
+        stop = asyncio.Event()
+        baseline = []
+        probe = asyncio.create_task(_probe(client, probe_path, stop, baseline))
+        await asyncio.sleep(min(5.0, duration / 4))
+        stop.set()
+        await probe
+
+        stop = asyncio.Event()
+        logins, errors, under_load = [], [], []
+        tasks = [asyncio.create_task(_login_loop(client, credentials, stop, logins, errors)) for _ in range(concurrency)]
+        tasks.append(asyncio.create_task(_probe(client, probe_path, stop, under_load)))
+        await asyncio.sleep(duration)
+        stop.set()
+        await asyncio.gather(*tasks)
+
+        stats = (await client.get("/stats")).json().get("bcrypt")
+
+    print(json.dumps({
+        "concurrency": concurrency,
+        "duration_seconds": duration,
+        "login_throughput_per_sec": round(len(logins) / duration, 1),
+        "login_latency": _percentiles(logins),
+        "login_errors": {str(code): errors.count(code) for code in set(errors)},
+        f"probe_{probe_path}_baseline": _percentiles(baseline),
+        f"probe_{probe_path}_under_login_load": _percentiles(under_load),
+        "server_bcrypt_metrics": stats,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test login dan latency endpoint lain")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--probe-path", default="/")
+    args = parser.parse_args()
+    asyncio.run(main(args.base_url, args.concurrency, args.duration, args.probe_path))
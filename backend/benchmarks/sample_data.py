@@ -0,0 +1,64 @@
+"""
+Data profile sintetis untuk benchmark (ukuran mirip hasil agent sungguhan).
+"""
+import random
+
+
+def sample_profile_columns(i: int) -> dict:
+    """Nilai kolom JSON company_profiles untuk profile ke-i"""
+    rng = random.Random(i)
+    company = f"Company {i}"
+    return {
+        "overview": {
+            "industry": rng.choice(["Fintech", "E-commerce", "Logistics", "SaaS"]),
+            "location": "Jakarta, Indonesia",
+            "employee_count": f"{rng.randint(1, 50) * 100}-{rng.randint(51, 100) * 100}",
+            "website": f"https://company{i}.example.com",
+            "founded_year": str(rng.randint(1990, 2020)),
+        },
+        "tech_stack": rng.sample(
+            ["Python", "Go", "Java", "Kotlin", "React", "Vue", "PostgreSQL", "MySQL",
+             "Redis", "Kafka", "Kubernetes", "AWS", "GCP", "Terraform", "Elasticsearch"],
+            8
+        ),
+        "recent_news_signals": [
+            {
+                "title": f"{company} announces news item {n} with a reasonably long headline",
+                "url": f"https://news.example.com/{i}/{n}",
+                "signal_type": rng.choice(["Funding Round", "Strategic Hiring", "Product Launch"]),
+            }
+            for n in range(5)
+        ],
+        "key_contacts": [
+            {
+                "name": f"Person {i}-{n}",
+                "title": rng.choice(["CEO", "CTO", "VP of Engineering", "Head of Product"]),
+                "linkedin": f"https://www.linkedin.com/in/person-{i}-{n}/",
+                "email": None,
+                "phone": None,
+            }
+            for n in range(5)
+        ],
+        "pain_points": [
+            {
+                "title": f"Pain point {n}",
+                "description": "Scaling infrastructure costs while expanding into new markets. " * 2,
+                "confidence": rng.choice(["High", "Medium", "Low"]),
+                "source": "Recent news and tech stack",
+            }
+            for n in range(4)
+        ],
+        "opening_lines": {
+            "devops_manager": {
+                "role": "For DevOps/Infrastructure Manager",
+                "message": f"Saw {company} is scaling fast - " + "how are you handling deploys? " * 3,
+                "context": "Hiring signals and cloud footprint",
+            },
+            "head_of_engineering": {
+                "role": "For Head of Engineering/CTO",
+                "message": f"Congrats on the recent launch at {company}. " * 3,
+                "context": "Product launch news",
+            },
+        },
+        "data_sources": [f"https://news.example.com/{i}/{n}" for n in range(5)],
+    }
@@ -0,0 +1,29 @@
+-- Tabel dasar untuk database benchmark lokal yang masih kosong.
+-- Kolom lain (status, section_analyzed_at, timings, batch_id, tabel antrian & cache)
+-- dibuat oleh startup aplikasi.
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+
+CREATE TABLE IF NOT EXISTS users (
+    user_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    username VARCHAR(100) UNIQUE NOT NULL,
+    email VARCHAR(255) UNIQUE NOT NULL,
+    password_hash TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS company_profiles (
+    profile_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+    company_name TEXT NOT NULL,
+    overview JSONB,
+    tech_stack JSONB,
+    recent_news_signals JSONB,
+    key_contacts JSONB,
+    executive_summary TEXT,
+    pain_points JSONB,
+    opening_lines JSONB,
+    data_sources JSONB,
+    last_analyzed_at TIMESTAMP,
+    is_favorite BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
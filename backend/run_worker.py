@@ -0,0 +1,66 @@
+"""
+Script untuk menjalankan worker profile generation secara terpisah dari API server.
+
+Usage:
+    python run_worker.py            # jumlah slot dari env WORKER_SLOTS (default 2)
+    python run_worker.py --slots 4
+    python run_worker.py --metrics-port 9101   # expose Prometheus metrics worker
+"""
+import argparse
+import asyncio
+import os
+import signal
+import sys
+
+# PENTING: Set event loop policy SEBELUM mengimport apapun
+if sys.platform == 'win32':
+    from asyncio import WindowsProactorEventLoopPolicy
+    asyncio.set_event_loop_policy(WindowsProactorEventLoopPolicy())
+    print("✓ Windows ProactorEventLoop policy set (supports subprocess)")
+
+from AgentScraper.browser_pool import browser_pool
+from AgentScraper.http_client import close_http_client
+from FastAPI.database import db
+from FastAPI.job_queue import ensure_job_table
+from FastAPI.profile_cache import ensure_profile_cache_table
+from FastAPI.intelligence_cache import ensure_intelligence_cache_table
+from FastAPI.worker import run_worker_pool, WORKER_SLOTS
+from prometheus_client import start_http_server
+
+
+async def main(slots: int, metrics_port: int):
+    if metrics_port:
+        # Metric agent, Gemini dan enrichment dari proses worker
+        start_http_server(metrics_port)
+        print(f"✅ Worker metrics on :{metrics_port}/metrics")
+
+    await db.connect()
+    await ensure_job_table()
+    await ensure_profile_cache_table()
+    await ensure_intelligence_cache_table()
+
+    stop_event = asyncio.Event()
+    if sys.platform != 'win32':
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop_event.set)
+
+    try:
+        await run_worker_pool(slots, stop_event)
+    finally:
+        await browser_pool.close()
+        await close_http_client()
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SIFT profile generation worker")
+    parser.add_argument("--slots", type=int, default=WORKER_SLOTS, help="Jumlah job yang diproses bersamaan")
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=int(os.getenv("WORKER_METRICS_PORT", "0")),
+        help="Port HTTP untuk Prometheus metrics (0 = nonaktif)"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.slots, args.metrics_port))
@@ -0,0 +1,95 @@
+"""
+read_page / PageCache tidak boleh fetch alamat non-publik, termasuk lewat redirect.
+
+Usage (dari folder backend/):
+    python -m unittest tests.test_page_cache_ssrf
+"""
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from AgentScraper import page_cache
+from AgentScraper.http_client import close_http_client
+
+PAGE_HTML = "<html><head><title>Acme</title></head><body><p>{}</p></body></html>".format("Acme builds rockets. " * 20)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.paths.append(self.path)
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", f"http://localhost:{self.server.server_port}/secret")
+            self.end_headers()
+            return
+        body = PAGE_HTML.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PageCacheSSRFTest(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        cls.server.paths = []
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    async def asyncSetUp(self):
+        self.server.paths.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache = page_cache.PageCache(directory=directory.name)
+
+    async def asyncTearDown(self):
+        await close_http_client()
+
+    def _treat_server_as_public(self):
+        """127.0.0.1 dianggap host publik; host lain tetap di-resolve sungguhan"""
+        resolve = page_cache._resolve_host
+
+        async def fake_resolve(host, port):
+            if host == "127.0.0.1":
+                return ["93.184.216.34"]
+            return await resolve(host, port)
+
+        return patch.object(page_cache, "_resolve_host", fake_resolve)
+
+    async def test_loopback_url_is_rejected_without_request(self):
+        with self.assertRaisesRegex(ValueError, "non-public"):
+            await self.cache.read(f"{self.base_url}/page")
+        self.assertEqual(self.server.paths, [])
+
+    async def test_private_and_link_local_addresses_are_rejected(self):
+        for url in ("http://10.0.0.5/", "http://192.168.1.1/", "http://169.254.169.254/latest/meta-data/", "http://[::1]/"):
+            with self.subTest(url=url), self.assertRaisesRegex(ValueError, "non-public"):
+                await page_cache.check_public_url(url)
+
+    async def test_redirect_to_loopback_is_rejected(self):
+        with self._treat_server_as_public(), self.assertRaisesRegex(ValueError, "non-public"):
+            await self.cache.read(f"{self.base_url}/redirect")
+        self.assertEqual(self.server.paths, ["/redirect"])
+
+    async def test_public_page_is_fetched(self):
+        with self._treat_server_as_public():
+            entry = await self.cache.read(f"{self.base_url}/page")
+        self.assertEqual(entry["title"], "Acme")
+        self.assertIn("Acme builds rockets.", entry["text"])
+        self.assertEqual(self.server.paths, ["/page"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Refresh section yang gagal tidak boleh menandai profile yang sudah 'completed' sebagai 'failed'.
+
+Usage (dari folder backend/):
+    python -m unittest tests.test_refresh_failure
+"""
+import unittest
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+from fastapi import HTTPException
+from FastAPI import job_queue, profiles, section_refresh
+
+OLD_NEWS = [{"title": "Acme raises Series B", "url": "https://acme.example/news", "date": "2024-01-10"}]
+
+
+class FakeDatabase:
+    """Satu baris company_profiles; UPDATE status dievaluasi seperti di Postgres"""
+
+    def __init__(self, row: dict):
+        self.row = row
+        self.executed = []
+
+    async def fetch_one(self, query, *args):
+        return self.row
+
+    async def execute(self, query, *args):
+        query = " ".join(query.split())
+        self.executed.append((query, args))
+        if "CASE WHEN last_analyzed_at IS NULL THEN 'failed' ELSE 'completed' END" in query:
+            self.row["status"] = "failed" if self.row["last_analyzed_at"] is None else "completed"
+        elif "SET status = 'failed'" in query:
+            self.row["status"] = "failed"
+        elif "SET overview" in query:
+            raise AssertionError(f"unexpected profile data write: {query}")
+
+
+class ProcessProfileFailureTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.db = FakeDatabase({
+            "status": "processing",
+            "last_analyzed_at": datetime(2024, 1, 10),
+            "overview": None,
+            "tech_stack": ["React"],
+            "recent_news_signals": OLD_NEWS,
+            "key_contacts": None,
+        })
+        patchers = [
+            patch.object(profiles, "db", self.db),
+            patch.object(profiles, "notify_profile_status", AsyncMock()),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_failed_refresh_keeps_profile_completed(self):
+        # Semua sub-agent gagal: run_sift_agent_sections raise, bukan return kosong
+        agent = AsyncMock(side_effect=HTTPException(
+            status_code=500, detail="AI Agent failed to produce a result for every section."
+        ))
+        with patch.object(section_refresh, "run_sift_agent_sections", agent), \
+                patch.object(profiles, "store_profile", AsyncMock()) as store_profile:
+            success = await profiles.process_profile_background("p-1", "Acme", sections=["recent_news_signals"])
+
+        self.assertFalse(success)
+        agent.assert_awaited_once()
+        store_profile.assert_not_awaited()
+        self.assertEqual(self.db.row["status"], "completed")
+        self.assertEqual(self.db.row["recent_news_signals"], OLD_NEWS)
+        query, args = self.db.executed[-1]
+        self.assertEqual(args[0], "p-1")
+        self.assertTrue(args[1]["refresh_failed"])
+
+    async def test_failed_refresh_of_never_analyzed_profile_marks_failed(self):
+        self.db.row["last_analyzed_at"] = None
+        agent = AsyncMock(side_effect=HTTPException(status_code=500, detail="agent crashed"))
+        with patch.object(section_refresh, "run_sift_agent_sections", agent):
+            success = await profiles.process_profile_background("p-1", "Acme", sections=["recent_news_signals"])
+
+        self.assertFalse(success)
+        self.assertEqual(self.db.row["status"], "failed")
+
+    async def test_failed_first_analysis_marks_profile_failed(self):
+        with patch.object(profiles, "get_company_profile", AsyncMock(side_effect=RuntimeError("agent crashed"))):
+            success = await profiles.process_profile_background("p-2", "Acme")
+
+        self.assertFalse(success)
+        self.assertEqual(self.db.row["status"], "failed")
+        query, args = self.db.executed[-1]
+        self.assertNotIn("refresh_failed", args[1])
+        self.assertEqual(args[1]["error"], "agent crashed")
+
+
+class RecoverOrphanedJobsTest(unittest.IsolatedAsyncioTestCase):
+    async def test_refresh_job_at_max_attempts_keeps_profile_completed(self):
+        fake_db = AsyncMock()
+        fake_db.fetch_all.side_effect = [
+            [{"profile_id": "p-1", "sections": ["recent_news_signals"]}, {"profile_id": "p-2", "sections": None}],
+            [],
+        ]
+        with patch.object(job_queue, "db", fake_db), \
+                patch.object(job_queue, "notify_profile_status", AsyncMock()) as notify:
+            await job_queue.recover_orphaned_jobs()
+
+        updates = [(" ".join(call.args[0].split()), call.args[1:]) for call in fake_db.execute.await_args_list]
+        self.assertEqual([args for _, args in updates], [("p-1", True), ("p-2", False)])
+        for query, _ in updates:
+            self.assertIn("CASE WHEN $2 AND last_analyzed_at IS NOT NULL THEN 'completed' ELSE 'failed' END", query)
+        notify.assert_awaited_once_with(["p-1", "p-2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -22,6 +22,13 @@ export default function Dashboard() {
   const [loading, setLoading] = useState(true);
   const [favoritesLoading, setFavoritesLoading] = useState(false);
   const [historyLoading, setHistoryLoading] = useState(false);
+  // X-Next-Cursor per tab (null = no more pages)
+  const [cursors, setCursors] = useState({
+    dashboard: null,
+    favorites: null,
+    history: null,
+  });
+  const [loadingMore, setLoadingMore] = useState(false);
   const [companyInput, setCompanyInput] = useState("");
   const [generating, setGenerating] = useState(false);
   const [activeTab, setActiveTab] = useState("dashboard");
@@ -56,19 +63,22 @@ export default function Dashboard() {
     fetchProfiles();
   }, []);
 
-  // Auto-update favorites when profiles change
-  useEffect(() => {
-    if (activeTab === "favorites" && profiles.length > 0) {
-      setFavorites(profiles.filter((p) => p.is_favorite === true));
-    }
-  }, [profiles, activeTab]);
+  // Server-side filters per tab
+  const TAB_FILTERS = {
+    dashboard: {},
+    favorites: { favorite: true },
+    history: { status: "completed" },
+  };
 
-  // Fetch favorite profiles
+  const profileKey = (p) => p.profile_id || p.id;
+
+  // Fetch first page of favorite profiles (filtered by the server)
   const fetchFavorites = async () => {
     setFavoritesLoading(true);
     try {
-      // Filter profiles yang is_favorite = true
-      setFavorites(profiles.filter((p) => p.is_favorite === true));
+      const page = await profileAPI.getMyProfiles(TAB_FILTERS.favorites);
+      setFavorites(page.items);
+      setCursors((prev) => ({ ...prev, favorites: page.nextCursor }));
     } catch (err) {
       console.error("Error fetching favorites:", err);
     } finally {
@@ -76,15 +86,13 @@ export default function Dashboard() {
     }
   };
 
-  // Fetch history
+  // Fetch first page of history (completed profiles, newest first)
   const fetchHistory = async () => {
     setHistoryLoading(true);
     try {
-      // Use all profiles sorted by created_at (most recent first) as history
-      const sortedProfiles = [...profiles].sort(
-        (a, b) => new Date(b.created_at) - new Date(a.created_at)
-      );
-      setHistoryItems(sortedProfiles);
+      const page = await profileAPI.getMyProfiles(TAB_FILTERS.history);
+      setHistoryItems(page.items);
+      setCursors((prev) => ({ ...prev, history: page.nextCursor }));
     } catch (err) {
       console.error("Error fetching history:", err);
     } finally {
@@ -92,12 +100,47 @@ export default function Dashboard() {
     }
   };
 
-  // Fetch profiles from backend
+  // Load the next page of the active tab
+  const handleLoadMore = async () => {
+    const cursor = cursors[activeTab];
+    if (!cursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const page = await profileAPI.getMyProfiles({
+        ...TAB_FILTERS[activeTab],
+        cursor,
+      });
+      const setItems = {
+        dashboard: setProfiles,
+        favorites: setFavorites,
+        history: setHistoryItems,
+      }[activeTab];
+      setItems((prev) => [...prev, ...page.items]);
+      setCursors((prev) => ({ ...prev, [activeTab]: page.nextCursor }));
+    } catch (error) {
+      console.error("Error loading more profiles:", error);
+      toast.error(error.message || "Failed to load more profiles");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // Fetch first page of profiles from backend
   const fetchProfiles = async (isBackground = false) => {
     if (!isBackground) setLoading(true);
     try {
-      const data = await profileAPI.getMyProfiles();
-      setProfiles(data);
+      const page = await profileAPI.getMyProfiles();
+      if (isBackground) {
+        // Status refresh: update the newest page, keep pages loaded with "Load more"
+        const fresh = new Set(page.items.map(profileKey));
+        setProfiles((prev) => [
+          ...page.items,
+          ...prev.filter((p) => !fresh.has(profileKey(p))),
+        ]);
+      } else {
+        setProfiles(page.items);
+        setCursors((prev) => ({ ...prev, dashboard: page.nextCursor }));
+      }
     } catch (error) {
       console.error("Error fetching profiles:", error);
       if (
@@ -111,18 +154,23 @@ export default function Dashboard() {
     }
   };
 
-  // Poll for updates if any profile is processing
+  // Listen for status updates while any profile is processing
+  const hasProcessing = profiles.some((p) => p.status === "processing");
   useEffect(() => {
-    const hasProcessing = profiles.some((p) => p.status === "processing");
-    if (hasProcessing) {
-      const interval = setInterval(() => {
+    if (!hasProcessing) return;
+    const stream = profileAPI.openStatusStream();
+    // Refetch on (re)connect in case an update was missed while disconnected
+    stream.onopen = () => fetchProfiles(true);
+    stream.onmessage = (event) => {
+      const update = JSON.parse(event.data);
+      if (update.status !== "processing") {
         fetchProfiles(true);
-      }, 3000);
-      return () => clearInterval(interval);
-    }
-  }, [profiles]);
+      }
+    };
+    return () => stream.close();
+  }, [hasProcessing]);
 
-  // Generate new profile with Background Task + Polling
+  // Generate new profile with Background Task + status stream
   const handleGenerateProfile = async () => {
     if (!companyInput.trim()) return;
 
@@ -141,37 +189,30 @@ export default function Dashboard() {
       toast.success("Profile generation started! Please wait...");
       setCompanyInput(""); // Clear input
 
-      // 2. Poll for status
-      const pollInterval = setInterval(async () => {
-        try {
-          const profile = await profileAPI.getProfileById(profileId);
-
-          if (profile.status === "completed") {
-            clearInterval(pollInterval);
-            setGenerating(false);
-            setPolling(false);
-            setPollingStatus("completed");
-            toast.success("Profile generated successfully!");
-            navigate(`/detail/${profileId}`);
-          } else if (profile.status === "failed") {
-            clearInterval(pollInterval);
-            setGenerating(false);
-            setPolling(false);
-            setPollingStatus("failed");
-            toast.error("Profile generation failed.");
-          } else {
-            // Still processing
-            console.log("Still processing...");
-          }
-        } catch (err) {
-          console.error("Polling error:", err);
-          // Don't stop polling on transient errors
+      // 2. Wait for status updates pushed by the server
+      const stream = profileAPI.openStatusStream(profileId);
+      stream.onmessage = (event) => {
+        const update = JSON.parse(event.data);
+
+        if (update.status === "completed") {
+          stream.close();
+          setGenerating(false);
+          setPolling(false);
+          setPollingStatus("completed");
+          toast.success("Profile generated successfully!");
+          navigate(`/detail/${profileId}`);
+        } else if (update.status === "failed") {
+          stream.close();
+          setGenerating(false);
+          setPolling(false);
+          setPollingStatus("failed");
+          toast.error("Profile generation failed.");
         }
-      }, 3000); // Check every 3 seconds
-
-      // Cleanup interval on component unmount (optional but good practice)
-      // In a real app, you might want to store the interval ID in a ref to clear it if the user navigates away
-      // For now, we let it run until completion or page refresh
+      };
+      stream.onerror = (err) => {
+        // EventSource reconnects automatically on transient errors
+        console.error("Status stream error:", err);
+      };
     } catch (error) {
       console.error("Error starting generation:", error);
       toast.error(error.message || "Failed to start generation");
@@ -348,21 +389,20 @@ export default function Dashboard() {
     try {
       const updatedProfile = await profileAPI.toggleFavorite(profileId);
 
-      // Update profiles state immediately
-      setProfiles((prevProfiles) => {
-        const newProfiles = prevProfiles.map((p) =>
-          (p.profile_id || p.id) === profileId
+      // Update loaded lists immediately
+      const applyFavorite = (items) =>
+        items.map((p) =>
+          profileKey(p) === profileId
             ? { ...p, is_favorite: updatedProfile.is_favorite }
             : p
         );
-
-        // Also update favorites if we're in that tab
-        if (activeTab === "favorites") {
-          setFavorites(newProfiles.filter((p) => p.is_favorite === true));
-        }
-
-        return newProfiles;
-      });
+      setProfiles(applyFavorite);
+      setHistoryItems(applyFavorite);
+      setFavorites((prev) =>
+        updatedProfile.is_favorite
+          ? prev
+          : prev.filter((p) => profileKey(p) !== profileId)
+      );
     } catch (error) {
       console.error("Error toggling favorite:", error);
       toast.error(error.message || "Failed to toggle favorite");
@@ -637,6 +677,7 @@ export default function Dashboard() {
                     </div>
                     <div className="text-2xl font-bold text-[#5B9FED]">
                       {profiles.length}
+                      {cursors.dashboard && "+"}
                     </div>
                   </div>
                   <div className="bg-[#2A2D33] border border-gray-700 rounded-lg p-3">
@@ -1128,7 +1169,10 @@ export default function Dashboard() {
                 // Render Dashboard and Favorites as Cards
                 return (
                   <div className="grid md:grid-cols-2 lg:grid-cols-3 gap-6">
-                    {filteredItems.slice(0, 6).map((profile) => (
+                    {(activeTab === "dashboard"
+                      ? filteredItems.slice(0, 6)
+                      : filteredItems
+                    ).map((profile) => (
                       <div
                         key={profile.profile_id || profile.id}
                         className="bg-[#1A1D21] border border-gray-700 rounded-2xl p-6 hover:border-[#5B9FED] transition-all relative"
@@ -1284,6 +1328,21 @@ export default function Dashboard() {
                   </div>
                 );
               })()}
+
+            {activeTab !== "dashboard" &&
+              cursors[activeTab] &&
+              !(activeTab === "favorites" ? favoritesLoading : historyLoading) && (
+                <div className="flex justify-center mt-6">
+                  <button
+                    onClick={handleLoadMore}
+                    disabled={loadingMore}
+                    className="flex items-center gap-2 px-6 py-2 rounded-lg border border-gray-700 text-gray-300 hover:text-white hover:bg-gray-800 transition disabled:opacity-50"
+                  >
+                    {loadingMore && <Loader2 size={16} className="animate-spin" />}
+                    Load more
+                  </button>
+                </div>
+              )}
           </div>
         </div>
       </main>
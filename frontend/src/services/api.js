@@ -6,6 +6,8 @@ import axios from "axios";
 
 // Base API Configuration
 const API_BASE_URL = import.meta.env.VITE_API_URL || "http://localhost:8000";
+// Page size for GET /profiles/my-profiles (more pages are loaded on demand)
+const MY_PROFILES_PAGE_SIZE = 50;
 
 // Create axios instance with default config
 const apiClient = axios.create({
@@ -31,7 +33,8 @@ apiClient.interceptors.request.use(
 
 // Response interceptor - Handle errors globally
 apiClient.interceptors.response.use(
-  (response) => response.data,
+  // rawResponse: caller needs response headers (e.g. X-Next-Cursor)
+  (response) => (response.config.rawResponse ? response : response.data),
   (error) => {
     if (error.response) {
       // Server responded with error
@@ -117,6 +120,15 @@ export const authAPI = {
    * Logout current user
    */
   logout() {
+    const token = localStorage.getItem("access_token");
+    if (token) {
+      // Revoke the token server-side; local logout does not wait for it
+      apiClient
+        .post("/auth/logout", null, {
+          headers: { Authorization: `Bearer ${token}` },
+        })
+        .catch(() => {});
+    }
     localStorage.removeItem("access_token");
     localStorage.removeItem("user");
   },
@@ -192,11 +204,41 @@ export const profileAPI = {
   },
 
   /**
-   * Get all profiles for current user
-   * @returns {Promise<Array>}
+   * Open Server-Sent Events stream of profile status changes
+   * @param {string} [profileId] - Only watch this profile (stream ends on completed/failed)
+   * @returns {EventSource} Each message data is {profile_id, user_id, status}
    */
-  async getMyProfiles() {
-    return await apiClient.get("/profiles/my-profiles");
+  openStatusStream(profileId) {
+    const params = new URLSearchParams({
+      token: localStorage.getItem("access_token") || "",
+    });
+    if (profileId) params.append("profile_id", profileId);
+    return new EventSource(
+      `${API_BASE_URL}/profiles/status-stream?${params.toString()}`
+    );
+  },
+
+  /**
+   * Get one page of the current user's profiles (summary columns, newest first)
+   * @param {object} [options]
+   * @param {string} [options.cursor] - nextCursor from the previous page
+   * @param {string} [options.status] - Server-side status filter, e.g. "completed"
+   * @param {boolean} [options.favorite] - Server-side favorite filter
+   * @returns {Promise<{items: Array, nextCursor: string|null}>}
+   */
+  async getMyProfiles({ cursor, status, favorite } = {}) {
+    const params = { limit: MY_PROFILES_PAGE_SIZE, fields: "summary" };
+    if (cursor) params.cursor = cursor;
+    if (status) params.status = status;
+    if (favorite !== undefined) params.favorite = favorite;
+    const response = await apiClient.get("/profiles/my-profiles", {
+      params,
+      rawResponse: true,
+    });
+    return {
+      items: response.data,
+      nextCursor: response.headers["x-next-cursor"] || null,
+    };
   },
 
   /**